@@ -3,17 +3,21 @@ from django.contrib.admin import ModelAdmin
 from django.utils.safestring import SafeString
 from django.utils.translation import gettext_lazy as _
 from django_object_lock.admin import LockableAdminMixin
+from django_object_lock.admin.filters import LockStatusListFilter
 
-from articles.models import Article, ArticleSection, NotLockedModel
+from articles.models import Announcement, Article, ArticleSection, Contract, Footnote, NotLockedModel
 
 
 @admin.register(Article)
 class ArticleAdmin(LockableAdminMixin, ModelAdmin):
     list_display = ('locked_icon', 'title',)
     list_display_links = ('title',)
+    list_filter = (LockStatusListFilter,)
     fields = ('title', 'rendered_content')
     readonly_fields = ('rendered_content',)
     actions = ('lock', 'unlock')
+    lock_preview_fields = ('title',)
+    use_edit_locks = True
 
     def rendered_content(self, obj: Article) -> SafeString:
         return obj.rendered_content
@@ -23,20 +27,46 @@ class ArticleAdmin(LockableAdminMixin, ModelAdmin):
 class ArticleSectionAdmin(LockableAdminMixin, ModelAdmin):
     list_display = ('locked_icon', 'heading', 'parent', 'order')
     list_display_links = ('heading',)
+    list_filter = (LockStatusListFilter,)
     fields = ('parent', 'heading', 'content', 'order')
     list_select_related = ('parent',)
     locked_icon_url = 'articles/images/locked.svg'
 
 
+@admin.register(Footnote)
+class FootnoteAdmin(LockableAdminMixin, ModelAdmin):
+    list_display = ('locked_icon', 'text', 'section')
+    list_display_links = ('text',)
+    fields = ('section', 'text')
+    list_select_related = ('section__parent',)
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(LockableAdminMixin, ModelAdmin):
+    list_display = ('locked_icon', 'text', 'locked_from', 'locked_until')
+    list_display_links = ('text',)
+    fields = ('text', 'locked_from', 'locked_until')
+    actions = ('lock', 'unlock')
+
+
+@admin.register(Contract)
+class ContractAdmin(LockableAdminMixin, ModelAdmin):
+    list_display = ('locked_icon', 'title', 'locked_reasons')
+    list_display_links = ('title',)
+    fields = ('title',)
+    actions = ('lock', 'unlock')
+
+
 @admin.register(NotLockedModel)
 class NotLockedModelAdmin(LockableAdminMixin, ModelAdmin):
     list_display = ('locked_icon', 'name')
     list_display_links = ('name',)
+    list_filter = (LockStatusListFilter,)
     fieldsets = [
         (None, {
             'description': _(
                 'This model does not define locking behavior, and this admin does not define it neither. '
-                'You will always get an error when saving, until you define the locking behavior.'
+                'Its lock status is stored in the generic object lock table.'
             ),
             'fields': ('name',)
         })
@@ -1,6 +1,10 @@
 from typing import Union
 
+from django.http import HttpResponseBase
+
 from django_object_lock.api import mixins as dol_mixins
+from django_object_lock.api.fields import LockStatusField
+from django_object_lock.api.filters import LockedFilterBackend
 from django_object_lock.mixins import LockableMixin
 from rest_framework import viewsets, serializers, mixins
 from rest_framework.decorators import action
@@ -8,13 +12,15 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.routers import DefaultRouter
 
-from articles.models import Article
+from articles.models import Article, ArticleSection, Contract, Illustration
 
 
 class ArticleSerializer(serializers.ModelSerializer):
+    locked = LockStatusField()
+
     class Meta:
         model = Article
-        fields = ['url', 'title', 'is_locked_flag']
+        fields = ['url', 'title', 'is_locked_flag', 'locked']
         read_only_fields = ['is_locked_flag']
 
 
@@ -28,6 +34,8 @@ class ArticleViewSet(
 ):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
+    filter_backends = [LockedFilterBackend]
+    use_edit_locks = True
 
     @action(methods=['PUT', 'PATCH'], detail=True)
     def lock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
@@ -37,6 +45,116 @@ class ArticleViewSet(
     def unlock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
         return dol_mixins.unlock_action(self, request, pk)
 
+    @action(methods=['PUT'], detail=True, url_path='edit-lock')
+    def acquire_edit_lock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+        return dol_mixins.acquire_edit_lock_action(self, request, pk)
+
+    @acquire_edit_lock.mapping.delete
+    def release_edit_lock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+        return dol_mixins.release_edit_lock_action(self, request, pk)
+
+    @action(methods=['GET'], detail=True, url_path='lock-status')
+    def lock_status(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> HttpResponseBase:
+        return dol_mixins.lock_status_action(self, request, pk)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-lock')
+    def bulk_lock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_lock_action(self, request)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-unlock')
+    def bulk_unlock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_unlock_action(self, request)
+
+
+class ArticleSectionSerializer(serializers.ModelSerializer):
+    locked = LockStatusField()
+
+    class Meta:
+        model = ArticleSection
+        fields = ['url', 'parent', 'heading', 'order', 'locked']
+
+
+class ArticleSectionViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    dol_mixins.LockableUpdateModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = ArticleSection.objects.all()
+    serializer_class = ArticleSectionSerializer
+    filter_backends = [LockedFilterBackend]
+
+
+class IllustrationSerializer(serializers.ModelSerializer):
+    locked = LockStatusField()
+
+    class Meta:
+        model = Illustration
+        fields = ['url', 'article', 'caption', 'is_locked_flag', 'locked']
+        read_only_fields = ['is_locked_flag']
+
+
+class IllustrationViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    dol_mixins.LockableUpdateModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = Illustration.objects.all()
+    serializer_class = IllustrationSerializer
+
+    @action(methods=['PUT', 'PATCH'], detail=True)
+    def lock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+        return dol_mixins.lock_action(self, request, pk)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-lock')
+    def bulk_lock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_lock_action(self, request)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-unlock')
+    def bulk_unlock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_unlock_action(self, request)
+
+
+class ContractSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Contract
+        fields = ['url', 'title', 'lock_reasons']
+        read_only_fields = ['lock_reasons']
+
+
+class ContractViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    dol_mixins.LockableUpdateModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = Contract.objects.all()
+    serializer_class = ContractSerializer
+
+    @action(methods=['PUT', 'PATCH'], detail=True)
+    def lock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+        return dol_mixins.lock_action(self, request, pk)
+
+    @action(methods=['PUT', 'PATCH'], detail=True)
+    def unlock(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+        return dol_mixins.unlock_action(self, request, pk)
+
+    @action(methods=['GET'], detail=True, url_path='lock-status')
+    def lock_status(self: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> HttpResponseBase:
+        return dol_mixins.lock_status_action(self, request, pk)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-lock')
+    def bulk_lock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_lock_action(self, request)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-unlock')
+    def bulk_unlock(self: LockableMixin, request: Request) -> Response:
+        return dol_mixins.bulk_unlock_action(self, request)
+
 
 router = DefaultRouter()
 router.register(r'articles', ArticleViewSet)
+router.register(r'sections', ArticleSectionViewSet)
+router.register(r'contracts', ContractViewSet)
+router.register(r'illustrations', IllustrationViewSet)
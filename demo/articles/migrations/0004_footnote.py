@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-17 15:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_notlockedmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Footnote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(help_text='The text of this footnote.', verbose_name='text')),
+                ('section', models.ForeignKey(help_text='The section this footnote belongs to.', on_delete=django.db.models.deletion.CASCADE, related_name='footnotes', to='articles.articlesection', verbose_name='section')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
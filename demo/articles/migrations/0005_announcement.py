@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-17 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_footnote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Announcement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('locked_from', models.DateTimeField(blank=True, db_index=True, help_text='The date and time from which this object is locked.', null=True, verbose_name='locked from')),
+                ('locked_until', models.DateTimeField(blank=True, db_index=True, help_text='The date and time from which this object is not locked anymore.', null=True, verbose_name='locked until')),
+                ('text', models.CharField(help_text='The text of this announcement.', max_length=200, verbose_name='text')),
+                ('is_locked_flag', models.BooleanField(default=False, help_text='Whether this announcement is locked or not.', verbose_name='is locked')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-17 15:54
+
+from django.db import migrations, models
+import django_object_lock.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_announcement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contract',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(help_text='The title of this contract.', max_length=120, verbose_name='title')),
+                ('lock_reasons', django_object_lock.fields.LockField(help_text='The reasons this contract is locked for.', reasons=[('published', 'Published'), ('legal_hold', 'Legal hold'), ('period_closed', 'Period closed'), ('in_review', 'In review')], verbose_name='lock reasons')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-17 17:19
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_contract'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotLockedUUIDModel',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='The name of this instance.', max_length=120, verbose_name='name')),
+            ],
+        ),
+    ]
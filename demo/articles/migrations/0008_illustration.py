@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-17 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_notlockeduuidmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Illustration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('caption', models.CharField(help_text='The caption of this illustration.', max_length=200, verbose_name='caption')),
+                ('is_locked_flag', models.BooleanField(default=False, help_text='Whether this illustration is locked or not.', verbose_name='is locked')),
+                ('article', models.ForeignKey(help_text='The article containing this illustration.', on_delete=django.db.models.deletion.CASCADE, related_name='illustrations', to='articles.article', verbose_name='article')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
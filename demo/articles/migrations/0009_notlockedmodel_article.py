@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 17:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_illustration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notlockedmodel',
+            name='article',
+            field=models.ForeignKey(blank=True, help_text='The article this instance is attached to, if any.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='articles.article', verbose_name='article'),
+        ),
+    ]
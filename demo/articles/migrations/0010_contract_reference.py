@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_notlockedmodel_article'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='reference',
+            field=models.CharField(blank=True, help_text='The unique reference of this contract, if any.', max_length=32, null=True, unique=True, verbose_name='reference'),
+        ),
+    ]
@@ -1,8 +1,11 @@
+import uuid
+
 from django.db import models
 from django.utils.html import format_html
 from django.utils.safestring import SafeString, mark_safe
 from django.utils.translation import gettext_lazy as _
-from django_object_lock.models import LockableModel
+from django_object_lock.fields import LockField
+from django_object_lock.models import LockableModel, TimeLockableModel
 
 
 class Article(LockableModel):
@@ -13,15 +16,11 @@ class Article(LockableModel):
         _('is locked'), default=False, help_text=_('Whether this article is locked or not.')
     )
 
+    lock_field = 'is_locked_flag'
+
     def __str__(self) -> str:
         return f'Article "{self.title}"'
 
-    def is_locked(self) -> bool:
-        return self.is_locked_flag
-
-    def set_locked(self, value: bool) -> None:
-        self.is_locked_flag = value
-
     @property
     def rendered_content(self) -> SafeString:
         return mark_safe('\n\n'.join(
@@ -46,20 +45,116 @@ class ArticleSection(LockableModel):
         help_text=_('The relative position of this field in relation to other sections in the same article.')
     )
 
+    lock_inherits_from = 'parent'
+
     class Meta:
         ordering = ['order']
 
     def __str__(self) -> str:
         return f'ArticleSection "{self.heading}"'
 
-    def is_locked(self) -> bool:
-        return self.parent.is_locked_flag
+
+class Footnote(LockableModel):
+    """Example of a model whose lock status is inherited through a chain of related models.
+
+    A ``Footnote`` is locked if and only if the ``Article`` containing its ``ArticleSection`` is locked.
+    """
+    section = models.ForeignKey(
+        ArticleSection, verbose_name=_('section'), on_delete=models.CASCADE, related_name='footnotes',
+        help_text=_('The section this footnote belongs to.')
+    )
+    text = models.TextField(_('text'), help_text=_('The text of this footnote.'))
+
+    lock_inherits_from = 'section'
+
+    def __str__(self) -> str:
+        return f'Footnote "{self.text}"'
+
+
+class Illustration(LockableModel):
+    """Example of a model that can be locked on its own and also inherits the lock status of a related model.
+
+    An ``Illustration`` is locked if ``is_locked_flag`` is set or the related ``Article`` is locked.
+    """
+    article = models.ForeignKey(
+        Article, verbose_name=_('article'), on_delete=models.CASCADE, related_name='illustrations',
+        help_text=_('The article containing this illustration.')
+    )
+    caption = models.CharField(_('caption'), max_length=200, help_text=_('The caption of this illustration.'))
+    is_locked_flag = models.BooleanField(
+        _('is locked'), default=False, help_text=_('Whether this illustration is locked or not.')
+    )
+
+    lock_field = 'is_locked_flag'
+    lock_inherits_from = 'article'
+
+    def __str__(self) -> str:
+        return f'Illustration "{self.caption}"'
+
+
+class Announcement(TimeLockableModel):
+    """Example of a model that can be locked during a time window.
+
+    An ``Announcement`` is locked if ``is_locked_flag`` is set or ``locked_from`` has passed, until ``locked_until``
+    passes.
+    """
+    text = models.CharField(_('text'), max_length=200, help_text=_('The text of this announcement.'))
+    is_locked_flag = models.BooleanField(
+        _('is locked'), default=False, help_text=_('Whether this announcement is locked or not.')
+    )
+
+    lock_field = 'is_locked_flag'
+
+    def __str__(self) -> str:
+        return f'Announcement "{self.text}"'
+
+
+class Contract(LockableModel):
+    """Example of a model that can be locked for several independent reasons.
+
+    A ``Contract`` is locked if it is locked for any reason.
+    """
+    title = models.CharField(_('title'), max_length=120, help_text=_('The title of this contract.'))
+    reference = models.CharField(
+        _('reference'), max_length=32, unique=True, null=True, blank=True,
+        help_text=_('The unique reference of this contract, if any.')
+    )
+    lock_reasons = LockField(
+        _('lock reasons'),
+        reasons=[
+            ('published', _('Published')),
+            ('legal_hold', _('Legal hold')),
+            ('period_closed', _('Period closed')),
+            ('in_review', _('In review')),
+        ],
+        help_text=_('The reasons this contract is locked for.')
+    )
+
+    lock_field = 'lock_reasons'
+
+    def __str__(self) -> str:
+        return f'Contract "{self.title}"'
 
 
 class NotLockedModel(models.Model):
-    """Example of a model that cannot be locked.
+    """Example of a model that does not define locking behavior. Its lock status is stored in the generic
+    ``ObjectLock`` table.
     """
     name = models.CharField(_('name'), max_length=120, help_text=_('The name of this instance.'))
+    article = models.ForeignKey(
+        Article, verbose_name=_('article'), on_delete=models.CASCADE, null=True, blank=True,
+        related_name='attachments', help_text=_('The article this instance is attached to, if any.')
+    )
 
     def __str__(self) -> str:
         return f'NotLockedModel "{self.name}"'
+
+
+class NotLockedUUIDModel(models.Model):
+    """Example of a model that does not define locking behavior and whose primary key is not an integer.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(_('name'), max_length=120, help_text=_('The name of this instance.'))
+
+    def __str__(self) -> str:
+        return f'NotLockedUUIDModel "{self.name}"'
@@ -1,17 +1,24 @@
 from typing import Type
+from unittest import mock
 
-from django.contrib.admin import site
+from django.contrib.admin import ModelAdmin, site
 from django.contrib.auth.models import User
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
-from django.db import models
+from django.db import connection, models
+from django.db.models import Q
 from django.http import HttpResponseRedirect
 from django.templatetags.static import static
-from django.test import Client, TestCase
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.html import format_html
 
-from articles.admin import ArticleAdmin, ArticleSectionAdmin
-from articles.models import Article, ArticleSection, NotLockedModel
+from articles.admin import ArticleAdmin, ArticleSectionAdmin, FootnoteAdmin
+from django_object_lock.admin import LockableAdminMixin
+from django_object_lock.admin.selection import SESSION_KEY
+from django_object_lock.admin.filters import LockStatusListFilter
+from articles.models import Article, ArticleSection, Footnote, NotLockedModel
+from django_object_lock.models import ObjectLock
 
 
 class AdminLockingTestCase(TestCase):
@@ -57,6 +64,24 @@ class AdminLockingTestCase(TestCase):
         response = self.client.get(self.get_admin_url(Article, 'changelist'))
         self.assertNotIn(self.article_admin.locked_icon_html(self.articles[0]).encode(), response.content)
 
+    def test_lock_icons_are_rendered_without_further_queries(self) -> None:
+        Footnote.objects.bulk_create([
+            Footnote(section=section, text='Footnote') for section in self.article_sections for _i in range(5)
+        ])
+        footnote_admin = FootnoteAdmin(Footnote, site)
+        footnote_admin.list_select_related = False
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(1):
+            icons = [footnote_admin.locked_icon(footnote) for footnote in footnote_admin.get_queryset(request)]
+        self.assertEqual(sum(1 for icon in icons if icon), 5)
+
+    def test_lock_icon_alt_text_varies_per_object(self) -> None:
+        for article in self.articles[1:3]:
+            self.assertIn(
+                format_html('alt="{alt}"', alt=f'{article} is locked'), self.article_admin.locked_icon_html(article)
+            )
+
     def test_change_page_is_readonly_for_locked_objects(self) -> None:
         response = self.client.get(self.get_admin_url(Article, 'change', args=(2,)))
         self.assertNotIn(b'Save', response.content)
@@ -95,6 +120,92 @@ class AdminLockingTestCase(TestCase):
         })
         self.assertIsInstance(response, HttpResponseRedirect)
 
+    def test_lock_action_keeps_selection_in_session(self) -> None:
+        response = self.client.post(self.get_admin_url(Article, 'changelist'), data={
+            'action': 'lock',
+            ACTION_CHECKBOX_NAME: ['1', '2', '4'],
+        })
+        self.assertNotIn('ids=', response.url)
+        response = self.client.get(response.url)
+        self.assertIn(b'Articles: 2', response.content)
+        self.assertIn(b'Article 4', response.content)
+        self.assertNotIn(b'Article 2', response.content)
+
+    def test_lock_action_locks_selection_across_pages_on_confirmation(self) -> None:
+        response = self.client.post(self.get_admin_url(Article, 'changelist'), data={
+            'action': 'lock',
+            'select_across': '1',
+            ACTION_CHECKBOX_NAME: '1',
+        })
+        token = response.url.split('selection=')[1]
+        self.client.post(self.get_admin_url(Article, 'lock'), data={'selection': token})
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_lock_action_stores_primary_key_ranges_in_session(self) -> None:
+        response = self.client.post(self.get_admin_url(Article, 'changelist'), data={
+            'action': 'lock',
+            ACTION_CHECKBOX_NAME: ['1', '2', '4'],
+        })
+        token = response.url.split('selection=')[1]
+        selection = self.client.session[SESSION_KEY][token]
+        self.assertEqual(selection, {'model': 'articles.article', 'pks': [[1, 2], [4, 4]]})
+
+    def test_lock_action_locks_selections_with_many_primary_key_ranges(self) -> None:
+        Article.objects.bulk_create([Article(title=f'Bulk article {i}') for i in range(3500)])
+        # Pairs of consecutive articles separated by gaps, along with a few longer runs.
+        pks = [pk for first in range(6, 3306, 3) for pk in (first, first + 1)]
+        pks += list(range(3310, 3321)) + list(range(3350, 3361))
+        response = self.client.get(self.get_admin_url(Article, 'lock'), data={'ids': ','.join(map(str, pks))})
+        self.assertEqual(response.context['count'], len(pks))
+        response = self.client.post(
+            self.get_admin_url(Article, 'lock'), data={'selection': response.context['selection']}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Article.objects.filter(pk__in=pks, is_locked_flag=True).count(), len(pks))
+        self.assertEqual(Article.objects.filter(pk__gt=5, is_locked_flag=True).count(), len(pks))
+
+    def test_lock_action_across_pages_stores_changelist_filters_in_session(self) -> None:
+        response = self.client.post(self.get_admin_url(Article, 'changelist') + '?locked=0', data={
+            'action': 'lock',
+            'select_across': '1',
+            ACTION_CHECKBOX_NAME: '1',
+        })
+        token = response.url.split('selection=')[1]
+        selection = self.client.session[SESSION_KEY][token]
+        self.assertEqual(selection, {'model': 'articles.article', 'filters': 'locked=0'})
+        # Objects matching the filters when confirming the action are locked.
+        Article.objects.filter(pk=self.articles[1].pk).update(is_locked_flag=False)
+        response = self.client.get(self.get_admin_url(Article, 'lock'), data={'selection': token})
+        self.assertIn(b'Articles: 3', response.content)
+        self.client.post(self.get_admin_url(Article, 'lock'), data={'selection': token})
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_lock_action_ignores_selection_with_invalid_filters(self) -> None:
+        session = self.client.session
+        session[SESSION_KEY] = {'token': {'model': 'articles.article', 'filters': 'missing__field=1'}}
+        session.save()
+        response = self.client.get(self.get_admin_url(Article, 'lock'), data={'selection': 'token'})
+        self.assertEqual(response.context['count'], 0)
+
+    def test_delete_confirmation_reports_locked_objects_as_protected(self) -> None:
+        response = self.client.post(self.get_admin_url(Article, 'changelist'), data={
+            'action': 'delete_selected',
+            ACTION_CHECKBOX_NAME: ['1', '2'],
+        })
+        self.assertEqual(response.context['protected'], [
+            'Article: Article "Article 2"', 'Article section: ArticleSection "Section 2.1"'
+        ])
+        self.client.post(self.get_admin_url(Article, 'changelist'), data={
+            'action': 'delete_selected',
+            'post': 'yes',
+            ACTION_CHECKBOX_NAME: ['1', '2'],
+        })
+        self.assertEqual(Article.objects.filter(pk__in=[1, 2]).count(), 2)
+
+    def test_unlock_action_with_unknown_selection_shows_no_instances(self) -> None:
+        response = self.client.get(self.get_admin_url(Article, 'unlock'), data={'selection': 'foo'})
+        self.assertIn(b'No objects have been selected', response.content)
+
     def test_lock_action_shows_affected_instances(self) -> None:
         response = self.client.get(self.get_admin_url(Article, 'lock'), data={'ids': '1'})
         self.assertIn(b'Articles: 1', response.content)
@@ -106,13 +217,63 @@ class AdminLockingTestCase(TestCase):
         self.assertIn(b'Article 2', response.content)
         self.assertIn(b'Article 5', response.content)
 
+    def test_confirmation_summarizes_large_selections(self) -> None:
+        Article.objects.bulk_create([Article(title=f'Bulk article {i}') for i in range(30)])
+        article_admin = site._registry[Article]
+        article_admin.lock_preview_size = 5
+        try:
+            response = self.client.get(self.get_admin_url(Article, 'lock'), data={
+                'ids': ','.join(str(pk) for pk in Article.objects.values_list('pk', flat=True))
+            })
+        finally:
+            del article_admin.lock_preview_size
+        self.assertContains(response, 'Articles: 32')
+        self.assertContains(response, 'Selected: 35')
+        self.assertContains(response, 'Already locked: 3')
+        self.assertContains(response, 'And 27 more objects.')
+        self.assertEqual(len(response.context['objects']), 5)
+        self.assertNotContains(response, 'name="ids"')
+        self.client.post(self.get_admin_url(Article, 'lock'), data={'selection': response.context['selection']})
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_confirmation_counts_the_objects_changed_on_confirmation(self) -> None:
+        # Articles 1 and 4 are also locked by their title, which bulk unlocking does not change.
+        condition = Q(is_locked_flag=True) | Q(title__in=['Article 1', 'Article 4'])
+        with mock.patch.object(Article, 'lock_condition', condition):
+            response = self.client.get(self.get_admin_url(Article, 'unlock'), data={'ids': '1,2,4'})
+            self.assertEqual(response.context['count'], 1)
+            self.assertEqual(response.context['unchanged'], 2)
+            self.client.post(self.get_admin_url(Article, 'unlock'), data={'selection': response.context['selection']})
+        self.assertFalse(Article.objects.filter(is_locked_flag=True, pk__in=[1, 2, 4]).exists())
+
+    def test_confirmation_queries_do_not_depend_on_the_selection_size(self) -> None:
+        url = self.get_admin_url(Article, 'unlock')
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url, data={'ids': '2'})
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(url, data={'ids': '1,2,3,4,5'})
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
     def test_lock_action_with_invalid_parameters_shows_no_instances(self) -> None:
         response = self.client.get(self.get_admin_url(Article, 'lock'), data={'ids': 'a'})
+        self.assertEqual(response.status_code, 400)
         self.assertIn(b'No objects have been selected', response.content)
+        self.assertIn(b'The selected objects are not valid.', response.content)
 
     def test_unlock_action_with_invalid_parameters_shows_no_instances(self) -> None:
-        response = self.client.get(self.get_admin_url(Article, 'unlock'), data={'ids': 'a'})
+        response = self.client.get(self.get_admin_url(Article, 'unlock'), data={'ids': '2,a'})
+        self.assertEqual(response.status_code, 400)
         self.assertIn(b'No objects have been selected', response.content)
+        response = self.client.post(self.get_admin_url(Article, 'unlock'), data={'ids': '2,a'})
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Article.objects.get(pk=2).is_locked())
+
+    def test_confirmation_only_loads_preview_fields(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.get_admin_url(Article, 'lock'), data={'ids': '1,4'})
+        self.assertContains(response, 'Article 4')
+        select = 'SELECT "articles_article"."id", "articles_article"."title" FROM'
+        self.assertTrue(any(query['sql'].startswith(select) for query in queries.captured_queries))
 
     def test_lock_action_locks_on_confirmation(self) -> None:
         self.client.post(self.get_admin_url(Article, 'lock'), data={'ids': '4'})
@@ -122,10 +283,104 @@ class AdminLockingTestCase(TestCase):
         self.client.post(self.get_admin_url(Article, 'unlock'), data={'ids': '3'})
         self.assertFalse(Article.objects.get(id=3).is_locked())
 
-    def test_is_locked_not_defined_in_model_nor_admin_raises_not_implemented(self) -> None:
-        with self.assertRaises(NotImplementedError):
-            self.client.get(self.get_admin_url(NotLockedModel, 'changelist'))
+    def test_lock_action_locks_several_objects_on_confirmation(self) -> None:
+        self.client.post(self.get_admin_url(Article, 'lock'), data={'ids': '1,2,4'})
+        self.assertEqual(Article.objects.filter(pk__in=[1, 2, 4], is_locked_flag=True).count(), 3)
+
+    def test_bulk_locking_uses_a_single_query(self) -> None:
+        with self.assertNumQueries(1):
+            self.article_admin.bulk_set_locked_status(Article.objects.filter(pk__in=[1, 2, 4]), True)
+        self.assertTrue(all(article.is_locked() for article in Article.objects.filter(pk__in=[1, 2, 4])))
+
+    def test_bulk_locking_skips_objects_in_target_status(self) -> None:
+        self.assertEqual(self.article_admin.bulk_set_locked_status(Article.objects.filter(pk__in=[1, 2, 3]), False), 2)
+
+    def test_bulk_locking_is_not_used_with_custom_set_locked_status(self) -> None:
+        class CustomArticleAdmin(LockableAdminMixin, ModelAdmin):
+            def set_locked_status(self, obj: models.Model, lock: bool) -> None:
+                obj.set_locked(lock)
+
+        self.assertEqual(self.article_admin.get_bulk_lock_field(Article), 'is_locked_flag')
+        self.assertIsNone(CustomArticleAdmin(Article, site).get_bulk_lock_field(Article))
+        self.assertIsNone(self.article_section_admin.get_bulk_lock_field(ArticleSection))
+
+    def test_models_without_locking_logic_are_locked_using_the_object_lock_table(self) -> None:
+        not_locked = NotLockedModel.objects.get()
+        self.client.post(self.get_admin_url(NotLockedModel, 'lock'), data={'ids': str(not_locked.pk)})
+        self.assertTrue(ObjectLock.objects.is_locked(not_locked))
+        response = self.client.get(self.get_admin_url(NotLockedModel, 'changelist'))
+        self.assertIn(site._registry[NotLockedModel].locked_icon_html(not_locked).encode(), response.content)
+        response = self.client.get(self.get_admin_url(NotLockedModel, 'change', args=(not_locked.pk,)))
+        self.assertFalse(response.context['has_change_permission'])
+        self.client.post(self.get_admin_url(NotLockedModel, 'unlock'), data={'ids': str(not_locked.pk)})
+        self.assertFalse(ObjectLock.objects.exists())
 
-    def test_set_locked_not_defined_in_model_nor_admin_raises_not_implemented(self) -> None:
+    def test_object_lock_table_lock_status_is_annotated_with_a_single_query(self) -> None:
+        NotLockedModel.objects.bulk_create([NotLockedModel(name=f'bar {i}') for i in range(10)])
+        not_locked_admin = site._registry[NotLockedModel]
+        not_locked_admin.lock_instance(NotLockedModel.objects.get(name='bar 3'), True)
+        request = RequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(1):
+            locked = [obj.name for obj in not_locked_admin.get_queryset(request) if not_locked_admin.locked_icon(obj)]
+        self.assertEqual(locked, ['bar 3'])
+
+    def test_set_locked_not_defined_with_custom_is_locked_raises_not_implemented(self) -> None:
+        class CustomNotLockedModelAdmin(LockableAdminMixin, ModelAdmin):
+            def is_instance_locked(self, obj: models.Model) -> bool:
+                return False
+
+        not_locked_admin = CustomNotLockedModelAdmin(NotLockedModel, site)
+        self.assertFalse(not_locked_admin.uses_object_lock_table(NotLockedModel))
         with self.assertRaises(NotImplementedError):
-            self.client.post(self.get_admin_url(NotLockedModel, 'lock'), data={'ids': '1'})
+            not_locked_admin.set_locked_status(NotLockedModel.objects.get(), True)
+
+
+class LockStatusListFilterTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        articles = Article.objects.bulk_create([
+            Article(title='Article 1', is_locked_flag=False),
+            Article(title='Article 2', is_locked_flag=True),
+            Article(title='Article 3', is_locked_flag=True),
+        ])
+        ArticleSection.objects.bulk_create([
+            ArticleSection(parent=article, heading=f'Section {i}', content='Lorem', order=1)
+            for i, article in enumerate(articles, 1)
+        ])
+        NotLockedModel.objects.bulk_create([NotLockedModel(name='foo'), NotLockedModel(name='bar')])
+        ObjectLock.objects.lock(NotLockedModel.objects.get(name='bar'))
+        cls.user = User.objects.create_superuser('foo', 'foo@example.com', '123')
+
+    def get_filter(self, model: Type[models.Model], value: str = '') -> LockStatusListFilter:
+        request = RequestFactory().get('/', {'locked': value} if value else {})
+        request.user = self.user
+        params = dict(request.GET.items())
+        return LockStatusListFilter(request, params, model, site._registry[model])
+
+    def test_counts_are_computed_with_a_single_query(self) -> None:
+        for model, locked, unlocked in ((Article, 2, 1), (ArticleSection, 2, 1), (NotLockedModel, 1, 1)):
+            with self.assertNumQueries(1):
+                list_filter = self.get_filter(model)
+            self.assertEqual([str(label) for _value, label in list_filter.lookup_choices], [
+                f'Locked ({locked})', f'Unlocked ({unlocked})'
+            ])
+
+    def test_objects_are_filtered_by_lock_status(self) -> None:
+        for model, field, locked, unlocked in (
+            (Article, 'title', ['Article 2', 'Article 3'], ['Article 1']),
+            (ArticleSection, 'heading', ['Section 2', 'Section 3'], ['Section 1']),
+            (NotLockedModel, 'name', ['bar'], ['foo']),
+        ):
+            for value, expected in (('1', locked), ('0', unlocked)):
+                list_filter = self.get_filter(model, value)
+                queryset = list_filter.queryset(None, model.objects.order_by(field))
+                self.assertEqual(list(queryset.values_list(field, flat=True)), expected)
+            self.assertIsNone(self.get_filter(model).queryset(None, model.objects.all()))
+
+    def test_changelist_is_filtered(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('admin:articles_articlesection_changelist'), {'locked': '0'})
+        self.assertContains(response, 'Unlocked (1)')
+        self.assertEqual([obj.heading for obj in response.context['cl'].result_list], ['Section 1'])
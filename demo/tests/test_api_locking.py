@@ -1,9 +1,16 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Q
 from django.test import TestCase
-from rest_framework import status
+from django.test.utils import CaptureQueriesContext
+from rest_framework import permissions, status
 from rest_framework.test import APIClient
 
-from articles.models import Article
+from articles.api import ArticleSerializer
+from articles.models import Article, ArticleSection, Illustration
 from django_object_lock.api.exceptions import APIObjectLocked, APIObjectAlreadyLocked, APIObjectAlreadyUnlocked
+from django_object_lock.exceptions import ObjectLocked
 
 
 class APILockingTestCase(TestCase):
@@ -27,6 +34,16 @@ class APILockingTestCase(TestCase):
         response = self.client.patch('/articles/1/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_update_fetches_resource_once(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch('/articles/1/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        selects = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "articles_article"' in query['sql']
+        ]
+        self.assertEqual(len(selects), 1)
+
     def test_cannot_update_locked_resource(self) -> None:
         response = self.client.patch('/articles/2/')
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
@@ -58,7 +75,191 @@ class APILockingTestCase(TestCase):
         response = self.client.delete('/articles/7/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_destroy_fetches_resource_once(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete('/articles/6/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Article.objects.filter(id=6).exists())
+        selects = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "articles_article"' in query['sql']
+        ]
+        self.assertEqual(len(selects), 1)
+
     def test_cannot_destroy_locked_resource(self) -> None:
         response = self.client.delete('/articles/8/')
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
         self.assertEqual(response.data['detail'], APIObjectLocked.default_detail)
+
+    def test_cannot_destroy_resource_with_locked_objects_deleted_in_cascade(self) -> None:
+        section = ArticleSection.objects.create(parent_id=7, heading='Locked', content='Lorem', order=1)
+        with mock.patch.object(ArticleSection, 'lock_condition', Q(heading='Locked')):
+            response = self.client.delete('/articles/7/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], APIObjectLocked.default_detail)
+        self.assertEqual(response.data['locked_objects'], {'articles.ArticleSection': [str(section.pk)]})
+        self.assertTrue(Article.objects.filter(id=7).exists())
+
+    def test_cannot_update_resource_locked_while_saving(self) -> None:
+        with mock.patch.object(Article, 'save', side_effect=ObjectLocked()):
+            response = self.client.patch('/articles/1/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], APIObjectLocked.default_detail)
+        self.assertNotIn('locked_objects', response.data)
+
+    def test_lock_status_is_fetched_with_a_single_query(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get('/articles/2/lock-status/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'locked': True})
+        self.assertEqual(response['ETag'], '"locked"')
+
+    def test_lock_status_is_not_modified_if_etag_matches(self) -> None:
+        response = self.client.get('/articles/1/lock-status/', HTTP_IF_NONE_MATCH='"unlocked"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        response = self.client.head('/articles/1/lock-status/', HTTP_IF_NONE_MATCH='"unlocked"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Article.objects.filter(pk=1).lock()
+        response = self.client.get('/articles/1/lock-status/', HTTP_IF_NONE_MATCH='"unlocked"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"locked"')
+
+    def test_lock_status_of_missing_resource(self) -> None:
+        response = self.client.get('/articles/999/lock-status/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class APIBulkLockingTestCase(TestCase):
+    client_class = APIClient
+
+    def setUp(self) -> None:
+        self.articles = Article.objects.bulk_create([
+            Article(title='Article %d' % i, is_locked_flag=i % 2 == 0) for i in range(6)
+        ])
+
+    def test_bulk_lock_by_ids(self) -> None:
+        ids = [article.pk for article in self.articles[:3]] + [999]
+        with self.assertNumQueries(4):  # Savepoint, statuses, update, release
+            response = self.client.post('/articles/bulk-lock/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['affected'], 1)
+        self.assertEqual(response.data['skipped'], 2)
+        self.assertEqual(response.data['results'], {
+            str(self.articles[0].pk): 'already_locked',
+            str(self.articles[2].pk): 'already_locked',
+            '999': 'not_found',
+        })
+        self.assertEqual(Article.objects.filter(pk__in=ids).locked().count(), 3)
+
+    def test_bulk_unlock_by_ids(self) -> None:
+        ids = [article.pk for article in self.articles]
+        response = self.client.post('/articles/bulk-unlock/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['affected'], 3)
+        self.assertEqual(response.data['skipped'], 3)
+        self.assertFalse(Article.objects.locked().exists())
+
+    def test_bulk_lock_all(self) -> None:
+        response = self.client.post('/articles/bulk-lock/', {'all': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'affected': 3, 'skipped': 3})
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_bulk_lock_requires_ids_or_all(self) -> None:
+        for data in ({}, {'all': False}, {'ids': [1], 'all': True}):
+            response = self.client.post('/articles/bulk-lock/', data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/articles/bulk-lock/', {'all': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/articles/bulk-unlock/', {'all': 'true'})
+        self.assertEqual(response.data, {'affected': 3, 'skipped': 3})
+        self.assertEqual(Article.objects.locked().count(), 0)
+
+    def test_bulk_lock_invalid_ids(self) -> None:
+        response = self.client.post('/articles/bulk-lock/', {'ids': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/articles/bulk-lock/', {'ids': ['abc']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Article.objects.locked().count(), 3)
+
+    def test_bulk_lock_checks_object_permissions(self) -> None:
+        denied_pk = self.articles[1].pk
+
+        class DenyOne(permissions.BasePermission):
+            def has_object_permission(self, request, view, obj) -> bool:
+                return obj.pk != denied_pk
+
+        with mock.patch('articles.api.ArticleViewSet.permission_classes', [DenyOne]):
+            response = self.client.post(
+                '/articles/bulk-lock/', {'ids': [article.pk for article in self.articles[:4]]}, format='json'
+            )
+            self.assertEqual(response.data['affected'], 1)
+            self.assertEqual(response.data['results'][str(denied_pk)], 'permission_denied')
+            response = self.client.post('/articles/bulk-lock/', {'all': True}, format='json')
+            self.assertEqual(response.data, {'affected': 1, 'skipped': 5})
+        self.assertFalse(Article.objects.get(pk=denied_pk).is_locked())
+
+
+class APIBulkLockingInheritedTestCase(TestCase):
+    client_class = APIClient
+
+    def setUp(self) -> None:
+        article = Article.objects.create(title='Article', is_locked_flag=True)
+        self.illustrations = Illustration.objects.bulk_create([
+            Illustration(article=article, caption='Not flagged'),
+            Illustration(article=article, caption='Flagged', is_locked_flag=True),
+        ])
+
+    def test_bulk_unlock_reports_objects_locked_only_by_their_parent(self) -> None:
+        ids = [illustration.pk for illustration in self.illustrations]
+        response = self.client.post('/illustrations/bulk-unlock/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {
+            'affected': 1, 'skipped': 1, 'results': {str(ids[0]): 'already_unlocked'}
+        })
+        self.assertFalse(Illustration.objects.filter(is_locked_flag=True).exists())
+
+    def test_bulk_lock_sets_the_flag_of_objects_locked_only_by_their_parent(self) -> None:
+        ids = [illustration.pk for illustration in self.illustrations]
+        response = self.client.post('/illustrations/bulk-lock/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {
+            'affected': 1, 'skipped': 1, 'results': {str(ids[1]): 'already_locked'}
+        })
+        self.assertEqual(Illustration.objects.filter(is_locked_flag=True).count(), 2)
+
+
+class APILockStatusTestCase(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        articles = Article.objects.bulk_create([
+            Article(title='Article %d' % i, is_locked_flag=i % 2 == 0) for i in range(1, 5)
+        ])
+        ArticleSection.objects.bulk_create([
+            ArticleSection(parent=article, heading='Section %d' % i, content='Lorem', order=i)
+            for i, article in enumerate(articles, 1)
+        ])
+
+    def test_lock_status_is_serialized_with_a_constant_number_of_queries(self) -> None:
+        for url, count in (('/articles/', 4), ('/sections/', 4)):
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(len(response.data), count)
+            self.assertEqual([item['locked'] for item in response.data], [False, True, False, True])
+
+    def test_lock_status_is_serialized_without_annotation(self) -> None:
+        article = Article.objects.get(title='Article 2')
+        self.assertEqual(ArticleSerializer(article, context={'request': None}).data['locked'], True)
+        response = self.client.put('/articles/%d/unlock/' % article.pk)
+        self.assertEqual(response.data['locked'], False)
+
+    def test_objects_are_filtered_by_lock_status(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get('/sections/', {'locked': 'true'})
+        self.assertEqual([item['heading'] for item in response.data], ['Section 2', 'Section 4'])
+        response = self.client.get('/articles/', {'locked': 'false'})
+        self.assertEqual([item['title'] for item in response.data], ['Article 1', 'Article 3'])
+        response = self.client.get('/articles/', {'locked': 'foo'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('locked', response.data)
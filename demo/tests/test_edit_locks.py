@@ -0,0 +1,163 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.admin import ModelAdmin
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.models import Article
+from django_object_lock.api.exceptions import APIObjectEditLocked
+from django_object_lock.edit_locks import (
+    CacheEditLockBackend, DatabaseEditLockBackend, acquire_edit_lock, acquire_edit_locks, get_edit_lock,
+    get_edit_lock_backend
+)
+from django_object_lock.models import EditLock
+
+
+class ArticleProxy(Article):
+    class Meta:
+        app_label = 'articles'
+        proxy = True
+
+
+class EditLockBackendTestsMixin:
+    backend_path: str
+
+    def setUp(self) -> None:
+        settings_override = override_settings(DJANGO_OBJECT_LOCK={'EDIT_LOCK_BACKEND': self.backend_path})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(cache.clear)
+        self.backend = get_edit_lock_backend()
+
+    def test_only_one_owner_can_acquire_a_lock(self) -> None:
+        self.assertTrue(self.backend.acquire('key', 'alice', 60))
+        self.assertFalse(self.backend.acquire('key', 'bob', 60))
+        self.assertTrue(self.backend.acquire('key', 'alice', 60))
+        self.assertEqual(self.backend.get('key').owner, 'alice')
+
+    def test_only_the_owner_can_renew_and_release_a_lock(self) -> None:
+        self.backend.acquire('key', 'alice', 60)
+        self.assertFalse(self.backend.renew('key', 'bob', 600))
+        self.assertTrue(self.backend.renew('key', 'alice', 600))
+        self.assertGreater(self.backend.get('key').expires_at, timezone.now() + timedelta(seconds=300))
+        self.assertFalse(self.backend.release('key', 'bob'))
+        self.assertTrue(self.backend.release('key', 'alice'))
+        self.assertIsNone(self.backend.get('key'))
+        self.assertTrue(self.backend.acquire('key', 'bob', 60))
+
+    def test_acquire_many_skips_locks_held_by_others(self) -> None:
+        self.backend.acquire('b', 'alice', 60)
+        self.backend.acquire('c', 'bob', 60)
+        self.assertEqual(self.backend.acquire_many(['a', 'b', 'c'], 'bob', 60), ['a', 'c'])
+
+
+class DatabaseEditLockBackendTestCase(EditLockBackendTestsMixin, TestCase):
+    backend_path = 'django_object_lock.edit_locks.DatabaseEditLockBackend'
+
+    def test_backend_setting(self) -> None:
+        self.assertIsInstance(self.backend, DatabaseEditLockBackend)
+
+    def test_expired_locks_can_be_acquired(self) -> None:
+        self.backend.acquire('a', 'alice', 60)
+        self.backend.acquire('b', 'alice', 60)
+        EditLock.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(self.backend.get('a'))
+        self.assertFalse(self.backend.renew('a', 'alice', 60))
+        self.assertTrue(self.backend.acquire('a', 'bob', 60))
+        self.assertEqual(self.backend.acquire_many(['b'], 'bob', 60), ['b'])
+
+    def test_acquire_many_uses_a_constant_number_of_queries(self) -> None:
+        with self.assertNumQueries(3):
+            self.backend.acquire_many([str(i) for i in range(50)], 'alice', 60)
+
+
+class CacheEditLockBackendTestCase(EditLockBackendTestsMixin, TestCase):
+    backend_path = 'django_object_lock.edit_locks.CacheEditLockBackend'
+
+    def test_backend_setting(self) -> None:
+        self.assertIsInstance(self.backend, CacheEditLockBackend)
+
+
+class EditLockIntegrationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.article = Article.objects.create(title='Article 1')
+        cls.alice = User.objects.create_superuser('alice', 'alice@example.com', '123')
+        cls.bob = User.objects.create_superuser('bob', 'bob@example.com', '123')
+
+    def get_client(self, user: User, client_class=Client) -> Client:
+        client = client_class()
+        client.force_login(user)
+        return client
+
+    def test_acquire_edit_locks_returns_acquired_objects(self) -> None:
+        articles = [self.article, Article.objects.create(title='Article 2')]
+        self.assertEqual(acquire_edit_locks(articles[:1], str(self.bob.pk)), articles[:1])
+        self.assertEqual(acquire_edit_locks(articles, str(self.alice.pk)), articles[1:])
+
+    def test_proxy_models_share_the_edit_lock_of_the_concrete_model(self) -> None:
+        self.assertTrue(acquire_edit_lock(self.article, str(self.alice.pk)))
+        self.assertFalse(acquire_edit_lock(ArticleProxy.objects.get(pk=self.article.pk), str(self.bob.pk)))
+
+    def test_admin_change_view_is_readonly_while_another_user_edits(self) -> None:
+        url = reverse('admin:articles_article_change', args=(self.article.pk,))
+        alice, bob = self.get_client(self.alice), self.get_client(self.bob)
+        self.assertTrue(alice.get(url).context['has_change_permission'])
+        self.assertEqual(get_edit_lock(self.article).owner, str(self.alice.pk))
+
+        response = bob.get(url)
+        self.assertFalse(response.context['has_change_permission'])
+        self.assertIn('is being edited by another user', response.content.decode())
+        self.assertEqual(bob.post(url, {'title': 'Edited by Bob'}).status_code, 403)
+
+        alice.post(url, {'title': 'Edited by Alice'})
+        self.assertEqual(Article.objects.get(pk=self.article.pk).title, 'Edited by Alice')
+        self.assertIsNone(get_edit_lock(self.article))
+        self.assertTrue(bob.get(url).context['has_change_permission'])
+
+    def test_admin_change_view_does_not_acquire_edit_lock_for_view_only_users(self) -> None:
+        viewer = User.objects.create_user('carol', 'carol@example.com', '123', is_staff=True)
+        viewer.user_permissions.add(Permission.objects.get(codename='view_article'))
+        url = reverse('admin:articles_article_change', args=(self.article.pk,))
+        response = self.get_client(viewer).get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['has_change_permission'])
+        self.assertIsNone(get_edit_lock(self.article))
+        self.assertTrue(self.get_client(self.bob).get(url).context['has_change_permission'])
+
+    def test_admin_change_view_loads_the_object_once(self) -> None:
+        url = reverse('admin:articles_article_change', args=(self.article.pk,))
+        client = self.get_client(self.alice)
+        patcher = mock.patch.object(ModelAdmin, 'get_object', autospec=True, side_effect=ModelAdmin.get_object)
+        with patcher as get_object:
+            self.assertTrue(client.get(url).context['has_change_permission'])
+        self.assertEqual(get_object.call_count, 1)
+        self.assertEqual(get_edit_lock(self.article).owner, str(self.alice.pk))
+
+    def test_api_update_is_rejected_while_another_user_edits(self) -> None:
+        url = '/articles/%d/' % self.article.pk
+        alice, bob = self.get_client(self.alice, APIClient), self.get_client(self.bob, APIClient)
+        response = alice.put(url + 'edit-lock/', format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owner'], str(self.alice.pk))
+
+        response = bob.patch(url, {'title': 'Edited by Bob'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], APIObjectEditLocked.default_detail)
+        self.assertEqual(bob.put(url + 'edit-lock/').status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(alice.patch(url, {'title': 'Edited by Alice'}, format='json').status_code, 200)
+
+        response = alice.delete(url + 'edit-lock/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(bob.patch(url, {'title': 'Edited by Bob'}, format='json').status_code, 200)
+
+    def test_anonymous_users_cannot_acquire_edit_locks(self) -> None:
+        response = APIClient().put('/articles/%d/edit-lock/' % self.article.pk)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
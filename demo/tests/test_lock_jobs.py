@@ -0,0 +1,148 @@
+from io import StringIO
+
+from django.contrib.admin import site
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from articles.admin import ArticleAdmin
+from articles.models import Article, NotLockedUUIDModel
+from django_object_lock.jobs import claim_lock_job, create_lock_job, run_lock_job
+from django_object_lock.models import LockJob
+from django_object_lock.utils import get_pk_ranges
+
+
+@override_settings(DJANGO_OBJECT_LOCK={'LOCK_JOBS_RUNNER': 'command'})
+class LockJobsTestCase(TestCase):
+    client = Client()
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        Article.objects.bulk_create([
+            Article(title=f'Article {i}', is_locked_flag=i % 3 == 0) for i in range(1, 11)
+        ])
+        cls.user = User.objects.create_superuser('foo', 'foo@example.com', '123')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_job_locks_all_objects_in_chunks(self) -> None:
+        job = create_lock_job(Article.objects.all(), True, chunk_size=3)
+        job = run_lock_job(claim_lock_job(job.pk))
+        self.assertEqual(job.status, LockJob.Status.DONE)
+        self.assertEqual((job.total, job.processed, job.affected), (10, 10, 7))
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_job_stores_primary_key_ranges_of_the_selected_objects(self) -> None:
+        job = create_lock_job(Article.objects.exclude(pk__in=[4, 5]).exclude(pk=9), True, chunk_size=3)
+        job.refresh_from_db()
+        self.assertEqual(job.pk_ranges, [[1, 3], [6, 8], [10, 10]])
+        self.assertEqual(job.total, 7)
+        # Objects created after the job are not selected.
+        Article.objects.create(title='Article 11')
+        self.assertEqual(list(job.iter_pk_chunks()), [[1, 2, 3], [6, 7, 8], [10]])
+        job = run_lock_job(claim_lock_job(job.pk))
+        self.assertEqual((job.processed, job.affected, job.last_pk), (7, 5, 10))
+        self.assertQuerysetEqual(Article.objects.unlocked().order_by('pk'), [4, 5, 11], lambda article: article.pk)
+
+    def test_non_integer_primary_keys_are_stored_once(self) -> None:
+        objects = NotLockedUUIDModel.objects.bulk_create([NotLockedUUIDModel() for _ in range(3)])
+        pks = sorted(str(obj.pk) for obj in objects)
+        self.assertEqual(get_pk_ranges(pks), pks)
+        job = create_lock_job(NotLockedUUIDModel.objects.all(), True, chunk_size=2)
+        job.refresh_from_db()
+        self.assertEqual(job.pk_ranges, pks)
+        self.assertEqual(job.total, 3)
+        self.assertEqual([[str(pk) for pk in chunk] for chunk in job.iter_pk_chunks()], [pks[:2], pks[2:]])
+
+    def test_job_resumes_after_last_processed_object(self) -> None:
+        job = create_lock_job(Article.objects.all(), False, chunk_size=4)
+        LockJob.objects.filter(pk=job.pk).update(status=LockJob.Status.RUNNING, last_pk=5, processed=5)
+        self.assertIsNone(claim_lock_job(job.pk))
+        job = run_lock_job(claim_lock_job(job.pk, resume=True))
+        self.assertEqual(job.processed, 10)
+        self.assertQuerysetEqual(Article.objects.locked(), [3], lambda article: article.pk)
+
+    def test_failed_chunks_are_recorded(self) -> None:
+        class FailingArticleAdmin(ArticleAdmin):
+            def set_queryset_locked_status(self, queryset, lock):
+                if 5 in queryset.values_list('pk', flat=True):
+                    raise RuntimeError('Boom')
+                return super().set_queryset_locked_status(queryset, lock)
+
+        job = create_lock_job(Article.objects.all(), True, chunk_size=5)
+        job = run_lock_job(claim_lock_job(job.pk), FailingArticleAdmin(Article, site))
+        self.assertEqual(job.status, LockJob.Status.FAILED)
+        self.assertEqual(job.errors, [{'first_pk': 1, 'last_pk': 5, 'error': 'Boom'}])
+        self.assertQuerysetEqual(Article.objects.unlocked().order_by('pk'), [1, 2, 4, 5], lambda article: article.pk)
+
+    def test_run_lock_jobs_command_runs_pending_jobs(self) -> None:
+        job = create_lock_job(Article.objects.filter(pk__lte=5), True)
+        call_command('run_lock_jobs', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, LockJob.Status.DONE)
+        self.assertEqual(job.affected, 4)
+
+    def test_admin_enqueues_job_and_shows_progress(self) -> None:
+        ArticleAdmin.lock_in_background = True
+        try:
+            response = self.client.post(reverse('admin:articles_article_lock'), data={'ids': '1,2,3'})
+        finally:
+            ArticleAdmin.lock_in_background = False
+        job = LockJob.objects.get()
+        self.assertRedirects(response, reverse('admin:articles_article_lock_job', args=(job.pk,)))
+        self.assertEqual(job.status, LockJob.Status.PENDING)
+        self.assertTrue(Article.objects.filter(pk=1, is_locked_flag=False).exists())
+
+        response = self.client.get(response.url)
+        self.assertIn(b'0 / 3', response.content)
+        call_command('run_lock_jobs', stdout=StringIO())
+        response = self.client.get(reverse('admin:articles_article_lock_job', args=(job.pk,)), {'format': 'json'})
+        self.assertEqual(response.json()['processed'], 3)
+        self.assertEqual(response.json()['status'], LockJob.Status.DONE)
+
+    def test_admin_job_selects_objects_across_all_pages_when_it_starts(self) -> None:
+        response = self.client.post(reverse('admin:articles_article_changelist') + '?locked=0', data={
+            'action': 'lock',
+            'select_across': '1',
+            ACTION_CHECKBOX_NAME: '1',
+        })
+        token = response.url.split('selection=')[1]
+        ArticleAdmin.lock_in_background = True
+        try:
+            response = self.client.post(reverse('admin:articles_article_lock'), data={'selection': token})
+        finally:
+            ArticleAdmin.lock_in_background = False
+        # The objects are not selected by the request creating the job.
+        job = LockJob.objects.get()
+        self.assertEqual((job.filters, job.user, job.pk_ranges, job.total), ('locked=0', self.user, [], 0))
+        response = self.client.get(response.url)
+        self.assertIn(b'The objects are being selected', response.content)
+
+        Article.objects.create(title='Article 11')
+        call_command('run_lock_jobs', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, LockJob.Status.DONE)
+        self.assertEqual((job.filters, job.total, job.affected), ('', 8, 8))
+        self.assertFalse(Article.objects.unlocked().exists())
+
+    def test_job_with_invalid_filters_fails(self) -> None:
+        job = create_lock_job(Article.objects.all(), True, filters='missing__field=1', user=self.user)
+        job = run_lock_job(claim_lock_job(job.pk))
+        self.assertEqual(job.status, LockJob.Status.FAILED)
+        self.assertEqual(job.errors, [
+            {'first_pk': None, 'last_pk': None, 'error': 'The selected filters are not valid.'},
+        ])
+        self.assertEqual(Article.objects.locked().count(), 3)
+
+    def test_job_progress_does_not_load_primary_key_ranges(self) -> None:
+        job = create_lock_job(Article.objects.all(), True)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('admin:articles_article_lock_job', args=(job.pk,)), {'format': 'json'})
+        job_queries = [query['sql'] for query in queries if LockJob._meta.db_table in query['sql']]
+        self.assertEqual(len(job_queries), 1)
+        self.assertNotIn('pk_ranges', job_queries[0])
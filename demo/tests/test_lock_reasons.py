@@ -0,0 +1,198 @@
+from django.contrib.admin import site
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from articles.admin import ContractAdmin
+from articles.models import Contract
+from django_object_lock.fields import LockField
+
+
+PUBLISHED, LEGAL_HOLD, PERIOD_CLOSED = 1, 2, 4
+
+
+class LockReasonsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        Contract.objects.bulk_create([
+            Contract(pk=1, title='Not locked'),
+            Contract(pk=2, title='Published', lock_reasons=PUBLISHED),
+            Contract(pk=3, title='Legal hold', lock_reasons=LEGAL_HOLD),
+            Contract(pk=4, title='Published and legal hold', lock_reasons=PUBLISHED | LEGAL_HOLD),
+        ])
+
+    def assertPks(self, queryset, pks) -> None:
+        self.assertQuerysetEqual(queryset.order_by('pk'), pks, lambda obj: obj.pk)
+
+    def test_objects_are_locked_for_any_reason(self) -> None:
+        self.assertPks(Contract.objects.locked(), [2, 3, 4])
+        self.assertEqual([contract.is_locked() for contract in Contract.objects.order_by('pk')], [
+            False, True, True, True
+        ])
+        self.assertEqual(Contract.objects.get(pk=4).get_lock_reasons(), ['published', 'legal_hold'])
+
+    def test_has_reason_lookup_uses_an_in_list(self) -> None:
+        queryset = Contract.objects.filter(lock_reasons__has_reason='legal_hold')
+        self.assertPks(queryset, [3, 4])
+        self.assertIn('IN', str(queryset.query))
+        self.assertNotIn('&', str(queryset.query))
+        self.assertPks(Contract.objects.locked('published'), [2, 4])
+        self.assertPks(Contract.objects.exclude(lock_reasons__has_reason=PUBLISHED), [1, 3])
+
+    def test_unknown_reasons_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            Contract.objects.filter(lock_reasons__has_reason='unknown')
+        with self.assertRaises(ValueError):
+            Contract.objects.get(pk=1).lock('unknown')
+
+    def test_lock_and_unlock_each_reason_independently(self) -> None:
+        contract = Contract.objects.get(pk=2)
+        self.assertTrue(contract.lock('legal_hold'))
+        self.assertFalse(contract.lock('legal_hold'))
+        self.assertTrue(contract.unlock('published'))
+        self.assertFalse(contract.unlock('published'))
+        self.assertEqual(contract.get_lock_reasons(), ['legal_hold'])
+        self.assertEqual(Contract.objects.get(pk=2).lock_reasons, LEGAL_HOLD)
+        self.assertTrue(contract.is_locked())
+
+    def test_lock_of_a_locked_instance_reads_its_lock_reasons(self) -> None:
+        contract = Contract.objects.get(pk=1)
+        Contract.objects.filter(pk=1).update(lock_reasons=LEGAL_HOLD)
+        self.assertFalse(contract.lock())
+        self.assertEqual(contract.lock_reasons, LEGAL_HOLD)
+        self.assertFalse(contract.unlock('published'))
+        self.assertEqual(contract.get_lock_reasons(), ['legal_hold'])
+
+    def test_lock_and_unlock_reasons_with_a_single_update(self) -> None:
+        contract = Contract.objects.get(pk=3)
+        with self.assertNumQueries(1):
+            contract.lock('period_closed')
+        with self.assertNumQueries(1):
+            self.assertEqual(Contract.objects.lock('published'), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(Contract.objects.unlock('legal_hold'), 2)
+        self.assertEqual(
+            list(Contract.objects.order_by('pk').values_list('lock_reasons', flat=True)),
+            [PUBLISHED, PUBLISHED, PUBLISHED | PERIOD_CLOSED, PUBLISHED]
+        )
+
+    def test_lock_and_unlock_without_a_reason(self) -> None:
+        self.assertEqual(Contract.objects.lock(), 1)
+        self.assertEqual(Contract.objects.get(pk=1).lock_reasons, PUBLISHED)
+        self.assertEqual(Contract.objects.unlock(), 4)
+        self.assertFalse(Contract.objects.locked().exists())
+
+    def test_set_lock_reason(self) -> None:
+        contract = Contract.objects.get(pk=4)
+        contract.set_lock_reason('published', False)
+        contract.set_lock_reason('in_review', True)
+        self.assertEqual(contract.get_lock_reasons(), ['legal_hold', 'in_review'])
+
+    def test_field_deconstruction(self) -> None:
+        field = Contract._meta.get_field('lock_reasons')
+        _name, path, _args, kwargs = field.deconstruct()
+        self.assertEqual(path, 'django_object_lock.fields.LockField')
+        self.assertEqual(LockField(**kwargs).reasons, field.reasons)
+        self.assertNotIn('db_index', kwargs)
+
+    def test_field_checks(self) -> None:
+        for reasons, error_id in (([], 'django_object_lock.E001'), (list('abcdefghi'), 'django_object_lock.E002')):
+            field = LockField(reasons=[(reason, reason) for reason in reasons])
+            field.set_attributes_from_name('lock_reasons')
+            self.assertEqual([error.id for error in field.check()], [error_id])
+
+
+class AdminLockReasonsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        Contract.objects.bulk_create([
+            Contract(pk=1, title='Contract 1'),
+            Contract(pk=2, title='Contract 2', lock_reasons=LEGAL_HOLD),
+        ])
+        cls.user = User.objects.create_superuser('foo', 'foo@example.com', '123')
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_changelist_shows_lock_reasons(self) -> None:
+        self.assertEqual(ContractAdmin(Contract, site).locked_reasons(Contract.objects.get(pk=2)), 'Legal hold')
+        response = self.client.get(reverse('admin:articles_contract_changelist'))
+        self.assertContains(response, 'Legal hold')
+
+    def test_actions_are_added_for_each_reason(self) -> None:
+        request = RequestFactory().get('/')
+        request.user = self.user
+        actions = ContractAdmin(Contract, site).get_actions(request)
+        self.assertIn('lock__legal_hold', actions)
+        self.assertIn('unlock__in_review', actions)
+        self.assertEqual(str(actions['lock__legal_hold'][2]), 'Lock selected %(verbose_name_plural)s (Legal hold)')
+
+    def test_reason_action_only_sets_that_reason(self) -> None:
+        response = self.client.post(reverse('admin:articles_contract_changelist'), data={
+            'action': 'lock__published',
+            ACTION_CHECKBOX_NAME: ['1', '2'],
+        })
+        self.assertIn('reason=published', response.url)
+        response = self.client.get(response.url)
+        self.assertContains(response, 'Contracts: 2')
+        self.assertContains(response, 'name="reason" value="published"')
+        self.client.post(response.wsgi_request.get_full_path(), data={
+            'selection': response.context['selection'], 'reason': 'published'
+        })
+        self.assertEqual(
+            list(Contract.objects.order_by('pk').values_list('lock_reasons', flat=True)),
+            [PUBLISHED, PUBLISHED | LEGAL_HOLD]
+        )
+
+    def test_unknown_reason_redirects_to_the_changelist(self) -> None:
+        response = self.client.get(reverse('admin:articles_contract_unlock'), data={'ids': '2', 'reason': 'foo'})
+        self.assertRedirects(response, reverse('admin:articles_contract_changelist'))
+        self.assertEqual(Contract.objects.get(pk=2).lock_reasons, LEGAL_HOLD)
+
+
+class APILockReasonsTestCase(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        Contract.objects.bulk_create([
+            Contract(pk=1, title='Contract 1'),
+            Contract(pk=2, title='Contract 2', lock_reasons=LEGAL_HOLD),
+            Contract(pk=3, title='Contract 3', lock_reasons=PUBLISHED),
+        ])
+
+    def test_lock_and_unlock_a_reason(self) -> None:
+        response = self.client.put('/contracts/2/lock/', {'reason': 'published'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['lock_reasons'], PUBLISHED | LEGAL_HOLD)
+        response = self.client.put('/contracts/2/lock/', {'reason': 'published'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.put('/contracts/2/unlock/?reason=legal_hold')
+        self.assertEqual(response.data['lock_reasons'], PUBLISHED)
+
+    def test_unknown_reason_is_a_validation_error(self) -> None:
+        response = self.client.put('/contracts/1/lock/', {'reason': 'foo'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('reason', response.data)
+
+    def test_lock_status_lists_reasons(self) -> None:
+        response = self.client.get('/contracts/2/lock-status/')
+        self.assertEqual(response.data, {'locked': True, 'reasons': ['legal_hold']})
+        self.assertEqual(response['ETag'], '"locked:legal_hold"')
+        response = self.client.get('/contracts/1/lock-status/')
+        self.assertEqual(response.data, {'locked': False, 'reasons': []})
+
+    def test_bulk_lock_a_reason(self) -> None:
+        response = self.client.post(
+            '/contracts/bulk-lock/', {'ids': [1, 2, 3], 'reason': 'published'}, format='json'
+        )
+        self.assertEqual(response.data, {'affected': 2, 'skipped': 1, 'results': {'3': 'already_locked'}})
+        self.assertEqual(Contract.objects.get(pk=2).lock_reasons, PUBLISHED | LEGAL_HOLD)
+        response = self.client.post('/contracts/bulk-unlock/', {'all': True, 'reason': 'legal_hold'}, format='json')
+        self.assertEqual(response.data, {'affected': 1, 'skipped': 2})
+        self.assertEqual(Contract.objects.filter(lock_reasons=PUBLISHED).count(), 3)
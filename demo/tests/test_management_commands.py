@@ -0,0 +1,60 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command, CommandError
+from django.db.models import Q
+from django.test import TestCase
+
+from articles.models import Article, ArticleSection
+
+
+class ManagementCommandsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        articles = Article.objects.bulk_create([
+            Article(title=f'Article {i}', is_locked_flag=i % 2 == 0) for i in range(1, 11)
+        ])
+        ArticleSection.objects.bulk_create([
+            ArticleSection(parent=article, heading='Section', content='Lorem', order=1) for article in articles
+        ])
+
+    def call_command(self, *args, **kwargs) -> str:
+        stdout = StringIO()
+        call_command(*args, stdout=stdout, **kwargs)
+        return stdout.getvalue()
+
+    def test_lock_objects_locks_matching_objects_in_chunks(self) -> None:
+        output = self.call_command('lock_objects', 'articles.Article', '--filter', 'pk__lte=5', '--chunk-size', '2')
+        self.assertIn('3 of 5 selected articles locked', output)
+        self.assertIn('rows/s', output)
+        self.assertQuerysetEqual(Article.objects.unlocked().order_by('pk'), [7, 9], lambda article: article.pk)
+
+    def test_unlock_objects_unlocks_matching_objects(self) -> None:
+        output = self.call_command('unlock_objects', 'articles.Article', '--exclude', 'title="Article 10"')
+        self.assertIn('4 of 9 selected articles unlocked', output)
+        self.assertQuerysetEqual(Article.objects.locked(), [10], lambda article: article.pk)
+
+    def test_dry_run_only_counts_objects(self) -> None:
+        output = self.call_command('lock_objects', 'articles.Article', '--filter', 'is_locked_flag=false', '--dry-run')
+        self.assertIn('5 of 5 selected articles would be locked', output)
+        self.assertEqual(Article.objects.locked().count(), 5)
+
+    def test_dry_run_counts_objects_whose_lock_fields_change(self) -> None:
+        with mock.patch.object(Article, 'lock_condition', Q(is_locked_flag=True) | Q(title='Article 1')):
+            output = self.call_command('lock_objects', 'articles.Article', '--filter', 'pk__lte=3', '--dry-run')
+            self.assertIn('2 of 3 selected articles would be locked', output)
+            output = self.call_command('lock_objects', 'articles.Article', '--filter', 'pk__lte=3')
+            self.assertIn('2 of 3 selected articles locked', output)
+
+    def test_objects_without_set_locked_cannot_be_locked(self) -> None:
+        with self.assertRaises(NotImplementedError):
+            self.call_command('lock_objects', 'articles.ArticleSection')
+
+    def test_invalid_model_raises_command_error(self) -> None:
+        with self.assertRaises(CommandError):
+            self.call_command('lock_objects', 'articles.Foo')
+
+    def test_invalid_lookup_raises_command_error(self) -> None:
+        with self.assertRaises(CommandError):
+            self.call_command('lock_objects', 'articles.Article', '--filter', 'foo')
@@ -1,7 +1,14 @@
+from unittest import mock
+
+import django
+from django.db import connection, transaction
+from django.db.models import Q
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django_object_lock.exceptions import ObjectLocked
 
-from articles.models import Article, ArticleSection
+from articles.models import Article, ArticleSection, Contract, Footnote, NotLockedModel, NotLockedUUIDModel
+from django_object_lock.models import ObjectLock, ObjectLockManager
 
 
 class ModelLockingTestCase(TestCase):
@@ -24,6 +31,12 @@ class ModelLockingTestCase(TestCase):
         ]
         ArticleSection.objects.bulk_create(article_sections)
 
+        footnotes = [
+            Footnote(section=article_sections[0], text='Ipsum'),
+            Footnote(section=article_sections[1], text='Sit'),
+        ]
+        Footnote.objects.bulk_create(footnotes)
+
     def test_unlocked_instance_can_be_saved(self) -> None:
         article = Article.objects.get(pk=1)
         article.title = 'Article 1 Edited'
@@ -67,3 +80,474 @@ class ModelLockingTestCase(TestCase):
         with self.assertRaises(ObjectLocked):
             article.delete()
         self.assertEqual(article.pk, 5)
+
+    def test_locked_objects_are_filtered_in_the_database(self) -> None:
+        self.assertQuerysetEqual(Article.objects.locked(), [2, 3, 5], lambda article: article.pk, ordered=False)
+        self.assertQuerysetEqual(ArticleSection.objects.locked(), [2], lambda section: section.pk)
+
+    def test_unlocked_objects_are_filtered_in_the_database(self) -> None:
+        self.assertQuerysetEqual(Article.objects.unlocked(), [1, 4], lambda article: article.pk, ordered=False)
+        self.assertQuerysetEqual(ArticleSection.objects.unlocked(), [1], lambda section: section.pk)
+
+    def test_lock_status_annotation_matches_is_locked(self) -> None:
+        for section in ArticleSection.objects.with_lock_status():
+            self.assertEqual(section.is_locked(), ArticleSection.objects.get(pk=section.pk).parent.is_locked())
+
+    def test_is_locked_is_derived_from_lock_condition(self) -> None:
+        sections = list(ArticleSection.objects.with_lock_status().order_by('pk'))
+        with self.assertNumQueries(0):
+            self.assertEqual([section.is_locked() for section in sections], [False, True])
+
+    def test_q_lock_condition_is_evaluated_on_unsaved_changes(self) -> None:
+        with mock.patch.object(Article, 'lock_condition', Q(is_locked_flag=True) | Q(pk__in=[4])):
+            article = Article.objects.get(pk=2)
+            with self.assertNumQueries(0):
+                self.assertTrue(article.is_locked())
+            article.set_locked(False)
+            self.assertFalse(article.is_locked())
+            article.save()
+            self.assertFalse(Article.objects.get(pk=2).is_locked_flag)
+            self.assertTrue(Article.objects.get(pk=4).is_locked())
+
+    def test_q_lock_condition_on_strings_is_evaluated_in_the_database(self) -> None:
+        # The database compares strings according to its collation, which may differ from Python.
+        with mock.patch.object(Article, 'lock_condition', Q(is_locked_flag=True) | Q(title__in=['Archived'])):
+            article = Article.objects.get(pk=1)
+            with self.assertNumQueries(1):
+                self.assertFalse(article.is_locked())
+
+    def test_q_lock_condition_arguments_are_coerced_to_the_field_type(self) -> None:
+        article = Article.objects.get(pk=1)
+        for condition, expected in [
+            (Q(pk='1'), True),
+            (Q(pk__in=['2', '3']), False),
+            (Q(is_locked_flag='0'), True),
+            (Q(pk__gt='1'), False),
+        ]:
+            with self.subTest(condition=condition), mock.patch.object(Article, 'lock_condition', condition):
+                with self.assertNumQueries(0):
+                    self.assertIs(article.is_locked(), expected)
+                self.assertEqual(Article.objects.locked().filter(pk=1).exists(), expected)
+
+    def test_q_lock_condition_following_relations_is_evaluated_in_the_database(self) -> None:
+        with mock.patch.object(ArticleSection, 'lock_condition', Q(parent__title='Article 1')):
+            section = ArticleSection.objects.get(pk=1)
+            with self.assertNumQueries(1):
+                self.assertTrue(section.is_locked())
+
+    def test_inherited_lock_status_is_annotated_with_a_single_query(self) -> None:
+        with self.assertNumQueries(1):
+            footnotes = list(Footnote.objects.with_lock_status().order_by('pk'))
+            self.assertEqual([footnote.is_locked() for footnote in footnotes], [False, True])
+
+    def test_inherited_lock_condition_follows_the_inheritance_chain(self) -> None:
+        self.assertEqual(Footnote.get_lock_inheritance_path(), 'section__parent')
+        self.assertQuerysetEqual(Footnote.objects.locked(), [2], lambda footnote: footnote.pk)
+        self.assertQuerysetEqual(Footnote.objects.unlocked(), [1], lambda footnote: footnote.pk)
+
+    def test_single_fetch_joins_inherited_lock_status(self) -> None:
+        with self.assertNumQueries(1):
+            self.assertTrue(Footnote.objects.get(pk=2).is_locked())
+
+    def test_single_fetch_does_not_join_for_update_or_nullable_relations(self) -> None:
+        with transaction.atomic(), CaptureQueriesContext(connection) as context:
+            Footnote.objects.select_for_update().get(pk=2)
+        self.assertNotIn('JOIN', context.captured_queries[0]['sql'])
+        with mock.patch.object(ArticleSection._meta.get_field('parent'), 'null', True):
+            with self.assertNumQueries(3):
+                self.assertTrue(Footnote.objects.get(pk=2).is_locked())
+
+    def test_inherited_locked_instance_cannot_be_deleted(self) -> None:
+        footnote = Footnote.objects.get(pk=2)
+        with self.assertRaises(ObjectLocked):
+            footnote.delete()
+        self.assertTrue(Footnote.objects.filter(pk=2).exists())
+
+    def test_loading_related_locked_instances_does_not_query_related_objects(self) -> None:
+        with self.assertNumQueries(1):
+            sections = list(ArticleSection.objects.all())
+        self.assertEqual(len(sections), 2)
+
+    def test_loading_related_objects_does_not_take_lock_snapshots(self) -> None:
+        article = Article.objects.get(pk=1)
+        ArticleSection.objects.bulk_create([
+            ArticleSection(parent=article, heading=f'Section 1.{i}', content='Lorem', order=i) for i in range(2, 6)
+        ])
+        with self.assertNumQueries(1):
+            sections = list(article.sections.all())
+        self.assertEqual(len(sections), 5)
+        with self.assertNumQueries(2):
+            articles = list(Article.objects.prefetch_related('sections'))
+        self.assertEqual(sum(len(article.sections.all()) for article in articles), 6)
+        with self.assertNumQueries(2):
+            self.assertEqual(Article.objects.get(pk=1).rendered_content.count('<h1>'), 5)
+
+    def test_lock_snapshot_is_taken_when_changing_a_relation(self) -> None:
+        section = ArticleSection.objects.get(pk=1)
+        section.parent = Article.objects.get(pk=2)
+        section.heading = 'Section 1.1 Edited'
+        section.save()
+        self.assertEqual(ArticleSection.objects.get(pk=1).heading, 'Section 1.1 Edited')
+
+    def test_lock_status_on_load_is_taken_before_first_change(self) -> None:
+        article = Article.objects.get(pk=1)
+        article.set_locked(True)
+        article.title = 'Article 1 Edited'
+        article.save()
+        self.assertTrue(Article.objects.get(pk=1).is_locked())
+
+    def test_annotated_lock_status_is_used_as_lock_status_on_load(self) -> None:
+        article_section = ArticleSection.objects.with_lock_status().get(pk=2)
+        with self.assertRaises(ObjectLocked):
+            with self.assertNumQueries(1):
+                article_section.heading = 'Section 2.1 Edited'
+                article_section.save()
+
+    def test_queryset_update_raises_if_any_object_is_locked(self) -> None:
+        with self.assertRaises(ObjectLocked):
+            Article.objects.filter(pk__in=[1, 2]).update(title='Edited')
+        self.assertFalse(Article.objects.filter(title='Edited').exists())
+
+    def test_queryset_update_of_unlocked_objects_is_allowed(self) -> None:
+        self.assertEqual(Article.objects.filter(pk__in=[1, 4]).update(title='Edited'), 2)
+
+    def test_queryset_update_of_lock_status_is_allowed(self) -> None:
+        self.assertEqual(Article.objects.update(is_locked_flag=False), 5)
+
+    def test_queryset_update_checks_inherited_lock_status(self) -> None:
+        with self.assertRaises(ObjectLocked):
+            ArticleSection.objects.update(heading='Edited')
+
+    def test_queryset_update_unlocked_skips_locked_objects(self) -> None:
+        with self.assertNumQueries(2):
+            result = Article.objects.update_unlocked(title='Edited')
+        self.assertEqual((result.affected, result.skipped), (2, 3))
+        self.assertQuerysetEqual(
+            Article.objects.filter(title='Edited'), [1, 4], lambda article: article.pk, ordered=False
+        )
+
+    def test_queryset_delete_raises_if_any_object_is_locked(self) -> None:
+        with self.assertRaises(ObjectLocked):
+            Article.objects.filter(pk__in=[4, 5]).delete()
+        self.assertEqual(Article.objects.filter(pk__in=[4, 5]).count(), 2)
+
+    def test_queryset_delete_unlocked_skips_locked_objects(self) -> None:
+        result = Footnote.objects.all().delete_unlocked()
+        self.assertEqual((result.affected, result.skipped), (1, 1))
+        self.assertQuerysetEqual(Footnote.objects.all(), [2], lambda footnote: footnote.pk)
+
+    def test_bulk_update_raises_listing_locked_objects(self) -> None:
+        articles = list(Article.objects.all())
+        for article in articles:
+            article.title = 'Edited'
+        with self.assertRaises(ObjectLocked) as context:
+            Article.objects.bulk_update(articles, ['title'])
+        self.assertEqual(sorted(context.exception.pks), [2, 3, 5])
+        self.assertFalse(Article.objects.filter(title='Edited').exists())
+
+    def test_bulk_update_of_unlocked_objects_checks_lock_status_once(self) -> None:
+        articles = list(Article.objects.filter(pk__in=[1, 4]))
+        for article in articles:
+            article.title = 'Edited'
+        with self.assertNumQueries(2):
+            self.assertEqual(Article.objects.bulk_update(articles, ['title']), 2)
+
+    def test_bulk_update_checks_large_batches_of_objects(self) -> None:
+        Article.objects.bulk_create([Article(title=f'Bulk {i}', is_locked_flag=i == 1100) for i in range(1200)])
+        articles = list(Article.objects.filter(title__startswith='Bulk'))
+        for article in articles:
+            article.title += ' edited'
+        with CaptureQueriesContext(connection) as context:
+            with self.assertRaises(ObjectLocked) as raised:
+                Article.objects.bulk_update(articles, ['title'], batch_size=500)
+        self.assertEqual(raised.exception.pks, [Article.objects.get(title='Bulk 1100').pk])
+        self.assertEqual(len(context.captured_queries), 3)
+        unlocked, locked, _locked_pks = Article.objects.all()._split_locked(articles[:1050], ['id', 'title'])
+        self.assertEqual((len(unlocked), len(locked)), (1050, 0))
+        result = Article.objects.bulk_update_unlocked(articles, ['title'])
+        self.assertEqual((result.affected, len(result.skipped)), (1199, 1))
+
+    def test_bulk_update_unlocked_skips_locked_objects(self) -> None:
+        sections = list(ArticleSection.objects.all())
+        for section in sections:
+            section.heading = 'Edited'
+        result = ArticleSection.objects.bulk_update_unlocked(sections, ['heading'])
+        self.assertEqual(result.affected, 1)
+        self.assertEqual([section.pk for section in result.skipped], [2])
+        self.assertQuerysetEqual(ArticleSection.objects.filter(heading='Edited'), [1], lambda section: section.pk)
+
+    def test_bulk_create_raises_when_updating_locked_conflicts(self) -> None:
+        articles = [Article(pk=4, title='Edited'), Article(pk=5, title='Edited')]
+        with self.assertRaises(ObjectLocked) as context:
+            Article.objects.bulk_create(articles, update_conflicts=True, update_fields=['title'], unique_fields=['id'])
+        self.assertEqual(context.exception.pks, [5])
+        self.assertFalse(Article.objects.filter(title='Edited').exists())
+
+    def test_bulk_create_unlocked_skips_locked_conflicts(self) -> None:
+        articles = [Article(pk=4, title='Edited'), Article(pk=5, title='Edited'), Article(title='Article 6')]
+        result = Article.objects.bulk_create_unlocked(
+            articles, update_conflicts=True, update_fields=['title'], unique_fields=['id']
+        )
+        self.assertEqual(result.affected, 2)
+        self.assertEqual([article.pk for article in result.skipped], [5])
+        self.assertEqual(Article.objects.get(pk=4).title, 'Edited')
+        self.assertEqual(Article.objects.get(pk=5).title, 'Article 5')
+
+    def test_bulk_create_without_unique_fields_checks_rows_conflicting_on_unique_constraints(self) -> None:
+        Contract.objects.bulk_create([
+            Contract(pk=1, title='Contract 1', reference='C-1', lock_reasons=1),
+            Contract(pk=2, title='Contract 2', reference='C-2'),
+        ])
+        # Databases that do not support conflict targets update the rows conflicting on any unique constraint.
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            contracts = [Contract(title='Edited', reference='C-1'), Contract(title='Edited', reference='C-2')]
+            with self.assertRaises(ObjectLocked) as context:
+                Contract.objects.bulk_create(contracts, update_conflicts=True, update_fields=['title'])
+            self.assertEqual(context.exception.pks, [1])
+            result = Contract.objects.bulk_create_unlocked(
+                contracts[:1], update_conflicts=True, update_fields=['title']
+            )
+        self.assertEqual((result.affected, result.skipped), (0, contracts[:1]))
+        self.assertFalse(Contract.objects.filter(title='Edited').exists())
+
+    def test_lock_is_compare_and_set(self) -> None:
+        article = Article.objects.get(pk=1)
+        stale_article = Article.objects.get(pk=1)
+        with self.assertNumQueries(1):
+            self.assertTrue(article.lock())
+        self.assertTrue(article.is_locked())
+        self.assertFalse(stale_article.lock())
+        self.assertTrue(Article.objects.get(pk=1).is_locked())
+
+    def test_unlock_is_compare_and_set(self) -> None:
+        article = Article.objects.get(pk=2)
+        self.assertTrue(article.unlock())
+        self.assertFalse(article.unlock())
+        self.assertFalse(Article.objects.get(pk=2).is_locked())
+        article.title = 'Article 2 Edited'
+        article.save()
+
+    def test_lock_without_lock_field_or_set_locked_raises(self) -> None:
+        footnote = Footnote.objects.get(pk=1)
+        with self.assertRaises(NotImplementedError):
+            footnote.lock()
+
+    def test_queryset_lock_and_unlock_return_changed_count(self) -> None:
+        self.assertEqual(Article.objects.lock(), 2)
+        self.assertEqual(Article.objects.lock(), 0)
+        self.assertEqual(Article.objects.filter(pk__in=[1, 2]).unlock(), 2)
+        with self.assertRaises(NotImplementedError):
+            ArticleSection.objects.lock()
+
+
+class ConditionalSaveTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        articles = Article.objects.bulk_create([
+            Article(title='Article 1', is_locked_flag=False),
+            Article(title='Article 2', is_locked_flag=True),
+        ])
+        ArticleSection.objects.bulk_create([
+            ArticleSection(parent=articles[0], heading='Section 1.1', content='Lorem', order=1),
+            ArticleSection(parent=articles[1], heading='Section 2.1', content='Dolor', order=1),
+        ])
+
+    def setUp(self) -> None:
+        for model in (Article, ArticleSection):
+            patcher = mock.patch.object(model, 'lock_conditional_save', True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unlocked_instance_is_saved_with_a_single_query(self) -> None:
+        article = Article.objects.get(pk=1)
+        article.title = 'Article 1 Edited'
+        with self.assertNumQueries(1):
+            article.save()
+        self.assertEqual(Article.objects.get(pk=1).title, 'Article 1 Edited')
+
+    def test_instance_locked_after_load_cannot_be_saved(self) -> None:
+        article = Article.objects.get(pk=1)
+        Article.objects.filter(pk=1).update(is_locked_flag=True)
+        article.title = 'Article 1 Edited'
+        with self.assertRaises(ObjectLocked), transaction.atomic():
+            article.save()
+        self.assertEqual(Article.objects.get(pk=1).title, 'Article 1')
+
+    def test_locked_instance_cannot_be_saved(self) -> None:
+        article = Article.objects.get(pk=2)
+        article.title = 'Article 2 Edited'
+        with self.assertRaises(ObjectLocked), transaction.atomic():
+            article.save()
+        self.assertEqual(Article.objects.get(pk=2).title, 'Article 2')
+
+    def test_locked_instance_can_be_saved_when_unlocked(self) -> None:
+        article = Article.objects.get(pk=2)
+        article.set_locked(False)
+        article.title = 'Article 2 Edited'
+        article.save()
+        self.assertEqual(Article.objects.get(pk=2).title, 'Article 2 Edited')
+        article.title = 'Article 2 Edited again'
+        article.save()
+        self.assertEqual(Article.objects.get(pk=2).title, 'Article 2 Edited again')
+
+    def test_instance_whose_parent_is_locked_after_load_cannot_be_saved(self) -> None:
+        section = ArticleSection.objects.get(pk=1)
+        Article.objects.filter(pk=1).update(is_locked_flag=True)
+        section.heading = 'Section 1.1 Edited'
+        with self.assertRaises(ObjectLocked), transaction.atomic():
+            section.save()
+        self.assertEqual(ArticleSection.objects.get(pk=1).heading, 'Section 1.1')
+
+    def test_custom_lock_condition_is_rejected_by_system_checks(self) -> None:
+        self.assertEqual(Article.check(), [])
+        with mock.patch.object(Article, 'lock_condition', Q(is_locked_flag=True) | Q(title='Archived')):
+            self.assertEqual([error.id for error in Article.check()], ['django_object_lock.E003'])
+        with mock.patch.object(Article, 'lock_condition', 'is_locked_flag'):
+            self.assertEqual(Article.check(), [])
+
+    def test_new_instance_with_primary_key_is_inserted(self) -> None:
+        Article(pk=10, title='Article 10').save()
+        self.assertEqual(Article.objects.get(pk=10).title, 'Article 10')
+
+
+class CascadeDeletionTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        for i in range(1, 4):
+            article = Article.objects.create(pk=i, title=f'Article {i}')
+            for j in range(1, 4):
+                section = ArticleSection.objects.create(
+                    parent=article, heading=f'Section {i}.{j}', content='Lorem', order=j
+                )
+                Footnote.objects.bulk_create([Footnote(section=section, text=f'Footnote {k}') for k in range(2)])
+        ArticleSection.objects.filter(heading='Section 3.2').update(heading='Locked')
+
+    def setUp(self) -> None:
+        # Sections are also locked on their own if their heading is "Locked".
+        patcher = mock.patch.object(ArticleSection, 'lock_condition', Q(heading='Locked'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_deleting_an_instance_checks_objects_deleted_in_cascade(self) -> None:
+        locked_section = ArticleSection.objects.get(heading='Locked')
+        with self.assertRaises(ObjectLocked) as context:
+            Article.objects.get(pk=3).delete()
+        self.assertEqual(context.exception.pks_by_model, {
+            'articles.ArticleSection': [locked_section.pk],
+            'articles.Footnote': list(locked_section.footnotes.order_by('pk').values_list('pk', flat=True)),
+        })
+        self.assertEqual(ArticleSection.objects.filter(parent=3).count(), 3)
+        self.assertEqual(Footnote.objects.filter(section__parent=3).count(), 6)
+
+    def test_deleting_a_queryset_checks_objects_deleted_in_cascade(self) -> None:
+        with self.assertRaises(ObjectLocked):
+            Article.objects.all().delete()
+        self.assertEqual(Article.objects.count(), 3)
+        self.assertEqual(Article.objects.get(pk=1).delete()[1], {
+            'articles.Footnote': 6, 'articles.ArticleSection': 3, 'articles.Article': 1
+        })
+
+    def test_delete_unlocked_checks_objects_deleted_in_cascade(self) -> None:
+        Article.objects.filter(pk=2).lock()
+        with self.assertRaises(ObjectLocked):
+            Article.objects.all().delete_unlocked()
+        self.assertEqual(Article.objects.filter(pk__in=[1, 2]).delete_unlocked(), (1 + 3 + 6, 1))
+
+    def test_objects_locked_in_the_object_lock_table_are_checked_when_deleted_in_cascade(self) -> None:
+        attachments = NotLockedModel.objects.bulk_create([
+            NotLockedModel(name=f'Attachment {i}', article_id=1) for i in range(3)
+        ])
+        ObjectLock.objects.lock(attachments[1])
+        with self.assertRaises(ObjectLocked) as context:
+            Article.objects.get(pk=1).delete()
+        self.assertEqual(context.exception.pks_by_model, {'articles.NotLockedModel': [attachments[1].pk]})
+        with self.assertRaises(ObjectLocked):
+            Article.objects.filter(pk=1).delete()
+        self.assertEqual(NotLockedModel.objects.count(), 3)
+        ObjectLock.objects.unlock(attachments[1])
+        self.assertEqual(Article.objects.get(pk=1).delete()[1]['articles.NotLockedModel'], 3)
+
+    def test_distinct_querysets_are_deleted_like_django_does(self) -> None:
+        queryset = Article.objects.filter(sections__heading__startswith='Section').distinct()
+        if django.VERSION >= (5, 0):
+            self.assertEqual(queryset.filter(pk=1).delete()[1]['articles.Article'], 1)
+            with self.assertRaises(ObjectLocked):
+                queryset.delete()
+        else:
+            with self.assertRaises(TypeError):
+                queryset.delete()
+        with self.assertRaises(TypeError):
+            Article.objects.distinct('title').delete()
+        self.assertEqual(Article.objects.count(), 2 if django.VERSION >= (5, 0) else 3)
+
+    def test_locks_are_checked_with_one_query_per_model(self) -> None:
+        def count_lock_queries(queryset) -> int:
+            with CaptureQueriesContext(connection) as context:
+                queryset.delete()
+            return sum(
+                1 for query in context.captured_queries
+                if query['sql'].startswith('SELECT') and 'is_locked_flag' in query['sql'].partition('WHERE')[2]
+            )
+
+        # Checking the articles, the illustrations, the sections and the footnotes.
+        self.assertEqual(count_lock_queries(Article.objects.filter(pk=1)), 4)
+        self.assertEqual(count_lock_queries(Article.objects.filter(pk=2)), 4)
+        for i in range(4, 8):
+            section = ArticleSection.objects.create(
+                parent=Article.objects.create(pk=i, title=f'Article {i}'), heading='Section', content='Lorem', order=1
+            )
+            Footnote.objects.create(section=section, text='Footnote')
+        self.assertEqual(count_lock_queries(Article.objects.filter(pk__gte=4)), 4)
+
+
+class ObjectLockTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        NotLockedModel.objects.bulk_create([NotLockedModel(name=f'Object {i}') for i in range(1, 6)])
+
+    def test_lock_and_unlock_are_compare_and_set(self) -> None:
+        obj = NotLockedModel.objects.get(pk=1)
+        self.assertTrue(ObjectLock.objects.lock(obj))
+        self.assertFalse(ObjectLock.objects.lock(obj))
+        self.assertTrue(ObjectLock.objects.is_locked(obj))
+        self.assertTrue(ObjectLock.objects.unlock(obj))
+        self.assertFalse(ObjectLock.objects.unlock(obj))
+        self.assertFalse(ObjectLock.objects.is_locked(obj))
+
+    def test_querysets_are_locked_and_filtered_using_subqueries(self) -> None:
+        self.assertEqual(ObjectLock.objects.lock_queryset(NotLockedModel.objects.filter(pk__lte=3)), 3)
+        self.assertEqual(ObjectLock.objects.lock_queryset(NotLockedModel.objects.all()), 2)
+        self.assertEqual(ObjectLock.objects.unlock_queryset(NotLockedModel.objects.filter(pk__gte=4)), 2)
+        condition = ObjectLock.objects.get_lock_condition(NotLockedModel)
+        self.assertQuerysetEqual(NotLockedModel.objects.filter(condition).order_by('pk'), [1, 2, 3], lambda o: o.pk)
+        self.assertQuerysetEqual(NotLockedModel.objects.exclude(condition).order_by('pk'), [4, 5], lambda o: o.pk)
+
+    def test_lock_queryset_counts_only_the_locks_created(self) -> None:
+        ObjectLock.objects.lock(NotLockedModel.objects.get(pk=2))
+        queryset = NotLockedModel.objects.filter(pk__lte=3)
+        with mock.patch.object(ObjectLockManager, 'get_lock_condition', return_value=Q(pk__in=[])):
+            self.assertEqual(ObjectLock.objects.lock_queryset(queryset), 2)
+        self.assertEqual(ObjectLock.objects.filter(object_pk__in=['1', '2', '3']).count(), 3)
+
+    def test_locks_are_deleted_with_the_locked_objects(self) -> None:
+        ObjectLock.objects.lock_queryset(NotLockedModel.objects.filter(pk__lte=3))
+        NotLockedModel.objects.get(pk=1).delete()
+        NotLockedModel.objects.filter(pk__in=[2, 4]).delete()
+        self.assertQuerysetEqual(ObjectLock.objects.all(), ['3'], lambda lock: lock.object_pk)
+        # An object created later with the same primary key is not locked.
+        self.assertFalse(ObjectLock.objects.is_locked(NotLockedModel.objects.create(pk=1, name='Object 1')))
+
+    def test_objects_with_uuid_primary_keys_are_matched_in_the_database(self) -> None:
+        objs = NotLockedUUIDModel.objects.bulk_create([NotLockedUUIDModel(name=f'Object {i}') for i in range(3)])
+        self.assertTrue(ObjectLock.objects.lock(objs[0]))
+        self.assertTrue(ObjectLock.objects.is_locked(objs[0]))
+        self.assertEqual(ObjectLock.objects.lock_queryset(NotLockedUUIDModel.objects.all()), 2)
+        condition = ObjectLock.objects.get_lock_condition(NotLockedUUIDModel)
+        self.assertEqual(NotLockedUUIDModel.objects.filter(condition).count(), 3)
+        self.assertEqual(ObjectLock.objects.unlock_queryset(NotLockedUUIDModel.objects.filter(pk=objs[1].pk)), 1)
+        self.assertFalse(ObjectLock.objects.is_locked(objs[1]))
+        self.assertTrue(ObjectLock.objects.unlock(objs[0]))
+        self.assertQuerysetEqual(NotLockedUUIDModel.objects.filter(condition), [objs[2]])
@@ -0,0 +1,72 @@
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from articles.admin import FootnoteAdmin
+from articles.models import Article, ArticleSection, Footnote
+from django_object_lock.status_cache import clear_lock_status_cache, get_lock_status_cache, lock_status_cache
+
+
+class LockStatusCacheTestCase(TestCase):
+    footnote_admin = FootnoteAdmin(Footnote, site)
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.article = Article.objects.create(title='Article 1')
+        cls.section = ArticleSection.objects.create(parent=cls.article, heading='Section 1', content='Lorem', order=1)
+        cls.footnote = Footnote.objects.create(section=cls.section, text='Footnote 1')
+        cls.user = User.objects.create_superuser('foo', 'foo@example.com', '123')
+
+    def get_footnote(self) -> Footnote:
+        return Footnote.objects.get(pk=self.footnote.pk)
+
+    def test_no_cache_outside_of_a_block(self) -> None:
+        self.assertIsNone(get_lock_status_cache())
+        clear_lock_status_cache()
+        self.assertFalse(self.footnote_admin.get_instance_lock_status(self.get_footnote()))
+
+    def test_lock_status_is_evaluated_once(self) -> None:
+        with lock_status_cache() as cache:
+            self.assertIs(get_lock_status_cache(), cache)
+            self.assertFalse(self.footnote_admin.get_instance_lock_status(self.get_footnote()))
+            footnote = self.get_footnote()
+            with self.assertNumQueries(0):
+                self.assertFalse(self.footnote_admin.get_instance_lock_status(footnote))
+                self.assertFalse(self.footnote_admin.get_instance_lock_status(footnote))
+            self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertIsNone(get_lock_status_cache())
+
+    def test_lock_status_is_cached_for_each_locker_class(self) -> None:
+        class LockedFootnoteAdmin(FootnoteAdmin):
+            def is_instance_locked(self, obj: Footnote) -> bool:
+                return True
+
+        locked_footnote_admin = LockedFootnoteAdmin(Footnote, site)
+        with lock_status_cache() as cache:
+            footnote = self.get_footnote()
+            self.assertFalse(self.footnote_admin.get_instance_lock_status(footnote))
+            self.assertTrue(locked_footnote_admin.get_instance_lock_status(footnote))
+            self.assertFalse(FootnoteAdmin(Footnote, site).get_instance_lock_status(footnote))
+            self.assertTrue(locked_footnote_admin.get_instance_lock_status(footnote))
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_cache_is_cleared_when_locking(self) -> None:
+        with lock_status_cache() as cache:
+            self.assertFalse(self.footnote_admin.get_instance_lock_status(self.get_footnote()))
+            # The lock status of the footnote is inherited from the article.
+            Article.objects.get(pk=self.article.pk).lock()
+            self.assertEqual(cache.statuses, {})
+            self.assertTrue(self.footnote_admin.get_instance_lock_status(self.get_footnote()))
+            Article.objects.filter(pk=self.article.pk).unlock()
+            self.assertFalse(self.footnote_admin.get_instance_lock_status(self.get_footnote()))
+            self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_middleware_caches_statuses_during_the_change_view(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('admin:articles_footnote_change', args=[self.footnote.pk]))
+        self.assertEqual(response.status_code, 200)
+        cache = response.wsgi_request.lock_status_cache
+        self.assertEqual(cache.misses, 1)
+        self.assertGreater(cache.hits, 0)
+        self.assertIsNone(get_lock_status_cache())
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from articles.models import Announcement
+from django_object_lock.exceptions import ObjectLocked
+from django_object_lock.mixins import LockableMixin
+
+
+class TimeLockingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        now = timezone.now()
+        past, future = now - timedelta(days=1), now + timedelta(days=1)
+        Announcement.objects.bulk_create([
+            Announcement(pk=1, text='Not locked'),
+            Announcement(pk=2, text='Locked', is_locked_flag=True),
+            Announcement(pk=3, text='Lock started', locked_from=past),
+            Announcement(pk=4, text='Lock not started yet', locked_from=future),
+            Announcement(pk=5, text='Lock expired', is_locked_flag=True, locked_until=past),
+            Announcement(pk=6, text='Lock not expired yet', is_locked_flag=True, locked_until=future),
+            Announcement(pk=7, text='Lock window passed', locked_from=past - timedelta(days=1), locked_until=past),
+        ])
+
+    def assertLockedPks(self, pks) -> None:
+        self.assertQuerysetEqual(Announcement.objects.locked().order_by('pk'), pks, lambda obj: obj.pk)
+
+    def test_time_window_is_evaluated_in_the_database(self) -> None:
+        self.assertLockedPks([2, 3, 6])
+
+    def test_is_locked_matches_the_database(self) -> None:
+        for announcement in Announcement.objects.with_lock_status():
+            self.assertEqual(Announcement.objects.get(pk=announcement.pk).is_locked(), announcement.is_locked())
+
+    def test_q_lock_condition_with_string_datetime_is_evaluated_in_memory(self) -> None:
+        with mock.patch.object(Announcement, 'lock_condition', Q(locked_from__lte='2000-01-01T00:00:00Z')):
+            announcement = Announcement.objects.get(pk=3)
+            with self.assertNumQueries(0):
+                self.assertFalse(announcement.is_locked())
+            announcement.locked_from = timezone.now().replace(year=1999)
+            self.assertTrue(announcement.is_locked())
+
+    def test_q_lock_condition_with_naive_datetime_is_evaluated_in_the_database(self) -> None:
+        naive = timezone.make_naive(timezone.now() - timedelta(hours=1))
+        with mock.patch.object(Announcement, 'lock_condition', Q(locked_from__lte=naive)):
+            announcement = Announcement.objects.get(pk=3)
+            with self.assertNumQueries(1), self.assertWarns(RuntimeWarning):
+                self.assertTrue(announcement.is_locked())
+
+    def test_unlocking_clears_the_time_window(self) -> None:
+        self.assertTrue(Announcement.objects.get(pk=3).unlock())
+        self.assertEqual(Announcement.objects.filter(pk__in=[2, 6]).unlock(), 2)
+        self.assertLockedPks([])
+        self.assertTrue(Announcement.objects.get(pk=4).lock())
+        self.assertIsNone(Announcement.objects.get(pk=4).locked_until)
+
+    def test_locking_a_locked_instance_leaves_its_time_window(self) -> None:
+        announcement = Announcement.objects.get(pk=3)
+        self.assertFalse(announcement.lock())
+        self.assertEqual(
+            (announcement.is_locked_flag, announcement.locked_from, announcement.locked_until),
+            Announcement.objects.values_list('is_locked_flag', 'locked_from', 'locked_until').get(pk=3)
+        )
+        self.assertTrue(announcement.is_locked())
+
+    def test_instance_locked_by_its_time_window_can_be_unlocked_with_a_conditional_save(self) -> None:
+        with mock.patch.object(Announcement, 'lock_conditional_save', True):
+            announcement = Announcement.objects.get(pk=3)
+            announcement.set_locked(False)
+            announcement.text = 'Unlocked'
+            announcement.save()
+            self.assertEqual(Announcement.objects.get(pk=3).text, 'Unlocked')
+            self.assertNotIn(3, Announcement.objects.locked().values_list('pk', flat=True))
+            announcement = Announcement.objects.get(pk=6)
+            announcement.text = 'Still locked'
+            with self.assertRaises(ObjectLocked), transaction.atomic():
+                announcement.save()
+
+    def test_bulk_locking_from_a_mixin(self) -> None:
+        self.assertEqual(LockableMixin().set_queryset_locked_status(Announcement.objects.all(), True), 4)
+        self.assertLockedPks([1, 2, 3, 4, 5, 6, 7])
+
+    def test_sweeper_materializes_started_and_expired_locks(self) -> None:
+        stdout = StringIO()
+        call_command('sweep_time_locks', 'articles.Announcement', '--chunk-size', '1', stdout=stdout)
+        self.assertIn('1 locks started, 2 locks expired', stdout.getvalue())
+        self.assertLockedPks([2, 3, 6])
+        self.assertQuerysetEqual(
+            Announcement.objects.filter(is_locked_flag=True).order_by('pk'), [2, 3, 6], lambda obj: obj.pk
+        )
+        self.assertFalse(Announcement.objects.filter(locked_from__lte=timezone.now()).exists())
+        self.assertFalse(Announcement.objects.filter(locked_until__lte=timezone.now()).exists())
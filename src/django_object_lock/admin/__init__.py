@@ -1,20 +1,32 @@
-from functools import update_wrapper
-from typing import Optional, List
+from functools import cached_property, update_wrapper
+from typing import Callable, Dict, Optional, List, Sequence, Set, Tuple
+from urllib.parse import urlencode
 
-from django.db import models
+from django.contrib import messages
+from django.contrib.admin.utils import unquote
+from django.db import models, router
 from django.db.models import QuerySet
-from django.http import HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect
 from django.http.request import HttpRequest
 from django.templatetags.static import static
 from django.urls import path, reverse
 from django.urls.resolvers import URLPattern
+from django.utils.formats import date_format
 from django.utils.html import format_html
 from django.utils.safestring import SafeString, mark_safe
+from django.utils.text import capfirst, format_lazy
+from django.utils.timezone import localtime
 from django.utils.translation import gettext_lazy as _
 
-from django_object_lock.admin.views import default_lock_view, default_unlock_view
+from django_object_lock.admin.selection import store_selection
+from django_object_lock.admin.views import default_lock_job_view, default_lock_view, default_unlock_view
+from django_object_lock.deletion import LockAwareCollector
+from django_object_lock.edit_locks import acquire_edit_lock, get_edit_lock, get_edit_lock_key, release_edit_lock
 from django_object_lock.mixins import LockableMixin
+from django_object_lock.models import ObjectLock
+from django_object_lock.querysets import LOCK_STATUS_ANNOTATION, with_lock_status_annotation
 from django_object_lock.settings import dol_settings
+from django_object_lock.status_cache import clear_lock_status_cache
 
 
 class LockableAdminMixin(LockableMixin):
@@ -25,33 +37,157 @@ class LockableAdminMixin(LockableMixin):
     To customize the appearance of the "locked" icon, set ``locked_icon_static_url`` to a static
     resource URL.
 
-    To allow manual object locking and/or unlocking, add the ``lock`` and/or ``unlock`` actions.
+    If the lock status can be evaluated in the database (see ``get_lock_condition``), it is annotated in
+    ``get_queryset`` so that the changelist does not need further queries to display the "locked" icon. Set
+    ``annotate_lock_status`` to ``False`` to disable this behavior.
+
+    To allow manual object locking and/or unlocking, add the ``lock`` and/or ``unlock`` actions. When
+    locking or unlocking in bulk, selected objects are updated in chunks of ``lock_chunk_size`` objects. Set
+    ``lock_in_background`` to ``True`` to lock or unlock them in a background job instead. The confirmation page
+    summarizes the selection and lists at most ``lock_preview_size`` of the affected objects. Set
+    ``lock_preview_fields`` to the fields needed to display them, so that other columns are not loaded.
+
+    If the model's ``lock_field`` is a ``LockField``, add the ``locked_reasons`` field to ``list_display`` to display
+    the reasons each object is locked for. The ``lock`` and ``unlock`` actions then come with an action for each
+    lock reason, which only sets or clears that reason.
+
+    If ``use_edit_locks`` is ``True``, opening the change view acquires (or renews) an edit lock for the current
+    user, and the change view is read-only for other users until it is released on save or expires.
     """
     locked_icon_url: str = dol_settings.DEFAULT_LOCKED_ICON_URL
+    lock_chunk_size: int = dol_settings.DEFAULT_LOCK_CHUNK_SIZE
+    lock_preview_size: int = dol_settings.DEFAULT_LOCK_PREVIEW_SIZE
+    lock_preview_fields: Optional[Sequence[str]] = None
+    annotate_lock_status: bool = True
+    lock_in_background: bool = False
     lock_view = default_lock_view
     unlock_view = default_unlock_view
+    lock_job_view = default_lock_job_view
 
     class Media:
         css = {
             'all': ['django_object_lock/css/admin.css'],
         }
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self.uses_object_lock_table(self.model):
+            # Delete the locks of deleted objects, even if they are not deleted through the admin.
+            ObjectLock.objects.register(self.model)
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        queryset = super().get_queryset(request)
+        condition = self.get_lock_condition(self.model) if self.annotate_lock_status else None
+        if condition is None or LOCK_STATUS_ANNOTATION in queryset.query.annotations:
+            return queryset
+        return with_lock_status_annotation(queryset, condition)
+
+    def get_lock_preview_fields(self, request: HttpRequest) -> Optional[Sequence[str]]:
+        """Return the fields loaded to display the objects listed by the lock and unlock confirmation pages, or
+        ``None`` to load all fields. Defaults to ``lock_preview_fields``.
+
+        If the lock status cannot be evaluated in the database, the fields read by ``is_instance_locked`` must be
+        included as well.
+        """
+        return self.lock_preview_fields
+
     def locked_icon(self, obj: models.Model) -> SafeString:
-        return self.locked_icon_html(obj) if self.is_instance_locked(obj) else mark_safe('')
+        locked = obj.__dict__.get(LOCK_STATUS_ANNOTATION)
+        if locked is None:
+            locked = self.get_instance_lock_status(obj)
+        return self.locked_icon_html(obj) if locked else mark_safe('')
 
     locked_icon.short_description = ''
 
+    def locked_reasons(self, obj: models.Model) -> str:
+        field = self.get_lock_reason_field(type(obj))
+        if field is None:
+            return ''
+        return ', '.join(str(label) for label in field.get_reason_labels(getattr(obj, field.attname)))
+
+    locked_reasons.short_description = _('Lock reasons')
+
+    @cached_property
+    def locked_icon_template(self) -> str:
+        """The "locked" icon markup, with an ``{alt}`` placeholder for the alternative text.
+        """
+        src = static(self.locked_icon_url).replace('{', '{{').replace('}', '}}')
+        return format_html('<img src="{src}" alt="{{alt}}" title="{{alt}}" />', src=src)
+
     def locked_icon_html(self, obj: models.Model) -> SafeString:
         alt = _('%(obj_str)s is locked') % {'obj_str': str(obj)}
-        return format_html(
-            format_string='<img src="{src}" alt="{alt}" title="{alt}" />', src=static(self.locked_icon_url), alt=alt
-        )
+        return format_html(self.locked_icon_template, alt=alt)
 
     def has_change_permission(self, request: HttpRequest, obj: Optional[models.Model] = None) -> bool:
-        return not (obj is not None and self.is_instance_locked(obj)) and super().has_change_permission(request, obj)
+        if obj is not None and get_edit_lock_key(obj) in getattr(request, '_edit_locked_by_others', ()):
+            return False
+        if obj is not None and self.get_instance_lock_status(obj):
+            return False
+        return super().has_change_permission(request, obj)
 
     def has_delete_permission(self, request: HttpRequest, obj: Optional[models.Model] = None) -> bool:
-        return not (obj is not None and self.is_instance_locked(obj)) and super().has_delete_permission(request, obj)
+        if obj is not None and self.get_instance_lock_status(obj):
+            return False
+        return super().has_delete_permission(request, obj)
+
+    def save_model(self, request: HttpRequest, obj: models.Model, form, change: bool) -> None:
+        super().save_model(request, obj, form, change)
+        # The form may have changed the lock status of the object.
+        clear_lock_status_cache()
+
+    def get_deleted_objects(self, objs, request: HttpRequest) -> Tuple[List, Dict, Set, List]:
+        """Also report locked objects that would be deleted in cascade as protected, so that the deletion
+        confirmation page refuses to delete them.
+        """
+        to_delete, model_count, perms_needed, protected = super().get_deleted_objects(objs, request)
+        collector = LockAwareCollector(router.db_for_write(self.model))
+        collector.collect(objs)
+        for model, pks in collector.get_locked_pks().items():
+            protected.extend(
+                '%s: %s' % (capfirst(model._meta.verbose_name), obj) for obj in model._base_manager.filter(pk__in=pks)
+            )
+        return to_delete, model_count, perms_needed, protected
+
+    def acquire_edit_lock_or_warn(self, request: HttpRequest, obj: models.Model) -> bool:
+        """Acquire (or renew) the edit lock of ``obj`` for the current user. If another user holds it, show a
+        warning and make the change view read-only for the rest of the request.
+        """
+        owner = self.get_edit_lock_owner(request)
+        if owner is not None and acquire_edit_lock(obj, owner, self.edit_lock_ttl):
+            return True
+        request._edit_locked_by_others = {*getattr(request, '_edit_locked_by_others', ()), get_edit_lock_key(obj)}
+        edit_lock = get_edit_lock(obj)
+        if edit_lock is not None:
+            messages.warning(request, _(
+                '%(obj_str)s is being edited by another user, so it is read-only until %(expires_at)s.'
+            ) % {'obj_str': str(obj), 'expires_at': date_format(localtime(edit_lock.expires_at), 'DATETIME_FORMAT')})
+        return False
+
+    def get_object(
+        self, request: HttpRequest, object_id: str, from_field: Optional[str] = None
+    ) -> Optional[models.Model]:
+        obj = super().get_object(request, object_id, from_field)
+        # Acquire the edit lock of the object loaded by the change view, if the user may change it at all.
+        if obj is not None and getattr(request, '_edit_lock_object_id', None) == object_id:
+            del request._edit_lock_object_id
+            if super().has_change_permission(request, obj) and not self.get_instance_lock_status(obj):
+                self.acquire_edit_lock_or_warn(request, obj)
+        return obj
+
+    def change_view(
+        self, request: HttpRequest, object_id: str, form_url: str = '', extra_context: Optional[Dict] = None
+    ) -> HttpResponse:
+        if self.use_edit_locks:
+            request._edit_lock_object_id = unquote(object_id)
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def response_change(self, request: HttpRequest, obj: models.Model) -> HttpResponse:
+        # Release the edit lock unless the user keeps editing the object.
+        if self.use_edit_locks and '_continue' not in request.POST:
+            owner = self.get_edit_lock_owner(request)
+            if owner is not None:
+                release_edit_lock(obj, owner)
+        return super().response_change(request, obj)
 
     def get_urls(self) -> List[URLPattern]:
         def wrap(view):
@@ -68,21 +204,52 @@ class LockableAdminMixin(LockableMixin):
             extra_urls.append(path('lock/', wrap(self.lock_view), name='%s_%s_lock' % info))
         if 'unlock' in self.actions:
             extra_urls.append(path('unlock/', wrap(self.unlock_view), name='%s_%s_unlock' % info))
+        if 'lock' in self.actions or 'unlock' in self.actions:
+            extra_urls.append(
+                path('lock-jobs/<int:job_id>/', wrap(self.lock_job_view), name='%s_%s_lock_job' % info)
+            )
 
         return [*extra_urls, *super().get_urls()]
 
+    def get_actions(self, request: HttpRequest) -> Dict[str, Tuple[Callable, str, str]]:
+        actions = super().get_actions(request)
+        field = self.get_lock_reason_field(self.model)
+        if field is None:
+            return actions
+        for lock in (True, False):
+            name = 'lock' if lock else 'unlock'
+            if name not in actions:
+                continue
+            description = actions[name][2]
+            for reason, label in field.reasons:
+                actions['%s__%s' % (name, reason)] = (
+                    self._make_lock_reason_action(lock, reason), '%s__%s' % (name, reason),
+                    format_lazy('{} ({})', description, label),
+                )
+        return actions
+
+    def _make_lock_reason_action(self, lock: bool, reason: str) -> Callable:
+        def action(modeladmin, request: HttpRequest, queryset: QuerySet) -> HttpResponseRedirect:
+            return modeladmin.redirect_to_lock_or_unlock_view(request, queryset, lock, reason)
+        return action
+
+    def redirect_to_lock_or_unlock_view(
+        self, request: HttpRequest, queryset: QuerySet, lock: bool, reason: Optional[str] = None
+    ) -> HttpResponseRedirect:
+        """Redirect to the lock or unlock confirmation view, keeping the selected objects in the session.
+        """
+        info = self.admin_site.name, self.opts.app_label, self.opts.model_name, 'lock' if lock else 'unlock'
+        params = {'selection': store_selection(request, queryset)}
+        if reason is not None:
+            params['reason'] = reason
+        return HttpResponseRedirect('%s?%s' % (reverse('%s:%s_%s_%s' % info), urlencode(params)))
+
     def lock(self, request: HttpRequest, queryset: QuerySet) -> HttpResponseRedirect:
-        info = self.admin_site.name, self.opts.app_label, self.opts.model_name
-        path = reverse('%s:%s_%s_lock' % info)
-        pks = ','.join(str(pk) for pk in queryset.values_list('pk', flat=True))
-        return HttpResponseRedirect('%s?ids=%s' % (path, pks))
+        return self.redirect_to_lock_or_unlock_view(request, queryset, True)
 
     lock.short_description = _('Lock selected %(verbose_name_plural)s')
 
     def unlock(self, request: HttpRequest, queryset: QuerySet) -> HttpResponseRedirect:
-        info = self.admin_site.name, self.opts.app_label, self.opts.model_name
-        path = reverse('%s:%s_%s_unlock' % info)
-        pks = ','.join(str(pk) for pk in queryset.values_list('pk', flat=True))
-        return HttpResponseRedirect('%s?ids=%s' % (path, pks))
+        return self.redirect_to_lock_or_unlock_view(request, queryset, False)
 
     unlock.short_description = _('Unlock selected %(verbose_name_plural)s')
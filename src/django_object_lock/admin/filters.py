@@ -0,0 +1,51 @@
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.admin import SimpleListFilter
+from django.db.models import Count, Q, QuerySet
+from django.http.request import HttpRequest
+from django.utils.translation import gettext_lazy as _
+
+from django_object_lock.mixins import LockableMixin
+
+
+class LockStatusListFilter(SimpleListFilter):
+    """Admin list filter to show only locked or unlocked objects, for admins using ``LockableAdminMixin``.
+
+    If the lock status can be evaluated in the database (see ``LockableMixin.get_lock_condition``), objects are
+    filtered by the lock condition, and the number of objects for each choice is displayed, counted with a single
+    conditional aggregate query. Otherwise, the lock status of each object is checked and no counts are displayed.
+    """
+    title = _('lock status')
+    parameter_name = 'locked'
+
+    def __init__(self, request: HttpRequest, params: Dict, model, model_admin: LockableMixin):
+        self.model_admin = model_admin
+        super().__init__(request, params, model, model_admin)
+
+    def lookups(self, request: HttpRequest, model_admin: LockableMixin) -> List[Tuple[str, str]]:
+        counts = self.get_counts(model_admin.get_lock_condition(model_admin.model), model_admin.get_queryset(request))
+        if counts is None:
+            return [('1', _('Locked')), ('0', _('Unlocked'))]
+        return [
+            ('1', _('Locked (%(count)d)') % {'count': counts['locked']}),
+            ('0', _('Unlocked (%(count)d)') % {'count': counts['total'] - counts['locked']}),
+        ]
+
+    def get_counts(self, condition: Optional[Q], queryset: QuerySet) -> Optional[Dict[str, int]]:
+        """Return the total number of objects in ``queryset`` and the number of locked ones, using a single query,
+        or ``None`` if the lock status cannot be evaluated in the database.
+        """
+        if condition is None:
+            return None
+        return queryset.order_by().aggregate(total=Count('pk'), locked=Count('pk', filter=condition))
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> Optional[QuerySet]:
+        if self.value() not in ('0', '1'):
+            return None
+        locked = self.value() == '1'
+        model_admin = self.model_admin
+        condition = model_admin.get_lock_condition(queryset.model)
+        if condition is not None:
+            return queryset.filter(condition) if locked else queryset.exclude(condition)
+        pks = [obj.pk for obj in queryset if model_admin.get_instance_lock_status(obj) == locked]
+        return queryset.filter(pk__in=pks)
@@ -0,0 +1,118 @@
+"""Server-side storage of the objects selected in the admin changelist.
+
+Selections are stored in the session as plain JSON data, never as serialized queries: selecting all objects across
+all pages stores the changelist query string (filters, search and ordering), from which the changelist queryset is
+rebuilt, and other selections store ranges of primary keys (see ``get_pk_ranges``).
+"""
+
+import copy
+import secrets
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, QueryDict
+
+from django_object_lock.utils import get_pk_ranges
+
+if TYPE_CHECKING:  # pragma: no cover
+    from django_object_lock.admin import LockableAdminMixin
+
+
+SESSION_KEY = 'django_object_lock_selections'
+
+
+# Maximum number of selections stored in a session. The oldest ones are discarded first.
+MAX_STORED_SELECTIONS = 10
+
+# Maximum number of primary key ranges matched with range lookups when loading a selection.
+MAX_SELECTION_RANGE_LOOKUPS = 100
+
+
+def store_selection(request: HttpRequest, queryset: QuerySet) -> str:
+    """Store the selected objects in the session and return a token to retrieve them.
+
+    When all objects are selected across all pages of the changelist (the ``select_across`` action parameter), the
+    changelist query string is stored. Otherwise, the primary keys of the selected objects are stored as ranges.
+    """
+    token = secrets.token_urlsafe(16)
+    selection = {'model': queryset.model._meta.label_lower}
+    if request.POST.get('select_across') == '1':
+        selection['filters'] = request.GET.urlencode()
+    else:
+        selection['pks'] = get_pk_ranges(queryset.order_by('pk').values_list('pk', flat=True))
+    selections = request.session.get(SESSION_KEY, {})
+    selections[token] = selection
+    while len(selections) > MAX_STORED_SELECTIONS:
+        del selections[next(iter(selections))]
+    request.session[SESSION_KEY] = selections
+    return token
+
+
+def _get_stored_selection(request: HttpRequest, modeladmin: 'LockableAdminMixin', token: str) -> Optional[dict]:
+    selection = request.session.get(SESSION_KEY, {}).get(token)
+    if selection is None or selection.get('model') != modeladmin.model._meta.label_lower:
+        return None
+    return selection
+
+
+def get_selection_filters(request: HttpRequest, modeladmin: 'LockableAdminMixin', token: str) -> Optional[str]:
+    """Return the changelist query string stored for the given token if all objects were selected across all pages,
+    or ``None`` otherwise.
+    """
+    selection = _get_stored_selection(request, modeladmin, token)
+    return None if selection is None else selection.get('filters')
+
+
+def get_changelist_queryset(
+    modeladmin: 'LockableAdminMixin', request: HttpRequest, filters: str
+) -> Optional[QuerySet]:
+    """Return the changelist queryset of ``modeladmin`` as if the changelist was displayed by ``request`` with the
+    query string ``filters``, or ``None`` if the filters are not valid. ``request`` must be resolved to the changelist
+    or one of the admin's views.
+    """
+    changelist_request = copy.copy(request)
+    changelist_request.GET = QueryDict(filters)
+    # Copying a request drops its non-picklable attributes, but the changelist needs the resolved URL.
+    changelist_request.resolver_match = request.resolver_match
+    try:
+        return modeladmin.get_changelist_instance(changelist_request).get_queryset(changelist_request)
+    except IncorrectLookupParameters:
+        return None
+
+
+def load_selection(request: HttpRequest, modeladmin: 'LockableAdminMixin', token: str) -> Optional[QuerySet]:
+    """Return the selected objects for the given token, or ``None`` if there is no such selection for the admin's
+    model or if its stored filters are no longer valid.
+    """
+    model = modeladmin.model
+    selection = _get_stored_selection(request, modeladmin, token)
+    if selection is None:
+        return None
+    if 'filters' in selection:
+        return get_changelist_queryset(modeladmin, request, selection['filters'])
+    pk_field = model._meta.pk
+    try:
+        ranges = [
+            (pk_field.to_python(pk_range[0]), pk_field.to_python(pk_range[1])) if isinstance(pk_range, list)
+            else (pk_field.to_python(pk_range),) * 2
+            for pk_range in selection.get('pks', [])
+        ]
+    except ValidationError:
+        return None
+    # Only the longest ranges are matched with range lookups, since databases limit the depth of OR-ed expressions.
+    # The primary keys in other ranges are listed instead.
+    ranges.sort(key=lambda pk_range: _get_range_length(*pk_range), reverse=True)
+    range_lookups = [
+        Q(pk__range=pk_range) for pk_range in ranges[:MAX_SELECTION_RANGE_LOOKUPS] if pk_range[0] != pk_range[1]
+    ]
+    pks = [
+        pk for first, last in ranges[len(range_lookups):]
+        for pk in (range(first, last + 1) if first != last else [first])
+    ]
+    return model._default_manager.filter(Q(*range_lookups, pk__in=pks, _connector=Q.OR))
+
+
+def _get_range_length(first: Any, last: Any) -> int:
+    return last - first + 1 if isinstance(first, int) else 1
@@ -1,39 +1,87 @@
 from typing import TYPE_CHECKING, Union, Type
 
 from django.contrib import messages
-from django.db.models import Model, QuerySet
-from django.http import HttpRequest, HttpResponseRedirect
+from django.db.models import Count, Model, QuerySet
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.http import HttpRequest, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.translation import ngettext_lazy as n_
+from django.utils.translation import gettext_lazy as _, ngettext_lazy as n_
+
+from django_object_lock.admin.selection import get_selection_filters, load_selection, store_selection
+from django_object_lock.jobs import create_lock_job, start_lock_job
+from django_object_lock.models import LockJob
+from django_object_lock.utils import iter_pk_chunks
 
 if TYPE_CHECKING:  # pragma: no cover
     from django_object_lock.admin import LockableAdminMixin
 
 
 def get_lockable_objects(model: Type[Model], pk_string: str) -> QuerySet:
-    try:
-        return model.objects.filter(pk__in=pk_string.strip().split(','))
-    except ValueError:
-        return model.objects.none()
+    """Return the objects whose primary keys are given as a comma-separated list. Raise ``ValidationError`` if any
+    primary key is malformed.
+    """
+    values = [value for value in pk_string.strip().split(',') if value]
+    if not values:
+        return model._default_manager.none()
+    pks = [model._meta.pk.to_python(value) for value in values]
+    return model._default_manager.filter(pk__in=pks)
+
+
+def get_selected_objects(modeladmin: 'LockableAdminMixin', request: HttpRequest) -> QuerySet:
+    """Return the objects selected in the changelist, either stored in the session (the ``selection`` parameter)
+    or given as a comma-separated list of primary keys (the ``ids`` parameter). Raise ``ValidationError`` if any
+    primary key is malformed.
+    """
+    model = modeladmin.model
+    token = request.POST.get('selection', request.GET.get('selection'))
+    if token is not None:
+        queryset = load_selection(request, modeladmin, token)
+        return model.objects.none() if queryset is None else queryset
+    return get_lockable_objects(model, request.POST.get('ids', request.GET.get('ids', '')))
 
 
 def default_lock_or_unlock_view(
     modeladmin: 'LockableAdminMixin', request: HttpRequest, lock: bool
 ) -> Union[TemplateResponse, HttpResponseRedirect]:
     model = modeladmin.model
-    ids_string = request.POST.get('ids', request.GET.get('ids', ''))
-    objects = [
-        obj for obj in get_lockable_objects(model, ids_string)
-        if modeladmin.is_instance_locked(obj) != lock
-    ]
-    count = len(objects)
+    info = modeladmin.admin_site.name, modeladmin.opts.app_label, modeladmin.opts.model_name
+    action = 'lock' if lock else 'unlock'
+    try:
+        selected = get_selected_objects(modeladmin, request)
+    except ValidationError:
+        messages.error(request, _('The selected objects are not valid.'))
+        context = {
+            **modeladmin.admin_site.each_context(request),
+            'count': 0,
+            'lock': lock,
+            'opts': model._meta  # noqa
+        }
+        return TemplateResponse(request, 'django_object_lock/admin_%s.html' % action, context, status=400)
+    reason = request.POST.get('reason', request.GET.get('reason')) or None
+    reason_field = modeladmin.get_lock_reason_field(model)
+    if reason is not None and (reason_field is None or reason not in reason_field.reason_names):
+        messages.error(request, _('Unknown lock reason: %(reason)s.') % {'reason': reason})
+        return HttpResponseRedirect(reverse('%s:%s_%s_changelist' % info))
     if request.method == 'POST':
+        if modeladmin.lock_in_background:
+            # Leave the objects to a background job and show its progress. If all objects were selected across all
+            # pages, the job selects them from the changelist filters, so that they are not scanned in this request.
+            token = request.POST.get('selection')
+            filters = get_selection_filters(request, modeladmin, token) if token is not None else None
+            job = create_lock_job(
+                selected, lock, modeladmin.lock_chunk_size, reason, filters=filters, user=request.user
+            )
+            start_lock_job(job, modeladmin)
+            return HttpResponseRedirect(reverse('%s:%s_%s_lock_job' % info, args=(job.pk,)))
+
         # POST method, so we lock/unlock.
-        for obj in objects:
-            modeladmin.set_locked_status(obj, lock)
-            obj.save()
-        info = modeladmin.admin_site.name, modeladmin.opts.app_label, modeladmin.opts.model_name
+        count = sum(
+            modeladmin._set_queryset_locked_status(model.objects.filter(pk__in=pks), lock, reason)
+            for pks in iter_pk_chunks(selected, modeladmin.lock_chunk_size)
+        )
 
         # Show a success message.
         if lock:
@@ -56,14 +104,42 @@ def default_lock_or_unlock_view(
         # Redirect to the changelist.
         return HttpResponseRedirect(reverse('%s:%s_%s_changelist' % info))
     else:
-        # Show a confirmation message.
-        action = 'lock' if lock else 'unlock'
+        # Show a confirmation message summarizing the selection, with a bounded preview of the affected objects.
+        # Use the same condition as set_queryset_locked_status, so that the count matches the objects changed.
+        condition = modeladmin.get_lock_change_condition(model, reason)
+        preview_size = modeladmin.lock_preview_size
+        # Only load the columns needed to display the objects.
+        fields = modeladmin.get_lock_preview_fields(request)
+        preview = selected if fields is None else selected.only(*fields)
+        if condition is not None:
+            # Count and filter in the database those objects that are not in the target status yet.
+            counts = selected.order_by().aggregate(total=Count('pk'), locked=Count('pk', filter=condition))
+            total = counts['total']
+            count = total - counts['locked'] if lock else counts['locked']
+            objects = list((preview.exclude(condition) if lock else preview.filter(condition))[:preview_size])
+        else:
+            total, count, objects = 0, 0, []
+            for obj in preview.iterator(chunk_size=modeladmin.lock_chunk_size):
+                total += 1
+                if modeladmin.is_instance_locked(obj) != lock:
+                    count += 1
+                    if len(objects) < preview_size:
+                        objects.append(obj)
+        selection = request.GET.get('selection')
+        if selection is None and count:
+            # Keep the selected objects in the session rather than echoing their primary keys in the form.
+            selection = store_selection(request, selected)
         context = {
             **modeladmin.admin_site.each_context(request),
             'objects': objects,
             'count': count,
+            'total': total,
+            'unchanged': total - count,
+            'more': count - len(objects),
             'lock': lock,
-            'ids': ','.join(str(obj.pk) for obj in objects),
+            'selection': selection,
+            'reason': reason,
+            'reason_label': dict(reason_field.reasons)[reason] if reason is not None else None,
             'opts': model._meta  # noqa
         }
         return TemplateResponse(request, 'django_object_lock/admin_%s.html' % action, context)
@@ -79,3 +155,29 @@ def default_unlock_view(modeladmin: 'LockableAdminMixin', request: HttpRequest):
     """Default unlock confirmation view for the Django admin.
     """
     return default_lock_or_unlock_view(modeladmin, request, False)
+
+
+def default_lock_job_view(
+    modeladmin: 'LockableAdminMixin', request: HttpRequest, job_id: int
+) -> Union[TemplateResponse, JsonResponse]:
+    """Default view for the Django admin showing the progress of a background lock job. Use the ``format=json``
+    parameter to get the progress as JSON.
+    """
+    job = get_object_or_404(
+        LockJob.objects.defer('pk_ranges'), pk=job_id, content_type=ContentType.objects.get_for_model(modeladmin.model)
+    )
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'status': job.status,
+            'total': job.total,
+            'processed': job.processed,
+            'affected': job.affected,
+            'errors': job.errors,
+        })
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        'job': job,
+        'finished': job.status in (LockJob.Status.DONE, LockJob.Status.FAILED),
+        'opts': modeladmin.model._meta  # noqa
+    }
+    return TemplateResponse(request, 'django_object_lock/admin_lock_job.html', context)
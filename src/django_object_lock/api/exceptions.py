@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Optional
+
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework.exceptions import APIException
@@ -11,9 +13,19 @@ class Conflict(APIException):
 
 
 class APIObjectLocked(Conflict):
+    """If ``pks_by_model`` is given, the response also lists the primary keys of the locked objects by model, under
+    ``locked_objects``.
+    """
     default_detail = _('This object is locked and cannot be edited.')
     default_code = 'object_locked'
 
+    def __init__(
+        self, detail: Any = None, code: Optional[str] = None, pks_by_model: Optional[Dict[str, List[Any]]] = None
+    ):
+        if pks_by_model:
+            detail = {'detail': detail or self.default_detail, 'locked_objects': pks_by_model}
+        super().__init__(detail, code)
+
 
 class APIObjectAlreadyLocked(Conflict):
     default_detail = _('This object has already been locked.')
@@ -23,3 +35,8 @@ class APIObjectAlreadyLocked(Conflict):
 class APIObjectAlreadyUnlocked(Conflict):
     default_detail = _('This object is not locked.')
     default_code = 'object_not_locked'
+
+
+class APIObjectEditLocked(Conflict):
+    default_detail = _('This object is being edited by another user.')
+    default_code = 'object_edit_locked'
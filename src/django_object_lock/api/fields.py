@@ -0,0 +1,27 @@
+from django.db import models
+from rest_framework import serializers
+
+from django_object_lock.mixins import LockableMixin
+from django_object_lock.querysets import LOCK_STATUS_ANNOTATION
+
+
+class LockStatusField(serializers.Field):
+    """Read-only serializer field with the lock status of the object.
+
+    The lock status annotated by the queryset is used if present, so that serializing a list of objects needs no
+    query per object (see ``annotate_lock_status`` in the API mixins). Otherwise, the lock status is checked by the
+    view if it uses ``LockableMixin``, or by the default ``LockableMixin`` logic.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value: models.Model) -> bool:
+        if LOCK_STATUS_ANNOTATION in value.__dict__:
+            return bool(value.__dict__[LOCK_STATUS_ANNOTATION])
+        view = self.context.get('view')
+        if isinstance(view, LockableMixin):
+            return view.get_instance_lock_status(value)
+        return LockableMixin().is_instance_locked(value)
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List
+
+from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from django_object_lock.mixins import LockableMixin
+
+
+class LockedFilterBackend(BaseFilterBackend):
+    """Filter backend to list only locked (``?locked=true``) or unlocked (``?locked=false``) objects.
+
+    The lock condition of the view (see ``LockableMixin.get_lock_condition``) is added to the query, whether the lock
+    status is stored in a field, inherited through relations or stored in the ``ObjectLock`` table. Otherwise, the
+    lock status of each object is checked.
+    """
+    locked_param = 'locked'
+    true_values = ('true', '1')
+    false_values = ('false', '0')
+
+    def get_locked_value(self, request: Request) -> Any:
+        """Return ``True`` or ``False`` if the lock status is filtered by, or ``None`` otherwise. Raise
+        ``ValidationError`` if the parameter is not a Boolean.
+        """
+        value = request.query_params.get(self.locked_param)
+        if value is None or value == '':
+            return None
+        if value.lower() in self.true_values:
+            return True
+        if value.lower() in self.false_values:
+            return False
+        raise ValidationError({self.locked_param: 'Expected "true" or "false".'})
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        locked = self.get_locked_value(request)
+        if locked is None:
+            return queryset
+        mixin = view if isinstance(view, LockableMixin) else LockableMixin()
+        condition = mixin.get_lock_condition(queryset.model)
+        if condition is not None:
+            return queryset.filter(condition) if locked else queryset.exclude(condition)
+        pks = [obj.pk for obj in queryset if mixin.get_instance_lock_status(obj) == locked]
+        return queryset.filter(pk__in=pks)
+
+    def get_schema_operation_parameters(self, view: Any) -> List[Dict[str, Any]]:
+        return [{
+            'name': self.locked_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Only list locked (true) or unlocked (false) objects.',
+            'schema': {'type': 'boolean'},
+        }]
@@ -1,50 +1,327 @@
-from typing import Union
+from typing import Any, Optional, Type, Union
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, router, transaction
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
 from rest_framework.mixins import UpdateModelMixin, DestroyModelMixin
+from rest_framework.permissions import BasePermission
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from django_object_lock.api.exceptions import APIObjectAlreadyUnlocked, APIObjectAlreadyLocked, APIObjectLocked
+from django_object_lock.api.exceptions import (
+    APIObjectAlreadyUnlocked, APIObjectAlreadyLocked, APIObjectEditLocked, APIObjectLocked
+)
+from django_object_lock.edit_locks import acquire_edit_lock, get_edit_lock, release_edit_lock
+from django_object_lock.exceptions import ObjectLocked
 from django_object_lock.mixins import LockableMixin
+from django_object_lock.querysets import LOCK_STATUS_ANNOTATION, with_lock_status_annotation
+from django_object_lock.settings import dol_settings
+from django_object_lock.status_cache import clear_lock_status_cache
+from django_object_lock.utils import iter_pk_chunks
 
 
-class LockableUpdateModelMixin(UpdateModelMixin, LockableMixin):
+class _LockableObjectMixin(LockableMixin):
+    """Fetch the object of the request once, so that checking its lock status and then updating or destroying it
+    do not query the database and check object permissions twice.
+
+    If the lock status can be evaluated in the database (see ``get_lock_condition``), it is annotated in
+    ``get_queryset``, so that checking or serializing it (see ``LockStatusField``) needs no further queries. Set
+    ``annotate_lock_status`` to ``False`` to disable this behavior.
+    """
+    annotate_lock_status: bool = True
+
+    def get_queryset(self) -> models.QuerySet:
+        queryset = super().get_queryset()  # noqa
+        condition = self.get_lock_condition(queryset.model) if self.annotate_lock_status else None
+        if condition is None or LOCK_STATUS_ANNOTATION in queryset.query.annotations:
+            return queryset
+        return with_lock_status_annotation(queryset, condition)
+
+    def get_object(self) -> models.Model:
+        if '_lockable_object' not in self.__dict__:
+            self._lockable_object = super().get_object()  # noqa
+        return self._lockable_object
+
+    def _get_write_db(self) -> str:
+        return router.db_for_write(self.get_queryset().model)  # noqa
+
+    def check_edit_lock(self, request: Request, instance: models.Model) -> None:
+        """Raise ``APIObjectEditLocked`` if ``use_edit_locks`` is ``True`` and another user is editing ``instance``.
+        """
+        if not self.use_edit_locks:
+            return
+        edit_lock = get_edit_lock(instance)
+        if edit_lock is not None and edit_lock.owner != self.get_edit_lock_owner(request):
+            raise APIObjectEditLocked()
+
+
+class LockableUpdateModelMixin(UpdateModelMixin, _LockableObjectMixin):
     """Mixin to enforce object locking when updating a resource via API.
     """
 
     def update(self, request: Request, *args, **kwargs) -> Response:
-        instance = self.get_object()  # noqa
-        if self.is_instance_locked(instance):
-            raise APIObjectLocked()
-        return super().update(request, *args, **kwargs)
+        with transaction.atomic(using=self._get_write_db()):
+            instance = self.get_object()
+            if self.get_instance_lock_status(instance):
+                raise APIObjectLocked()
+            self.check_edit_lock(request, instance)
+            try:
+                return super().update(request, *args, **kwargs)
+            except ObjectLocked as e:
+                # Raised when saving, for example by a conditional save if the object has been locked meanwhile.
+                raise APIObjectLocked(pks_by_model=e.pks_by_model) from e
+
+    def perform_update(self, serializer) -> None:
+        super().perform_update(serializer)
+        # The serializer may have changed the lock status of the object.
+        clear_lock_status_cache()
 
 
-class LockableDestroyModelMixin(DestroyModelMixin, LockableMixin):
+class LockableDestroyModelMixin(DestroyModelMixin, _LockableObjectMixin):
     """Mixin to enforce object locking when destroying a resource via API.
     """
 
     def destroy(self, request: Request, *args, **kwargs) -> Response:
-        instance = self.get_object()  # noqa
-        if self.is_instance_locked(instance):
-            raise APIObjectLocked()
-        return super().destroy(request, *args, **kwargs)
+        with transaction.atomic(using=self._get_write_db()):
+            instance = self.get_object()
+            if self.get_instance_lock_status(instance):
+                raise APIObjectLocked()
+            self.check_edit_lock(request, instance)
+            try:
+                return super().destroy(request, *args, **kwargs)
+            except ObjectLocked as e:
+                # Raised when deleting, for example if locked objects would be deleted in cascade.
+                raise APIObjectLocked(pks_by_model=e.pks_by_model) from e
+
+
+def _get_lock_reason(viewset: LockableMixin, request: Request, model: Type[models.Model]) -> Optional[str]:
+    """Return the lock reason given by the ``reason`` parameter of the request body or query string, if any.
+    Raise ``ValidationError`` if it is not a lock reason of ``model``.
+    """
+    reason = request.data.get('reason') if hasattr(request.data, 'get') else None
+    reason = reason or request.query_params.get('reason') or None
+    if reason is None:
+        return None
+    field = viewset.get_lock_reason_field(model)
+    if field is None or reason not in field.reason_names:
+        raise ValidationError({'reason': 'Unknown lock reason.'})
+    return reason
+
+
+def _lock_instance(viewset: LockableMixin, request: Request, instance: models.Model, lock: bool) -> bool:
+    return viewset._lock_instance(instance, lock, _get_lock_reason(viewset, request, type(instance)))
 
 
 def lock_action(viewset: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+    """Lock an object, or only set the lock reason given by the ``reason`` parameter. Raise
+    ``APIObjectAlreadyLocked`` if it is already locked (for that reason).
+    """
     instance = viewset.get_object()  # noqa
-    if viewset.is_instance_locked(instance):
+    if not _lock_instance(viewset, request, instance, True):
         raise APIObjectAlreadyLocked()
-    viewset.set_locked_status(instance, True)
-    instance.save()
     serializer = viewset.get_serializer(instance)  # noqa
     return Response(serializer.data)
 
 
 def unlock_action(viewset: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+    """Unlock an object, or only clear the lock reason given by the ``reason`` parameter. Raise
+    ``APIObjectAlreadyUnlocked`` if it is already unlocked (for that reason).
+    """
     instance = viewset.get_object()  # noqa
-    if not viewset.is_instance_locked(instance):
+    if not _lock_instance(viewset, request, instance, False):
         raise APIObjectAlreadyUnlocked()
-    viewset.set_locked_status(instance, False)
-    instance.save()
     serializer = viewset.get_serializer(instance)  # noqa
     return Response(serializer.data)
+
+
+def _get_edit_lock_owner_or_deny(viewset: LockableMixin, request: Request) -> str:
+    owner = viewset.get_edit_lock_owner(request)
+    if owner is None:
+        raise PermissionDenied()
+    return owner
+
+
+def acquire_edit_lock_action(viewset: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+    """Acquire or renew the edit lock of an object for the current user, and return its owner and expiration time.
+    Raise ``APIObjectEditLocked`` if another user holds it. Call it periodically to keep the lock while editing.
+    """
+    owner = _get_edit_lock_owner_or_deny(viewset, request)
+    instance = viewset.get_object()  # noqa
+    if viewset.get_instance_lock_status(instance):
+        raise APIObjectLocked()
+    if not acquire_edit_lock(instance, owner, viewset.edit_lock_ttl):
+        raise APIObjectEditLocked()
+    return Response(get_edit_lock(instance)._asdict())
+
+
+def release_edit_lock_action(viewset: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> Response:
+    """Release the edit lock of an object held by the current user.
+    """
+    owner = _get_edit_lock_owner_or_deny(viewset, request)
+    release_edit_lock(viewset.get_object(), owner)  # noqa
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def lock_status_action(viewset: LockableMixin, request: Request, pk: Union[int, str, None] = None) -> HttpResponseBase:
+    """Return the lock status of an object as ``{"locked": true|false}``, along with an ETag derived from it. If
+    the model has lock reasons (see ``get_lock_reason_field``), the names of the reasons the object is locked for
+    are returned as ``reasons``.
+
+    Only the lock status is fetched, with a single query, if the lock condition can be evaluated in the database and
+    no permission class implements ``has_object_permission``. Otherwise, the object is fetched using
+    ``get_object()``. A ``304 Not Modified`` response is returned if the ETag matches the ``If-None-Match`` header.
+    """
+    queryset = viewset.filter_queryset(viewset.get_queryset())  # noqa
+    condition = viewset.get_lock_condition(queryset.model)
+    reason_field = viewset.get_lock_reason_field(queryset.model)
+    if condition is not None and not _checks_object_permissions(viewset):
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field  # noqa
+        fields = [LOCK_STATUS_ANNOTATION] if reason_field is None else [LOCK_STATUS_ANNOTATION, reason_field.attname]
+        try:
+            row = with_lock_status_annotation(
+                queryset.filter(**{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]}), condition  # noqa
+            ).values_list(*fields).get()
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404()
+        locked, reasons = row[0], None if reason_field is None else reason_field.get_reasons(row[1])
+    else:
+        instance = viewset.get_object()  # noqa
+        locked = viewset.get_instance_lock_status(instance)
+        reasons = None if reason_field is None else reason_field.get_reasons(getattr(instance, reason_field.attname))
+    data = {'locked': bool(locked)}
+    if reasons is None:
+        etag = '"locked"' if locked else '"unlocked"'
+    else:
+        data['reasons'] = reasons
+        etag = '"locked:%s"' % ','.join(reasons) if locked else '"unlocked"'
+    response = get_conditional_response(request, etag=etag) or Response(data)
+    response['ETag'] = etag
+    return response
+
+
+def _checks_object_permissions(viewset: LockableMixin) -> bool:
+    return any(
+        type(permission).has_object_permission is not BasePermission.has_object_permission
+        for permission in viewset.get_permissions()  # noqa
+    )
+
+
+def _has_object_permission(viewset: LockableMixin, request: Request, obj: Any) -> bool:
+    try:
+        viewset.check_object_permissions(request, obj)  # noqa
+    except APIException:
+        return False
+    return True
+
+
+def bulk_lock_or_unlock_action(viewset: LockableMixin, request: Request, lock: bool) -> Response:
+    """Lock or unlock several objects at once.
+
+    The objects are those whose lookup field value is in the ``ids`` list of the request body or, if ``all`` is
+    ``true`` instead, all objects matching the viewset's filters, within the viewset's ``get_queryset()``. Requests
+    giving neither or both are rejected. Object permissions are checked for each object if any permission class
+    implements ``has_object_permission``.
+
+    The response contains the number of ``affected`` objects and the number of ``skipped`` objects. If ``ids`` is
+    given, it also contains a ``results`` object with the result of each ID that could not be locked or unlocked
+    (``already_locked``, ``already_unlocked``, ``not_found`` or ``permission_denied``).
+
+    If the ``reason`` parameter is given, only that lock reason is set or cleared, and objects are considered
+    already locked or unlocked if they are already locked or unlocked for that reason.
+    """
+    queryset = viewset.filter_queryset(viewset.get_queryset())  # noqa
+    model = queryset.model
+    reason = _get_lock_reason(viewset, request, model)
+    lookup_field = viewset.lookup_field  # noqa
+    if hasattr(request.data, 'getlist'):
+        ids = request.data.getlist('ids') if 'ids' in request.data else None
+    else:
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    if ids is not None and not isinstance(ids, list):
+        raise ValidationError({'ids': 'Expected a list of IDs.'})
+    select_all = request.data.get('all', False) if hasattr(request.data, 'get') else False
+    try:
+        select_all = serializers.BooleanField().to_internal_value(select_all)
+    except ValidationError:
+        raise ValidationError({'all': 'Expected a boolean.'})
+    if (ids is None) == (not select_all):
+        raise ValidationError({'ids': 'Expected either a list of IDs or "all": true.'})
+    chunk_size = dol_settings.DEFAULT_LOCK_CHUNK_SIZE
+
+    check_permissions = _checks_object_permissions(viewset)
+
+    with transaction.atomic(using=queryset.db):
+        if ids is None:
+            total = queryset.count()
+            affected = 0
+            for pks in iter_pk_chunks(queryset, chunk_size):
+                if check_permissions:
+                    pks = [
+                        obj.pk for obj in model._default_manager.filter(pk__in=pks)
+                        if _has_object_permission(viewset, request, obj)
+                    ]
+                affected += viewset._set_queryset_locked_status(
+                    model._default_manager.filter(pk__in=pks), lock, reason
+                )
+            return Response({'affected': affected, 'skipped': total - affected})
+
+        # Fetch the lock status of all requested objects using a single query, if possible. The status is evaluated
+        # with the same condition as _set_queryset_locked_status, so that the results match the objects changed.
+        condition = viewset.get_lock_change_condition(model, reason)
+        try:
+            queryset = queryset.filter(**{'%s__in' % lookup_field: ids})
+            if condition is not None:
+                queryset = with_lock_status_annotation(queryset, condition)
+            if condition is not None and not check_permissions:
+                rows = [
+                    (pk, value, locked, True)
+                    for pk, value, locked in queryset.values_list('pk', lookup_field, LOCK_STATUS_ANNOTATION)
+                ]
+            else:
+                rows = [
+                    (
+                        obj.pk, getattr(obj, lookup_field),
+                        (
+                            obj.__dict__[LOCK_STATUS_ANNOTATION] if condition is not None
+                            else viewset.is_instance_locked(obj)
+                        ),
+                        not check_permissions or _has_object_permission(viewset, request, obj),
+                    )
+                    for obj in queryset
+                ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise ValidationError({'ids': 'Invalid IDs.'})
+        statuses = {str(value): (pk, bool(locked), permitted) for pk, value, locked, permitted in rows}
+
+        results = {}
+        for value in map(str, ids):
+            if value not in statuses:
+                results[value] = 'not_found'
+            elif not statuses[value][2]:
+                results[value] = 'permission_denied'
+            elif statuses[value][1] == lock:
+                results[value] = 'already_locked' if lock else 'already_unlocked'
+        pending = sorted({pk for pk, locked, permitted in statuses.values() if permitted and locked != lock})
+        affected = sum(
+            viewset._set_queryset_locked_status(
+                model._default_manager.filter(pk__in=pending[i:i + chunk_size]), lock, reason
+            )
+            for i in range(0, len(pending), chunk_size)
+        )
+
+    return Response({
+        'affected': affected,
+        'skipped': sum(1 for result in results.values() if result.startswith('already_')),
+        'results': results,
+    })
+
+
+def bulk_lock_action(viewset: LockableMixin, request: Request) -> Response:
+    return bulk_lock_or_unlock_action(viewset, request, True)
+
+
+def bulk_unlock_action(viewset: LockableMixin, request: Request) -> Response:
+    return bulk_lock_or_unlock_action(viewset, request, False)
@@ -0,0 +1,106 @@
+"""Lock-aware deletion.
+
+Deleting an object also deletes the objects related to it with ``on_delete=CASCADE``, which Django finds using a
+deletion ``Collector``. ``LockAwareCollector`` checks the lock status of every collected object before anything is
+deleted, so deleting an unlocked object cannot delete locked objects in cascade.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import django
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Q
+from django.db.models.deletion import Collector
+from django.utils.translation import gettext_lazy as _
+
+from django_object_lock.exceptions import ObjectLocked
+from django_object_lock.status_cache import clear_lock_status_cache
+
+
+class LockAwareCollector(Collector):
+    """Deletion collector that raises ``ObjectLocked`` before deleting anything if any collected object is locked.
+
+    Lockable models (those implementing ``get_locked_pks()``, such as ``LockableModel`` subclasses) are checked with
+    a single query per model if their lock condition is declared. Objects of other models are checked against the
+    ``ObjectLock`` table, with a single query per model. Objects in ``checked_objs`` are not checked again.
+    """
+
+    def __init__(self, using: str, origin: Optional[Any] = None, checked_objs: Iterable[models.Model] = ()):
+        # The origin of the deletion is only supported since Django 4.1.
+        if django.VERSION >= (4, 1):
+            super().__init__(using, origin=origin)
+        else:
+            super().__init__(using)
+        self.checked_objs = {(obj._meta.concrete_model, obj.pk) for obj in checked_objs}
+
+    def get_locked_pks(self) -> Dict[Type[models.Model], List[Any]]:
+        """Return the primary keys of the collected objects that are locked, by model.
+        """
+        objs_by_model = defaultdict(list)
+        querysets_by_model = defaultdict(list)
+        for model, instances in self.data.items():
+            objs_by_model[model].extend(
+                obj for obj in instances if (model._meta.concrete_model, obj.pk) not in self.checked_objs
+            )
+        for queryset in self.fast_deletes:
+            querysets_by_model[queryset.model].append(queryset)
+        locked_pks = {}
+        for model in dict.fromkeys([*objs_by_model, *querysets_by_model]):
+            objs, querysets = objs_by_model[model], querysets_by_model[model]
+            if not (objs or querysets):
+                continue
+            if hasattr(model, 'get_locked_pks'):
+                pks = model.get_locked_pks(objs, querysets, using=self.using)
+            else:
+                pks = self._get_object_locked_pks(model, objs, querysets)
+            if pks:
+                locked_pks[model] = pks
+        return locked_pks
+
+    def _get_object_locked_pks(
+        self, model: Type[models.Model], objs: List[models.Model], querysets: List[models.QuerySet]
+    ) -> List[Any]:
+        from django_object_lock.models import ObjectLock
+
+        if model is ObjectLock:
+            return []
+        manager = ObjectLock.objects
+        pks_by_object_pk = {manager.get_object_pk(model, obj.pk): obj.pk for obj in objs}
+        lookups = [Q(object_pk__in=list(pks_by_object_pk))] if objs else []
+        lookups.extend(Q(object_pk__in=manager._get_object_pks(queryset)) for queryset in querysets)
+        object_pks = manager.filter(content_type=ContentType.objects.get_for_model(model)).filter(
+            Q(*lookups, _connector=Q.OR)
+        ).values_list('object_pk', flat=True)
+        return [
+            pks_by_object_pk[object_pk] if object_pk in pks_by_object_pk else model._meta.pk.to_python(object_pk)
+            for object_pk in object_pks
+        ]
+
+    def check_locks(self) -> None:
+        """Raise ``ObjectLocked`` if any collected object is locked, listing the locked objects by model.
+        """
+        locked_pks = self.get_locked_pks()
+        if locked_pks:
+            raise ObjectLocked(
+                _('Some objects are locked and cannot be deleted.'),
+                pks_by_model={model._meta.label: pks for model, pks in locked_pks.items()}
+            )
+
+    def delete(self) -> Tuple[int, Dict[str, int]]:
+        self.check_locks()
+        # Objects deleted in bulk that are locked after the check above are not deleted.
+        self.fast_deletes = [self._exclude_locked(queryset) for queryset in self.fast_deletes]
+        # Deleted objects need no lock status snapshot, which would be taken when their primary key is cleared.
+        for instances in self.data.values():
+            for obj in instances:
+                obj.__dict__.pop('_lock_snapshot_pending', None)
+        result = super().delete()
+        clear_lock_status_cache()
+        return result
+
+    def _exclude_locked(self, queryset: models.QuerySet) -> models.QuerySet:
+        get_lock_condition = getattr(queryset.model, 'get_lock_condition', None)
+        condition = get_lock_condition() if get_lock_condition is not None else None
+        return queryset if condition is None else queryset.exclude(condition)
@@ -0,0 +1,206 @@
+"""Edit locks.
+
+Edit locks are temporary locks held by an owner (usually a user) while editing an object, so that other users can
+only read it until the lock is released or expires. Unlike the lock status of lockable models, they expire after a
+time to live (TTL) unless renewed.
+
+Edit locks are stored by a backend set by the ``EDIT_LOCK_BACKEND`` setting: ``DatabaseEditLockBackend`` (the
+default) stores them in the ``EditLock`` table, and ``CacheEditLockBackend`` stores them in a Django cache.
+"""
+
+from datetime import datetime, timedelta
+from typing import Collection, Iterable, List, NamedTuple, Optional
+
+from django.core.cache import caches
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from django_object_lock.models import EditLock
+from django_object_lock.settings import dol_settings
+
+
+class EditLockInfo(NamedTuple):
+    """The owner and expiration time of an edit lock.
+    """
+    owner: str
+    expires_at: datetime
+
+
+class BaseEditLockBackend:
+    """Interface of edit lock backends. Locks are identified by a string key.
+    """
+
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        """Acquire the lock for ``ttl`` seconds, unless another owner holds it, and return whether it was acquired.
+        Acquiring a lock already held by ``owner`` renews it.
+        """
+        raise NotImplementedError('This method must be implemented.')
+
+    def acquire_many(self, keys: Collection[str], owner: str, ttl: int) -> List[str]:
+        """Acquire several locks for ``ttl`` seconds, skipping locks held by other owners, and return the keys of the
+        acquired locks.
+        """
+        return [key for key in keys if self.acquire(key, owner, ttl)]
+
+    def renew(self, key: str, owner: str, ttl: int) -> bool:
+        """Extend the lock held by ``owner`` for ``ttl`` seconds from now, and return whether it was renewed.
+        Expired locks are not renewed.
+        """
+        raise NotImplementedError('This method must be implemented.')
+
+    def release(self, key: str, owner: str) -> bool:
+        """Release the lock held by ``owner`` and return whether it was released.
+        """
+        raise NotImplementedError('This method must be implemented.')
+
+    def get(self, key: str) -> Optional[EditLockInfo]:
+        """Return the owner and expiration time of the lock, or ``None`` if the lock is not held.
+        """
+        raise NotImplementedError('This method must be implemented.')
+
+
+class DatabaseEditLockBackend(BaseEditLockBackend):
+    """Store edit locks in the ``EditLock`` table. Acquiring a lock relies on the unique key constraint, so
+    concurrent owners cannot acquire the same lock.
+    """
+
+    def _get_available(self, owner: str, now: datetime) -> Q:
+        """Match locks that ``owner`` can acquire: expired locks and locks held by ``owner``.
+        """
+        return Q(expires_at__lte=now) | Q(owner=owner)
+
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl)
+        # Take over expired locks or renew our own lock.
+        if EditLock.objects.filter(self._get_available(owner, now), key=key).update(
+            owner=owner, expires_at=expires_at
+        ):
+            return True
+        try:
+            with transaction.atomic(using=EditLock.objects.db):
+                EditLock.objects.create(key=key, owner=owner, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        return True
+
+    def acquire_many(self, keys: Collection[str], owner: str, ttl: int) -> List[str]:
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl)
+        EditLock.objects.filter(self._get_available(owner, now), key__in=keys).update(
+            owner=owner, expires_at=expires_at
+        )
+        EditLock.objects.bulk_create(
+            [EditLock(key=key, owner=owner, expires_at=expires_at) for key in keys], ignore_conflicts=True
+        )
+        acquired = set(EditLock.objects.filter(key__in=keys, owner=owner, expires_at__gt=now).values_list(
+            'key', flat=True
+        ))
+        return [key for key in keys if key in acquired]
+
+    def renew(self, key: str, owner: str, ttl: int) -> bool:
+        now = timezone.now()
+        return bool(EditLock.objects.filter(key=key, owner=owner, expires_at__gt=now).update(
+            expires_at=now + timedelta(seconds=ttl)
+        ))
+
+    def release(self, key: str, owner: str) -> bool:
+        return bool(EditLock.objects.filter(key=key, owner=owner).delete()[0])
+
+    def get(self, key: str) -> Optional[EditLockInfo]:
+        row = EditLock.objects.filter(key=key, expires_at__gt=timezone.now()).values_list(
+            'owner', 'expires_at'
+        ).first()
+        return None if row is None else EditLockInfo(*row)
+
+
+class CacheEditLockBackend(BaseEditLockBackend):
+    """Store edit locks in the Django cache set by the ``EDIT_LOCK_CACHE_ALIAS`` setting.
+
+    Locks are acquired using the atomic ``cache.add()`` operation. Renewing and releasing a lock check its owner
+    first, so they are not atomic: a lock expiring right between both steps may be renewed or released on behalf of
+    its next owner.
+    """
+    key_prefix = 'django_object_lock:edit_lock:'
+
+    @property
+    def cache(self):
+        return caches[dol_settings.EDIT_LOCK_CACHE_ALIAS]
+
+    def acquire(self, key: str, owner: str, ttl: int) -> bool:
+        cache_key = self.key_prefix + key
+        info = EditLockInfo(owner, timezone.now() + timedelta(seconds=ttl))
+        if self.cache.add(cache_key, tuple(info), ttl):
+            return True
+        # Renew our own lock.
+        current = self.cache.get(cache_key)
+        if current is not None and current[0] == owner:
+            self.cache.set(cache_key, tuple(info), ttl)
+            return True
+        return False
+
+    def renew(self, key: str, owner: str, ttl: int) -> bool:
+        current = self.get(key)
+        if current is None or current.owner != owner:
+            return False
+        self.cache.set(self.key_prefix + key, (owner, timezone.now() + timedelta(seconds=ttl)), ttl)
+        return True
+
+    def release(self, key: str, owner: str) -> bool:
+        current = self.get(key)
+        if current is None or current.owner != owner:
+            return False
+        self.cache.delete(self.key_prefix + key)
+        return True
+
+    def get(self, key: str) -> Optional[EditLockInfo]:
+        current = self.cache.get(self.key_prefix + key)
+        return None if current is None else EditLockInfo(*current)
+
+
+def get_edit_lock_backend() -> BaseEditLockBackend:
+    """Return an instance of the backend set by the ``EDIT_LOCK_BACKEND`` setting.
+    """
+    return dol_settings.EDIT_LOCK_BACKEND()
+
+
+def get_edit_lock_key(obj: models.Model) -> str:
+    """Return the key of the edit lock of ``obj``. Instances of proxy models share the key of their concrete model,
+    since they edit the same row.
+    """
+    return '%s:%s' % (obj._meta.concrete_model._meta.label_lower, obj.pk)
+
+
+def acquire_edit_lock(obj: models.Model, owner: str, ttl: Optional[int] = None) -> bool:
+    """Acquire (or renew) the edit lock of ``obj`` for ``owner``, and return whether it was acquired.
+    ``ttl`` defaults to the ``EDIT_LOCK_TTL`` setting.
+    """
+    return get_edit_lock_backend().acquire(get_edit_lock_key(obj), owner, ttl or dol_settings.EDIT_LOCK_TTL)
+
+
+def acquire_edit_locks(objs: Iterable[models.Model], owner: str, ttl: Optional[int] = None) -> List[models.Model]:
+    """Acquire (or renew) the edit locks of all ``objs`` for ``owner``, skipping objects being edited by other
+    owners, and return the objects whose lock was acquired.
+    """
+    objs_by_key = {get_edit_lock_key(obj): obj for obj in objs}
+    acquired = get_edit_lock_backend().acquire_many(list(objs_by_key), owner, ttl or dol_settings.EDIT_LOCK_TTL)
+    return [objs_by_key[key] for key in acquired]
+
+
+def renew_edit_lock(obj: models.Model, owner: str, ttl: Optional[int] = None) -> bool:
+    """Renew the edit lock of ``obj`` held by ``owner``, and return whether it was renewed.
+    """
+    return get_edit_lock_backend().renew(get_edit_lock_key(obj), owner, ttl or dol_settings.EDIT_LOCK_TTL)
+
+
+def release_edit_lock(obj: models.Model, owner: str) -> bool:
+    """Release the edit lock of ``obj`` held by ``owner``, and return whether it was released.
+    """
+    return get_edit_lock_backend().release(get_edit_lock_key(obj), owner)
+
+
+def get_edit_lock(obj: models.Model) -> Optional[EditLockInfo]:
+    """Return the owner and expiration time of the edit lock of ``obj``, or ``None`` if nobody is editing it.
+    """
+    return get_edit_lock_backend().get(get_edit_lock_key(obj))
@@ -1,6 +1,13 @@
+from typing import Any, Collection, Dict, List, Optional
+
 from django.utils.translation import gettext_lazy as _
 
 
 class ObjectLocked(Exception):
-    def __init__(self, msg: str = _('This object is locked and cannot be edited.'), *args):
+    def __init__(
+        self, msg: str = _('This object is locked and cannot be edited.'), *args,
+        pks: Optional[Collection[Any]] = None, pks_by_model: Optional[Dict[str, List[Any]]] = None
+    ):
         super().__init__(msg, *args)
+        self.pks = pks
+        self.pks_by_model = pks_by_model
@@ -0,0 +1,102 @@
+from typing import Any, List, Sequence, Tuple, Union
+
+from django.core import checks
+from django.db import models
+from django.db.models.lookups import In
+from django.utils.translation import gettext_lazy as _
+
+
+class LockField(models.PositiveSmallIntegerField):
+    """Field holding the lock status of an object as a bitmask of lock reasons, so that an object can be locked
+    and unlocked independently for each reason. The object is locked if any reason is set.
+
+    ``reasons`` is a sequence of ``(name, label)`` pairs. The bit of each reason is given by its position, so new
+    reasons must be appended. The first reason is used when locking without giving a reason.
+
+    Use the ``has_reason`` lookup to filter objects locked for a reason, such as
+    ``Contract.objects.filter(lock_reasons__has_reason='legal_hold')``. It is evaluated as an ``IN`` list of the
+    matching values rather than a bitwise operation, so that the database can use the field's index.
+    """
+    description = _('Lock reasons')
+
+    # Filtering by reason enumerates the matching values, so the number of reasons is kept small.
+    max_reasons = 8
+
+    def __init__(self, *args, reasons: Sequence[Tuple[str, str]] = (), **kwargs):
+        self.reasons = list(reasons)
+        kwargs.setdefault('default', 0)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def check(self, **kwargs) -> List[checks.CheckMessage]:
+        errors = super().check(**kwargs)
+        if not self.reasons:
+            errors.append(checks.Error(
+                '"reasons" must list at least one lock reason.', obj=self, id='django_object_lock.E001'
+            ))
+        elif len(self.reasons) > self.max_reasons:
+            errors.append(checks.Error(
+                '"reasons" must not list more than %d lock reasons.' % self.max_reasons, obj=self,
+                id='django_object_lock.E002'
+            ))
+        return errors
+
+    def deconstruct(self) -> Tuple[str, str, List[Any], dict]:
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['reasons'] = self.reasons
+        if kwargs.get('default') == 0:
+            del kwargs['default']
+        if self.db_index:
+            del kwargs['db_index']
+        else:
+            kwargs['db_index'] = False
+        return name, path, args, kwargs
+
+    @property
+    def reason_names(self) -> List[str]:
+        return [name for name, _label in self.reasons]
+
+    @property
+    def default_reason(self) -> str:
+        return self.reasons[0][0]
+
+    @property
+    def all_reasons_mask(self) -> int:
+        return (1 << len(self.reasons)) - 1
+
+    def get_reason_bit(self, reason: Union[str, int]) -> int:
+        """Return the bit of ``reason``, given as a name or a bit. Raise ``ValueError`` for unknown reasons.
+        """
+        if isinstance(reason, int) and not isinstance(reason, bool):
+            if reason & self.all_reasons_mask and not reason & (reason - 1):
+                return reason
+        elif reason in self.reason_names:
+            return 1 << self.reason_names.index(reason)
+        raise ValueError('Unknown lock reason: %r.' % (reason,))
+
+    def get_reasons(self, value: int) -> List[str]:
+        """Return the names of the reasons set in ``value``.
+        """
+        return [name for i, name in enumerate(self.reason_names) if value & (1 << i)]
+
+    def get_reason_labels(self, value: int) -> List[str]:
+        """Return the labels of the reasons set in ``value``.
+        """
+        return [label for i, (_name, label) in enumerate(self.reasons) if value & (1 << i)]
+
+    def get_values_with_reason(self, reason: Union[str, int]) -> List[int]:
+        """Return all field values in which ``reason`` is set.
+        """
+        bit = self.get_reason_bit(reason)
+        return [value for value in range(1, self.all_reasons_mask + 1) if value & bit]
+
+
+@LockField.register_lookup
+class HasReason(In):
+    """Match objects locked for a reason, given as a name or a bit, using an index-friendly ``IN`` list.
+    """
+    lookup_name = 'has_reason'
+
+    def get_prep_lookup(self) -> Any:
+        self.rhs = self.lhs.output_field.get_values_with_reason(self.rhs)
+        return super().get_prep_lookup()
@@ -0,0 +1,162 @@
+"""Background lock jobs.
+
+Lock jobs lock or unlock a selection of objects in chunks, outside of the request that creates them. Jobs are stored in
+the ``LockJob`` table and run either by a thread pool within the web process or by the ``run_lock_jobs`` management
+command, depending on the ``LOCK_JOBS_RUNNER`` setting.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Type
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, models, transaction
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.urls import resolve, reverse
+from django.utils.translation import gettext as _
+
+from django_object_lock.mixins import LockableMixin
+from django_object_lock.models import LockJob
+from django_object_lock.settings import dol_settings
+from django_object_lock.utils import count_pk_ranges, get_pk_ranges
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def create_lock_job(
+    queryset: QuerySet, lock: bool, chunk_size: Optional[int] = None, reason: Optional[str] = None,
+    filters: Optional[str] = None, user: Optional[models.Model] = None
+) -> LockJob:
+    """Create a pending job to lock or unlock all objects in ``queryset``, optionally only for ``reason``.
+
+    The primary keys of the objects are stored as ranges (see ``get_pk_ranges``), so the job processes the objects
+    selected when it is created. If the admin changelist query string ``filters`` is given instead, ``queryset`` is
+    not evaluated: the job selects the objects in the changelist of ``user`` when it starts.
+    """
+    if filters is not None:
+        pk_ranges = []
+    else:
+        pk_ranges = get_pk_ranges(queryset.order_by('pk').values_list('pk', flat=True).iterator())
+    return LockJob.objects.create(
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        lock=lock,
+        reason=reason or '',
+        pk_ranges=pk_ranges,
+        filters=filters or '',
+        user=user,
+        chunk_size=chunk_size or dol_settings.DEFAULT_LOCK_CHUNK_SIZE,
+        total=count_pk_ranges(pk_ranges),
+    )
+
+
+def get_default_locker(model: Type[models.Model]) -> LockableMixin:
+    """Return the object defining the locking logic for ``model`` when none is given: its admin in the default
+    admin site if it is lockable, or a plain ``LockableMixin`` otherwise.
+    """
+    from django.contrib import admin
+
+    model_admin = admin.site._registry.get(model)
+    return model_admin if isinstance(model_admin, LockableMixin) else LockableMixin()
+
+
+def claim_lock_job(job_id: int, resume: bool = False) -> Optional[LockJob]:
+    """Mark a pending job as running and return it, or return ``None`` if it has already been claimed.
+
+    If ``resume`` is ``True``, running jobs can be claimed too, to resume jobs that were interrupted.
+    """
+    statuses = [LockJob.Status.PENDING, LockJob.Status.RUNNING] if resume else [LockJob.Status.PENDING]
+    if not LockJob.objects.filter(pk=job_id, status__in=statuses).update(status=LockJob.Status.RUNNING):
+        return None
+    return LockJob.objects.get(pk=job_id)
+
+
+def _select_lock_job_objects(job: LockJob, locker: LockableMixin) -> Optional[str]:
+    """Store the primary keys of the objects selected by the changelist filters of a job. Return an error message
+    if the objects cannot be selected.
+    """
+    from django_object_lock.admin.selection import get_changelist_queryset
+
+    if not hasattr(locker, 'get_changelist_instance'):
+        return _('The objects can only be selected by a model admin.')
+    if job.user is None:
+        return _('The user who selected the objects no longer exists.')
+    opts = locker.model._meta
+    request = HttpRequest()
+    request.method = 'GET'
+    request.user = job.user
+    request.path = request.path_info = reverse(
+        '%s:%s_%s_changelist' % (locker.admin_site.name, opts.app_label, opts.model_name)
+    )
+    request.resolver_match = resolve(request.path_info)
+    queryset = get_changelist_queryset(locker, request, job.filters)
+    if queryset is None:
+        return _('The selected filters are not valid.')
+    job.pk_ranges = get_pk_ranges(queryset.order_by('pk').values_list('pk', flat=True).iterator())
+    job.total = count_pk_ranges(job.pk_ranges)
+    job.filters = ''
+    job.save(update_fields=['pk_ranges', 'total', 'filters', 'updated_at'])
+    return None
+
+
+def run_lock_job(job: LockJob, locker: Optional[LockableMixin] = None) -> LockJob:
+    """Process a claimed job chunk by chunk, starting after the last processed object.
+
+    Jobs created with changelist filters first select their objects. Each chunk is processed in its own transaction,
+    and the progress is saved after each chunk. Chunks that fail are recorded in the job's ``errors`` and do not stop
+    the job.
+    """
+    model = job.content_type.model_class()
+    locker = locker or get_default_locker(model)
+    if job.filters:
+        error = _select_lock_job_objects(job, locker)
+        if error is not None:
+            job.errors.append({'first_pk': None, 'last_pk': None, 'error': error})
+            job.status = LockJob.Status.FAILED
+            job.save(update_fields=['errors', 'status', 'updated_at'])
+            return job
+    for pks in job.iter_pk_chunks():
+        try:
+            with transaction.atomic():
+                affected = locker._set_queryset_locked_status(
+                    model._default_manager.filter(pk__in=pks), job.lock, job.reason or None
+                )
+        except Exception as e:
+            job.errors.append({'first_pk': pks[0], 'last_pk': pks[-1], 'error': str(e)})
+            affected = 0
+        job.processed += len(pks)
+        job.affected += affected
+        job.last_pk = pks[-1]
+        job.save(update_fields=['processed', 'affected', 'last_pk', 'errors', 'updated_at'])
+    job.status = LockJob.Status.FAILED if job.errors else LockJob.Status.DONE
+    job.save(update_fields=['status', 'updated_at'])
+    return job
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=dol_settings.LOCK_JOBS_MAX_WORKERS, thread_name_prefix='django_object_lock'
+            )
+        return _executor
+
+
+def _run_lock_job_in_thread(job_id: int, locker: Optional[LockableMixin]) -> None:
+    try:
+        job = claim_lock_job(job_id)
+        if job is not None:
+            run_lock_job(job, locker)
+    finally:
+        connections.close_all()
+
+
+def start_lock_job(job: LockJob, locker: Optional[LockableMixin] = None) -> None:
+    """Start running a job in the thread pool once the current transaction is committed, if the
+    ``LOCK_JOBS_RUNNER`` setting is ``'thread'``. Otherwise, the job is left to the ``run_lock_jobs`` command.
+    """
+    if dol_settings.LOCK_JOBS_RUNNER == 'thread':
+        transaction.on_commit(lambda: _get_executor().submit(_run_lock_job_in_thread, job.pk, locker))
@@ -0,0 +1,98 @@
+import json
+import time
+from typing import Any, Dict, List, Type
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models import QuerySet
+
+from django_object_lock.jobs import get_default_locker
+from django_object_lock.settings import dol_settings
+from django_object_lock.utils import iter_pk_chunks
+
+
+class Command(BaseCommand):
+    help = 'Lock the objects of a model matching the given filters.'
+    lock = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='The model label, such as "articles.Article".')
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='LOOKUP=VALUE', dest='filters',
+            help='Only process objects matching this lookup, such as "created_at__lt=2024-01-01". Values are parsed '
+                 'as JSON if possible, so use "true", "false" or "null" for Booleans and null values. Can be used '
+                 'several times.'
+        )
+        parser.add_argument(
+            '--exclude', action='append', default=[], metavar='LOOKUP=VALUE', dest='excludes',
+            help='Skip objects matching this lookup. Can be used several times.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=dol_settings.DEFAULT_LOCK_CHUNK_SIZE,
+            help='The number of objects processed in each transaction.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count the objects that would be processed, without changing them.'
+        )
+
+    def parse_lookups(self, lookups: List[str]) -> Dict[str, Any]:
+        parsed = {}
+        for lookup in lookups:
+            name, sep, value = lookup.partition('=')
+            if not sep:
+                raise CommandError('Invalid lookup "%s", expected LOOKUP=VALUE.' % lookup)
+            try:
+                parsed[name] = json.loads(value)
+            except ValueError:
+                parsed[name] = value
+        return parsed
+
+    def get_model(self, label: str) -> Type[models.Model]:
+        try:
+            return apps.get_model(label)
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+
+    def get_queryset(self, model: Type[models.Model], options: Dict[str, Any]) -> QuerySet:
+        try:
+            return model._default_manager.filter(
+                **self.parse_lookups(options['filters'])
+            ).exclude(**self.parse_lookups(options['excludes']))
+        except Exception as e:
+            raise CommandError('Invalid lookups: %s' % e)
+
+    def handle(self, *args, **options):
+        model = self.get_model(options['model'])
+        queryset = self.get_queryset(model, options)
+        locker = get_default_locker(model)
+        action = 'lock' if self.lock else 'unlock'
+        verbose_name_plural = model._meta.verbose_name_plural
+
+        if options['dry_run']:
+            total = queryset.count()
+            condition = locker.get_lock_change_condition(model)
+            if condition is not None:
+                pending = (queryset.exclude(condition) if self.lock else queryset.filter(condition)).count()
+            else:
+                pending = sum(1 for obj in queryset.iterator() if locker.is_instance_locked(obj) != self.lock)
+            self.stdout.write('%d of %d selected %s would be %sed.' % (pending, total, verbose_name_plural, action))
+            return
+
+        start = time.monotonic()
+        processed = affected = 0
+        for pks in iter_pk_chunks(queryset, options['chunk_size']):
+            with transaction.atomic(using=queryset.db):
+                affected += locker.set_queryset_locked_status(
+                    model._default_manager.filter(pk__in=pks), self.lock
+                )
+            processed += len(pks)
+            if options['verbosity'] >= 2:
+                self.stdout.write('%d %s processed...' % (processed, verbose_name_plural))
+        elapsed = time.monotonic() - start
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            '%d of %d selected %s %sed in %.2f s (%.0f rows/s).'
+            % (affected, processed, verbose_name_plural, action, elapsed, rate)
+        ))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_object_lock.jobs import claim_lock_job, run_lock_job
+from django_object_lock.models import LockJob
+
+
+class Command(BaseCommand):
+    help = 'Run pending lock jobs created from the admin.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Also resume running jobs, which may have been interrupted.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep waiting for new jobs instead of exiting when there are no pending jobs.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Number of seconds to wait between checks for new jobs when using --loop.'
+        )
+
+    def handle(self, *args, **options):
+        resume = options['resume']
+        while True:
+            self.run_jobs(resume)
+            if not options['loop']:
+                return
+            # Running jobs are only resumed once; new ones are handled by the worker that claimed them.
+            resume = False
+            time.sleep(options['interval'])
+
+    def run_jobs(self, resume: bool) -> None:
+        statuses = [LockJob.Status.PENDING, LockJob.Status.RUNNING] if resume else [LockJob.Status.PENDING]
+        job_ids = LockJob.objects.filter(status__in=statuses).order_by('pk').values_list('pk', flat=True)
+        for job_id in list(job_ids):
+            job = claim_lock_job(job_id, resume=resume)
+            if job is None:
+                continue
+            self.stdout.write('Running %s...' % job)
+            job = run_lock_job(job)
+            self.stdout.write(
+                '%s: %d/%d objects processed, %d affected, %d failed chunks.'
+                % (job, job.processed, job.total, job.affected, len(job.errors))
+            )
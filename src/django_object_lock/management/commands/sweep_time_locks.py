@@ -0,0 +1,69 @@
+from typing import List, Type
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Now
+
+from django_object_lock.models import TimeLockableModel
+from django_object_lock.settings import dol_settings
+from django_object_lock.utils import iter_pk_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Store the lock status of time-lockable objects whose lock has started or expired in their lock field, so '
+        'that it does not depend on the time anymore. The lock status of the objects does not change.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='model',
+            help='The labels of the models to sweep, such as "articles.Announcement". Defaults to all models '
+                 'inheriting from TimeLockableModel.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=dol_settings.DEFAULT_LOCK_CHUNK_SIZE,
+            help='The number of objects updated in each transaction.'
+        )
+
+    def get_models(self, labels: List[str]) -> List[Type[TimeLockableModel]]:
+        if not labels:
+            return [model for model in apps.get_models() if issubclass(model, TimeLockableModel)]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            if not issubclass(model, TimeLockableModel):
+                raise CommandError('%s does not inherit from TimeLockableModel.' % label)
+            models.append(model)
+        return models
+
+    def sweep(self, queryset: QuerySet, condition: Q, values: dict, chunk_size: int) -> int:
+        """Update the objects matching ``condition`` in chunks, checking ``condition`` again in each ``UPDATE``
+        statement, and return the number of updated objects.
+        """
+        count = 0
+        for pks in iter_pk_chunks(queryset.filter(condition), chunk_size):
+            with transaction.atomic(using=queryset.db):
+                count += queryset.filter(condition, pk__in=pks).update(**values)
+        return count
+
+    def handle(self, *args, **options):
+        for model in self.get_models(options['models']):
+            queryset = model._base_manager.all()
+            lock_field = model.lock_field
+            expired = self.sweep(
+                queryset, Q(locked_until__lte=Now()),
+                {lock_field: False, 'locked_from': None, 'locked_until': None}, options['chunk_size']
+            )
+            started = self.sweep(
+                queryset, Q(**{lock_field: False}, locked_from__lte=Now()),
+                {lock_field: True, 'locked_from': None}, options['chunk_size']
+            )
+            self.stdout.write(self.style.SUCCESS(
+                '%s: %d locks started, %d locks expired.' % (model._meta.verbose_name_plural, started, expired)
+            ))
@@ -0,0 +1,6 @@
+from django_object_lock.management.commands.lock_objects import Command as LockObjectsCommand
+
+
+class Command(LockObjectsCommand):
+    help = 'Unlock the objects of a model matching the given filters.'
+    lock = False
@@ -0,0 +1,19 @@
+from typing import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from django_object_lock.status_cache import lock_status_cache
+
+
+class LockStatusCacheMiddleware:
+    """Activate a lock status cache for each request, available as ``request.lock_status_cache``. See
+    ``django_object_lock.status_cache``.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with lock_status_cache() as cache:
+            request.lock_status_cache = cache
+            return self.get_response(request)
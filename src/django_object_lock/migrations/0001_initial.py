@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-17 15:37
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LockJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lock', models.BooleanField(help_text='Whether objects are locked (or unlocked).', verbose_name='lock')),
+                ('reason', models.CharField(blank=True, default='', help_text='The lock reason to set or clear, if the objects are locked for each reason.', max_length=64, verbose_name='reason')),
+                ('pk_ranges', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='The primary keys of the selected objects, as ranges of consecutive values or single values.', verbose_name='primary key ranges')),
+                ('filters', models.TextField(blank=True, default='', help_text='The admin changelist query string selecting the objects, until they are selected by the job.', verbose_name='filters')),
+                ('chunk_size', models.PositiveIntegerField(help_text='The number of objects per chunk.', verbose_name='chunk size')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=16, verbose_name='status')),
+                ('total', models.PositiveIntegerField(default=0, help_text='The number of selected objects.', verbose_name='total')),
+                ('processed', models.PositiveIntegerField(default=0, help_text='The number of selected objects processed so far.', verbose_name='processed')),
+                ('affected', models.PositiveIntegerField(default=0, help_text='The number of objects locked or unlocked so far.', verbose_name='affected')),
+                ('last_pk', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='The primary key of the last processed object, to resume the job.', null=True, verbose_name='last primary key')),
+                ('errors', models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='The chunks that could not be processed.', verbose_name='errors')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('content_type', models.ForeignKey(help_text='The model of the objects to lock or unlock.', on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='content type')),
+                ('user', models.ForeignKey(blank=True, help_text='The user who created the job, whose changelist selects the objects.', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'lock job',
+                'verbose_name_plural': 'lock jobs',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-17 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_object_lock', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EditLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='The key of the locked object.', max_length=255, unique=True, verbose_name='key')),
+                ('owner', models.CharField(help_text='The owner of this lock.', max_length=255, verbose_name='owner')),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='The date and time at which this lock expires.', verbose_name='expires at')),
+            ],
+            options={
+                'verbose_name': 'edit lock',
+                'verbose_name_plural': 'edit locks',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-17 15:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_object_lock', '0002_editlock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObjectLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_pk', models.CharField(help_text='The primary key of the locked object.', max_length=255, verbose_name='object primary key')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('content_type', models.ForeignKey(help_text='The model of the locked object.', on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='content type')),
+            ],
+            options={
+                'verbose_name': 'object lock',
+                'verbose_name_plural': 'object locks',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='objectlock',
+            constraint=models.UniqueConstraint(fields=('content_type', 'object_pk'), name='django_object_lock_unique_object'),
+        ),
+    ]
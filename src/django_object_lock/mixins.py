@@ -1,33 +1,239 @@
+from typing import Any, Callable, Optional, Type
+
 from django.db import models
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest
 
-from django_object_lock.models import LockableModel
+from django_object_lock.fields import LockField
+from django_object_lock.models import LockableModel, ObjectLock
+from django_object_lock.querysets import LOCK_STATUS_ANNOTATION
+from django_object_lock.status_cache import clear_lock_status_cache, get_lock_status_cache
 
 
 class LockableMixin:
     """Mixin to add object locking logic for models that do not inherit from ``LockableModel`` or to override
     locking logic.
+
+    Set ``use_edit_locks`` to ``True`` to also prevent editing objects while other users are editing them (see
+    ``django_object_lock.edit_locks``). Edit locks expire after ``edit_lock_ttl`` seconds, which defaults to the
+    ``EDIT_LOCK_TTL`` setting.
     """
+    use_edit_locks: bool = False
+    edit_lock_ttl: Optional[int] = None
 
     def is_instance_locked(self, obj: models.Model) -> bool:
         """Implement this method returning ``True`` if the instance should be considered locked,
         and ``False`` otherwise.
 
         If your model inherits from ``LockableModel``, you need not implement this method. In that
-        case, the ``LockableModel``'s ``is_locked`` method is used.
+        case, the ``LockableModel``'s ``is_locked`` method is used. Otherwise, the ``ObjectLock`` table is used
+        unless ``set_locked_status`` is implemented (see ``uses_object_lock_table``).
         """
         if isinstance(obj, LockableModel):
             return obj.is_locked()
+        elif self.uses_object_lock_table(type(obj)):
+            if LOCK_STATUS_ANNOTATION in obj.__dict__:
+                return bool(obj.__dict__[LOCK_STATUS_ANNOTATION])
+            return ObjectLock.objects.is_locked(obj)
         else:
             raise NotImplementedError('This method must be implemented.')
 
+    def get_instance_lock_status(self, obj: models.Model) -> bool:
+        """Return ``is_instance_locked(obj)``, cached by model, primary key and class of ``self`` while a lock status
+        cache is active (see ``django_object_lock.status_cache``).
+        """
+        cache = get_lock_status_cache()
+        if cache is None:
+            return self.is_instance_locked(obj)
+        locked = cache.get(obj, self)
+        if locked is None:
+            locked = self.is_instance_locked(obj)
+            cache.set(obj, locked, self)
+        return locked
+
     def set_locked_status(self, obj: models.Model, lock: bool) -> None:
         """Implement to lock or unlock an object when the ``lock`` or ``unlock``
         actions are used.
 
         If your model inherits from ``LockableModel``, you need not implement this method. In that
-        case, the ``LockableModel``'s ``set_locked`` method is used.
+        case, the ``LockableModel``'s ``set_locked`` method is used. Otherwise, the ``ObjectLock`` table is used
+        unless ``is_instance_locked`` is implemented (see ``uses_object_lock_table``). In that case, the object
+        is locked or unlocked right away.
         """
         if isinstance(obj, LockableModel):
             obj.set_locked(lock)
+        elif self.uses_object_lock_table(type(obj)):
+            self.lock_instance(obj, lock)
         else:
             raise NotImplementedError('This method must be implemented.')
+
+    def uses_object_lock_table(self, model: Type[models.Model]) -> bool:
+        """Return whether the lock status of instances of ``model`` is stored in the ``ObjectLock`` table: that is
+        the case for models that do not inherit from ``LockableModel`` unless this mixin overrides
+        ``is_instance_locked`` or ``set_locked_status``.
+        """
+        if isinstance(model, type) and issubclass(model, LockableModel):
+            return False
+        cls = type(self)
+        return (
+            cls.is_instance_locked is LockableMixin.is_instance_locked
+            and cls.set_locked_status is LockableMixin.set_locked_status
+        )
+
+    def get_edit_lock_owner(self, request: HttpRequest) -> Optional[str]:
+        """Return the owner of the edit locks acquired by ``request``, or ``None`` if it cannot hold edit locks.
+        Defaults to the primary key of the authenticated user.
+        """
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return str(user.pk)
+
+    def get_lock_condition(self, model: Type[models.Model]) -> Optional[Q]:
+        """Return a ``Q`` object matching the locked instances of ``model``, or ``None`` if the lock status
+        cannot be evaluated in the database.
+
+        If your model inherits from ``LockableModel`` and this mixin does not override ``is_instance_locked``,
+        the model's declared lock condition is used. If the ``ObjectLock`` table is used, a subquery on that table is
+        used. Override if you also override ``is_instance_locked``.
+        """
+        if self.uses_object_lock_table(model):
+            return ObjectLock.objects.get_lock_condition(model)
+        if not (isinstance(model, type) and issubclass(model, LockableModel)):
+            return None
+        if type(self).is_instance_locked is not LockableMixin.is_instance_locked:
+            return None
+        return model.get_lock_condition()
+
+    def get_lock_change_condition(self, model: Type[models.Model], reason: Optional[str] = None) -> Optional[Q]:
+        """Return a ``Q`` object matching the instances of ``model`` that ``set_queryset_locked_status`` considers
+        locked, that is, those it unlocks and does not lock, or ``None`` if it checks ``is_instance_locked`` instead.
+
+        When locking in bulk (see ``get_bulk_lock_field``), this is the condition on the model's own lock fields
+        (see ``LockableModel.get_lock_field_condition``), which ignores any inherited lock status. Otherwise, it is
+        ``get_lock_condition(model)``.
+        """
+        if self.get_bulk_lock_field(model) is not None:
+            return model.get_lock_field_condition(reason)
+        return self.get_lock_condition(model)
+
+    def get_bulk_lock_field(self, model: Type[models.Model]) -> Optional[str]:
+        """Return the name of the field to update when locking or unlocking instances of ``model`` in bulk,
+        or ``None`` if instances must be locked or unlocked one by one.
+
+        Bulk locking is available for ``LockableModel`` subclasses that set ``lock_field`` as long as neither
+        the model nor this mixin customize how instances are locked. Override to return ``None`` to opt out.
+        """
+        if not (isinstance(model, type) and issubclass(model, LockableModel)) or model.lock_field is None:
+            return None
+        if model.is_locked is not LockableModel.is_locked or model.set_locked is not LockableModel.set_locked:
+            return None
+        cls = type(self)
+        if (
+            cls.is_instance_locked is not LockableMixin.is_instance_locked
+            or cls.set_locked_status is not LockableMixin.set_locked_status
+        ):
+            return None
+        return model.lock_field
+
+    def get_lock_reason_field(self, model: Type[models.Model]) -> Optional[LockField]:
+        """Return the ``LockField`` holding the lock reasons of ``model``, or ``None`` if instances cannot be locked
+        and unlocked for each reason. Lock reasons are only available along with bulk locking (see
+        ``get_bulk_lock_field``).
+        """
+        if self.get_bulk_lock_field(model) is None:
+            return None
+        return model.get_lock_reason_field()
+
+    def _check_lock_reason(self, model: Type[models.Model], reason: Optional[str]) -> None:
+        """Raise ``ValueError`` if ``reason`` is given but is not a lock reason of ``model``.
+        """
+        if reason is None:
+            return
+        field = self.get_lock_reason_field(model)
+        if field is None:
+            raise ValueError('%s cannot be locked for a reason.' % model._meta.object_name)
+        field.get_reason_bit(reason)
+
+    def lock_instance(self, obj: models.Model, lock: bool, reason: Optional[str] = None) -> bool:
+        """Lock or unlock ``obj`` and return whether this call changed its lock status.
+
+        If ``get_bulk_lock_field`` returns a field name for the model, a single conditional ``UPDATE`` statement is
+        used (see ``LockableModel.lock()``), so concurrent calls cannot both change the lock status. Otherwise,
+        ``is_instance_locked`` is checked, and the object is locked or unlocked using ``set_locked_status`` and saved.
+
+        If ``reason`` is given, only that lock reason is set or cleared (see ``get_lock_reason_field``). Raise
+        ``ValueError`` if it is not a lock reason of the model.
+        """
+        self._check_lock_reason(type(obj), reason)
+        if self.get_bulk_lock_field(type(obj)) is not None:
+            changed = obj.lock(reason) if lock else obj.unlock(reason)
+        elif self.uses_object_lock_table(type(obj)):
+            changed = ObjectLock.objects.lock(obj) if lock else ObjectLock.objects.unlock(obj)
+        elif self.is_instance_locked(obj) == lock:
+            return False
+        else:
+            self.set_locked_status(obj, lock)
+            obj.save()
+            changed = True
+        # The annotated lock status is no longer valid.
+        obj.__dict__.pop(LOCK_STATUS_ANNOTATION, None)
+        clear_lock_status_cache()
+        return changed
+
+    def bulk_set_locked_status(self, queryset: QuerySet, lock: bool, reason: Optional[str] = None) -> int:
+        """Lock or unlock all objects in ``queryset`` that are not in the target status yet using a single
+        ``UPDATE`` statement, and return the number of affected rows. If ``reason`` is given, only that lock reason
+        is set or cleared.
+
+        Only available if ``get_bulk_lock_field`` returns a field name for the model.
+        """
+        model = queryset.model
+        if self.get_bulk_lock_field(model) is None:
+            raise NotImplementedError('Bulk locking is not supported for this model.')
+        self._check_lock_reason(model, reason)
+        condition = model.get_lock_field_condition(reason)
+        queryset = queryset.exclude(condition) if lock else queryset.filter(condition)
+        count = queryset.update(**model.get_lock_update_values(lock, reason))
+        clear_lock_status_cache()
+        return count
+
+    def _set_queryset_locked_status(self, queryset: QuerySet, lock: bool, reason: Optional[str]) -> int:
+        return _call_with_reason(self.set_queryset_locked_status, queryset, lock, reason=reason)
+
+    def _lock_instance(self, obj: models.Model, lock: bool, reason: Optional[str]) -> bool:
+        return _call_with_reason(self.lock_instance, obj, lock, reason=reason)
+
+    def set_queryset_locked_status(self, queryset: QuerySet, lock: bool, reason: Optional[str] = None) -> int:
+        """Lock or unlock all objects in ``queryset`` that are not in the target status yet, and return the number
+        of affected objects.
+
+        Objects are locked or unlocked in bulk if possible (see ``get_bulk_lock_field`` and
+        ``uses_object_lock_table``). Otherwise, each object is locked or unlocked using ``set_locked_status`` and
+        saved. If ``reason`` is given, only that lock reason is set or cleared (see ``get_lock_reason_field``).
+        """
+        self._check_lock_reason(queryset.model, reason)
+        if self.get_bulk_lock_field(queryset.model) is not None:
+            return self.bulk_set_locked_status(queryset, lock, reason)
+        if self.uses_object_lock_table(queryset.model):
+            manager = ObjectLock.objects
+            count = manager.lock_queryset(queryset) if lock else manager.unlock_queryset(queryset)
+            clear_lock_status_cache()
+            return count
+        condition = self.get_lock_condition(queryset.model)
+        if condition is not None:
+            objects = (queryset.exclude(condition) if lock else queryset.filter(condition)).iterator()
+        else:
+            objects = (obj for obj in queryset.iterator() if self.is_instance_locked(obj) != lock)
+        count = 0
+        for obj in objects:
+            self.set_locked_status(obj, lock)
+            obj.save()
+            count += 1
+        clear_lock_status_cache()
+        return count
+
+
+def _call_with_reason(method: Callable, *args: Any, reason: Optional[str]) -> Any:
+    # Only pass the reason if given, so that overrides without the reason argument keep working.
+    return method(*args) if reason is None else method(*args, reason)
@@ -1,11 +1,51 @@
-from typing import Any, Collection, Optional
+from typing import Any, Collection, Dict, FrozenSet, Iterator, List, Optional, Set, Type, Union
 
-from django.db import models
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, router, transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast, Now
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
+from django_object_lock.deletion import LockAwareCollector
 from django_object_lock.exceptions import ObjectLocked
+from django_object_lock.fields import LockField
+from django_object_lock.querysets import LOCK_STATUS_ANNOTATION, LockableManager
+from django_object_lock.status_cache import clear_lock_status_cache
+from django_object_lock.utils import evaluate_condition, iter_pk_range_chunks, prefix_condition
 
 
 class LockableModel(models.Model):
+    lock_field: Optional[str] = None
+    """Name of a Boolean field or ``LockField`` holding the locked status of this model. If set, ``is_locked()``
+    and ``set_locked(value)`` need not be implemented, and instances can be locked and unlocked in bulk. With a
+    ``LockField``, instances can also be locked and unlocked for each lock reason.
+    """
+
+    lock_condition: Union[str, Q, None] = None
+    """Name of a Boolean field or ``Q`` object that evaluates to ``True`` for locked instances. If set,
+    ``is_locked()`` need not be implemented. Defaults to ``lock_field``.
+    """
+
+    lock_inherits_from: Optional[str] = None
+    """Relation path (using ``__`` to follow several relations) to a lockable model that instances of this model
+    inherit their lock status from. If the related instance is locked, this instance is locked too.
+    """
+
+    lock_conditional_save: bool = False
+    """If ``True``, ``save()`` updates existing rows with ``UPDATE ... WHERE NOT <locked>`` and raises
+    ``ObjectLocked`` if no row matches, instead of checking the lock status when the instance was loaded. Requires
+    ``lock_field`` or an inherited lock condition, and cannot be combined with ``lock_condition``. As with database
+    errors, the current transaction is marked for rollback in that case.
+    """
+
+    objects = LockableManager()
 
     class Meta:
         abstract = True
@@ -15,28 +55,687 @@ class LockableModel(models.Model):
         cls, db: Optional[str], field_names: Collection[str], values: Collection[Any]
     ) -> models.Model:
         instance = super().from_db(db, field_names, values)
-        instance._was_locked_on_load = instance.is_locked()
+        # The lock status on load is resolved lazily, right before the first change to a field or when saving,
+        # so that loading instances whose lock status depends on related objects does not trigger extra queries.
+        instance._lock_snapshot_pending = True
+        if cls.lock_conditional_save and cls.lock_field is not None:
+            instance.__dict__['_lock_fields_on_load'] = {
+                name: instance.__dict__.get(name) for name in cls.get_lock_field_names()
+            }
         return instance
 
+    @classmethod
+    def _get_lock_tracked_names(cls) -> FrozenSet[str]:
+        names = cls.__dict__.get('_lock_tracked_names')
+        if names is None:
+            names = frozenset(name for field in cls._meta.concrete_fields for name in (field.name, field.attname))
+            cls._lock_tracked_names = names
+        return names
+
+    @classmethod
+    def _get_forward_relations(cls) -> Dict[str, models.Field]:
+        relations = cls.__dict__.get('_lock_forward_relations')
+        if relations is None:
+            relations = {
+                field.name: field for field in cls._meta.concrete_fields if field.many_to_one or field.one_to_one
+            }
+            cls._lock_forward_relations = relations
+        return relations
+
+    @classmethod
+    def _get_forward_relation_attnames(cls) -> FrozenSet[str]:
+        return frozenset(field.attname for field in cls._get_forward_relations().values())
+
+    def _is_relation_cache_fill(self, name: str, value: Any) -> bool:
+        """Return whether assigning ``value`` to ``name`` only caches the related object that the instance already
+        refers to, as Django does when loading related objects (for example with ``prefetch_related()``). The
+        descriptor then assigns the unchanged foreign key value, which is not a change either.
+        """
+        field = self._get_forward_relations().get(name)
+        if field is not None:
+            return (
+                isinstance(value, models.Model)
+                and field.attname in self.__dict__
+                and getattr(value, field.target_field.attname) == self.__dict__[field.attname]
+            )
+        return (
+            name in self._get_forward_relation_attnames()
+            and name in self.__dict__
+            and value == self.__dict__[name]
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if (
+            self.__dict__.get('_lock_snapshot_pending')
+            and name in self._get_lock_tracked_names()
+            and not self._is_relation_cache_fill(name, value)
+        ):
+            self._take_lock_snapshot()
+        super().__setattr__(name, value)
+
+    def _take_lock_snapshot(self) -> None:
+        del self.__dict__['_lock_snapshot_pending']
+        self._was_locked_on_load = self.is_locked()
+        # The annotated lock status may not be valid after changing any field.
+        self.__dict__.pop(LOCK_STATUS_ANNOTATION, None)
+
+    def _get_was_locked_on_load(self) -> bool:
+        if self.__dict__.get('_lock_snapshot_pending'):
+            self._take_lock_snapshot()
+        return self.__dict__.get('_was_locked_on_load', False)
+
+    @classmethod
+    def get_lock_parent_model(cls) -> Optional[Type['LockableModel']]:
+        """Return the model that instances of this model inherit their lock status from, if any.
+        """
+        if cls.lock_inherits_from is None:
+            return None
+        model = cls
+        for name in cls.lock_inherits_from.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+            if not (field.many_to_one or field.one_to_one):
+                raise ImproperlyConfigured(
+                    '"lock_inherits_from" must follow forward relations, but %s.%s is not.'
+                    % (model._meta.object_name, name)
+                )
+            model = field.related_model
+        if not issubclass(model, LockableModel):
+            raise ImproperlyConfigured(
+                '%s does not inherit from LockableModel.' % model._meta.object_name
+            )
+        return model
+
+    @classmethod
+    def get_lock_inheritance_path(cls) -> Optional[str]:
+        """Return the full relation path through which instances of this model inherit their lock status,
+        following the inheritance chain, or ``None`` if the lock status is not inherited.
+        """
+        parent_model = cls.get_lock_parent_model()
+        if parent_model is None:
+            return None
+        parent_path = parent_model.get_lock_inheritance_path()
+        return cls.lock_inherits_from if parent_path is None else cls.lock_inherits_from + LOOKUP_SEP + parent_path
+
+    @classmethod
+    def get_lock_field_names(cls) -> Set[str]:
+        """Return the names of the fields that hold the lock status of this model itself.
+        """
+        return set() if cls.lock_field is None else {cls.lock_field}
+
+    @classmethod
+    def get_lock_reason_field(cls) -> Optional[LockField]:
+        """Return the field named by ``lock_field`` if it is a ``LockField``, or ``None`` otherwise.
+        """
+        if cls.lock_field is None:
+            return None
+        field = cls._meta.get_field(cls.lock_field)
+        return field if isinstance(field, LockField) else None
+
+    @classmethod
+    def _get_required_lock_reason_field(cls) -> LockField:
+        field = cls.get_lock_reason_field()
+        if field is None:
+            raise NotImplementedError('"lock_field" must be a LockField to use lock reasons.')
+        return field
+
+    @classmethod
+    def get_lock_field_condition(cls, reason: Optional[str] = None) -> Q:
+        """Return a ``Q`` object matching instances locked by the fields returned by ``get_lock_field_names()``,
+        regardless of ``lock_condition`` and ``lock_inherits_from``. Only available if ``lock_field`` is set.
+
+        If ``reason`` is given, only instances locked for that reason are matched. ``lock_field`` must be a
+        ``LockField`` in that case.
+        """
+        if cls.lock_field is None:
+            raise NotImplementedError('The model must declare "lock_field".')
+        if reason is not None:
+            cls._get_required_lock_reason_field().get_reason_bit(reason)
+            return Q(**{cls.lock_field + '__has_reason': reason})
+        if cls.get_lock_reason_field() is not None:
+            return Q(**{cls.lock_field + '__gt': 0})
+        return Q(**{cls.lock_field: True})
+
+    @classmethod
+    def get_lock_update_values(cls, value: bool, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Return the field values that lock (if ``value`` is ``True``) or unlock instances. Only available if
+        ``lock_field`` is set.
+
+        With a ``LockField``, locking sets the default reason (the first one) and unlocking clears all reasons,
+        unless ``reason`` is given, in which case only that reason is set or cleared using a bitwise expression.
+        """
+        if cls.lock_field is None:
+            raise NotImplementedError('The model must declare "lock_field".')
+        field = cls.get_lock_reason_field()
+        if reason is not None:
+            bit = cls._get_required_lock_reason_field().get_reason_bit(reason)
+            if value:
+                return {cls.lock_field: F(cls.lock_field).bitor(bit)}
+            return {cls.lock_field: F(cls.lock_field).bitand(field.all_reasons_mask ^ bit)}
+        if field is not None:
+            return {cls.lock_field: field.get_reason_bit(field.default_reason) if value else 0}
+        return {cls.lock_field: value}
+
+    @classmethod
+    def get_lock_condition(cls) -> Optional[Q]:
+        """Return the declared lock condition as a ``Q`` object, including any inherited lock condition, or
+        ``None`` if it has not been declared.
+        """
+        condition = cls.lock_condition
+        if isinstance(condition, str):
+            condition = Q(**{condition: True})
+        elif condition is None and cls.lock_field is not None:
+            condition = cls.get_lock_field_condition()
+        parent_model = cls.get_lock_parent_model()
+        if parent_model is not None:
+            parent_condition = parent_model.get_lock_condition()
+            if parent_condition is None:
+                raise ImproperlyConfigured(
+                    '%s does not declare a lock condition.' % parent_model._meta.object_name
+                )
+            parent_condition = prefix_condition(parent_condition, cls.lock_inherits_from)
+            condition = parent_condition if condition is None else condition | parent_condition
+        return condition
+
+    @classmethod
+    def get_locked_pks(
+        cls, objs: Collection['LockableModel'], querysets: Collection[models.QuerySet] = (),
+        using: Optional[str] = None
+    ) -> List[Any]:
+        """Return the primary keys of the locked objects among ``objs`` and the objects in ``querysets``. Used by
+        ``LockAwareCollector`` to check objects about to be deleted.
+
+        If the lock condition is declared, a single query is used. Otherwise, ``is_locked()`` is called for each
+        object, unless it is not implemented.
+        """
+        condition = cls.get_lock_condition()
+        if condition is None:
+            if cls.is_locked is LockableModel.is_locked:
+                return []
+            objs = [*objs, *(obj for queryset in querysets for obj in queryset)]
+            return [obj.pk for obj in objs if obj.is_locked()]
+        lookups = [Q(pk__in=[obj.pk for obj in objs])] if objs else []
+        lookups.extend(Q(pk__in=queryset.values('pk')) for queryset in querysets)
+        return list(cls._base_manager.using(using).filter(condition).filter(
+            Q(*lookups, _connector=Q.OR)
+        ).values_list('pk', flat=True))
+
     def is_locked(self) -> bool:
         """Implement to determine when a model instance is locked (return ``True``) or not
         (return ``False``).
+
+        If ``lock_condition`` is a field name or ``lock_field`` is set, the value of that field is checked.
+        If ``lock_condition`` is a ``Q`` object, the condition is evaluated on the field values of this instance if
+        it only uses fields of this model with simple lookups on values that compare alike in Python and in the
+        database (see ``evaluate_condition``), and in the database otherwise. Conditions on strings are always
+        evaluated in the database, whose collation may compare them case-insensitively. If ``lock_inherits_from`` is
+        set, the instance is also locked if the related instance is locked. The lock status annotated using
+        ``with_lock_status()`` is used instead, if present.
         """
-        raise NotImplementedError('This method must be implemented.')
+        condition = self.lock_condition
+        if condition is None and self.lock_field is None and self.lock_inherits_from is None:
+            raise NotImplementedError('This method must be implemented.')
+        elif LOCK_STATUS_ANNOTATION in self.__dict__:
+            return bool(self.__dict__[LOCK_STATUS_ANNOTATION])
+        elif isinstance(condition, str):
+            if getattr(self, condition):
+                return True
+        elif condition is not None:
+            # Evaluate the condition on the in-memory values if possible, so that unsaved changes are considered.
+            locked = evaluate_condition(condition, self)
+            if locked is None:
+                if self.pk is not None:
+                    return type(self)._base_manager.filter(self.get_lock_condition(), pk=self.pk).exists()
+            elif locked:
+                return True
+        elif self.lock_field is not None and self._is_locked_by_lock_fields():
+            return True
+        if self.lock_inherits_from is not None:
+            parent = self
+            for name in self.lock_inherits_from.split(LOOKUP_SEP):
+                parent = getattr(parent, name)
+                if parent is None:
+                    return False
+            return parent.is_locked()
+        return False
+
+    @classmethod
+    def _are_lock_field_values_locked(cls, values: Dict[str, Any]) -> bool:
+        """Evaluate ``get_lock_field_condition()`` on ``values``, the values of the fields returned by
+        ``get_lock_field_names()``.
+        """
+        return bool(values[cls.lock_field])
+
+    def _get_lock_field_values(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.get_lock_field_names()}
+
+    def _is_locked_by_lock_fields(self) -> bool:
+        """Evaluate ``get_lock_field_condition()`` on the field values of this instance.
+        """
+        return self._are_lock_field_values_locked(self._get_lock_field_values())
+
+    def get_lock_reasons(self) -> List[str]:
+        """Return the names of the reasons this instance is locked for. ``lock_field`` must be a ``LockField``.
+        """
+        return self._get_required_lock_reason_field().get_reasons(getattr(self, self.lock_field))
+
+    def set_lock_reason(self, reason: str, value: bool) -> None:
+        """Set (if ``value`` is ``True``) or clear ``reason`` without saving. ``lock_field`` must be a
+        ``LockField``.
+        """
+        bit = self._get_required_lock_reason_field().get_reason_bit(reason)
+        current = getattr(self, self.lock_field)
+        setattr(self, self.lock_field, current | bit if value else current & ~bit)
 
     def set_locked(self, value: bool) -> None:
         """Implement to set the locked status of this model instance to allow manual locking
         and unlocking.
+
+        If ``lock_field`` is set, the values returned by ``get_lock_update_values(value)`` are assigned.
         """
+        if self.lock_field is not None:
+            for name, field_value in self.get_lock_update_values(value).items():
+                setattr(self, name, field_value)
+            return
         raise NotImplementedError('This method must be implemented.')
 
+    @classmethod
+    def check(cls, **kwargs) -> List[checks.CheckMessage]:
+        errors = super().check(**kwargs)
+        if cls.lock_conditional_save and cls.lock_condition is not None and cls.lock_condition != cls.lock_field:
+            # A conditional save could not unlock an instance by changing the fields of its lock condition, since the
+            # locked row would not match the UPDATE statement.
+            errors.append(checks.Error(
+                '"lock_conditional_save" cannot be used with a "lock_condition" other than "lock_field".',
+                hint='Remove "lock_condition" and lock instances through "lock_field", or unset '
+                     '"lock_conditional_save".',
+                obj=cls, id='django_object_lock.E003'
+            ))
+        return errors
+
+    def _is_conditional_save(self) -> bool:
+        return self.lock_conditional_save and self.get_lock_condition() is not None
+
+    def _get_conditional_save_condition(self) -> Optional[Q]:
+        """Return the condition matching rows that must not be overwritten by a conditional save, or ``None`` if
+        any row can be overwritten.
+
+        When the instance is being unlocked (it was locked by its own lock fields when loaded and is not anymore), its
+        own lock condition is ignored, so only the inherited lock condition applies.
+        """
+        values_on_load = self.__dict__.get('_lock_fields_on_load')
+        if (
+            self.lock_field is not None
+            and values_on_load is not None
+            and self._are_lock_field_values_locked(values_on_load)
+            and not self._is_locked_by_lock_fields()
+        ):
+            parent_model = self.get_lock_parent_model()
+            if parent_model is None:
+                return None
+            return prefix_condition(parent_model.get_lock_condition(), self.lock_inherits_from)
+        return self.get_lock_condition()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update) -> bool:
+        if not self._is_conditional_save():
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        condition = self._get_conditional_save_condition()
+        if condition is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if super()._do_update(base_qs.exclude(condition), using, pk_val, values, update_fields, forced_update):
+            return True
+        # No unlocked row matched: the row is either locked or does not exist (and it should be inserted).
+        if base_qs.filter(pk=pk_val).exists():
+            raise ObjectLocked()
+        return False
+
+    def _set_locked_atomically(self, value: bool, reason: Optional[str] = None) -> bool:
+        if self.lock_field is None:
+            if reason is not None:
+                raise NotImplementedError('"lock_field" must be a LockField to use lock reasons.')
+            if self.is_locked() == value:
+                return False
+            self.set_locked(value)
+            self.save()
+            return True
+        queryset = type(self)._base_manager.filter(pk=self.pk)
+        condition = self.get_lock_field_condition(reason)
+        values = self.get_lock_update_values(value, reason)
+        changed = (queryset.exclude(condition) if value else queryset.filter(condition)).update(**values)
+        clear_lock_status_cache()
+        # Reflect the new lock status without taking the lock status snapshot, which may query the database.
+        if not changed:
+            # The row was already locked (or unlocked) in a way this instance may not know about, so the lock fields
+            # are read from the database instead.
+            values = queryset.values(*self.get_lock_field_names()).first() or {}
+        elif reason is not None:
+            # Other reasons may have changed concurrently, so only the bit of this reason is known.
+            bit = self.get_lock_reason_field().get_reason_bit(reason)
+            current = getattr(self, self.lock_field)
+            values = {self.lock_field: current | bit if value else current & ~bit}
+        for name, field_value in values.items():
+            self.__dict__[self._meta.get_field(name).attname] = field_value
+        self.__dict__.pop(LOCK_STATUS_ANNOTATION, None)
+        self.__dict__['_lock_snapshot_pending'] = True
+        if self.lock_conditional_save:
+            self.__dict__['_lock_fields_on_load'] = self._get_lock_field_values()
+        return bool(changed)
+
+    def lock(self, reason: Optional[str] = None) -> bool:
+        """Lock this instance in the database and return whether this call locked it (``False`` if it was already
+        locked).
+
+        If ``lock_field`` is set, a single conditional ``UPDATE`` statement is used, so concurrent calls cannot both
+        lock the instance. Otherwise, ``set_locked(True)`` is called and the instance is saved.
+
+        If ``reason`` is given, the instance is locked for that reason with a bitwise ``UPDATE``, and ``False`` is
+        returned only if it was already locked for that reason. ``lock_field`` must be a ``LockField``.
+        """
+        return self._set_locked_atomically(True, reason)
+
+    def unlock(self, reason: Optional[str] = None) -> bool:
+        """Unlock this instance in the database and return whether this call unlocked it (``False`` if it was
+        already unlocked). See ``lock()``.
+
+        If ``reason`` is given, only that reason is cleared, so the instance remains locked for any other reason.
+        """
+        return self._set_locked_atomically(False, reason)
+
     def save(self, *args, **kwargs):
-        if self.pk is not None and self.is_locked() and getattr(self, '_was_locked_on_load', False):
+        if self._is_conditional_save():
+            # The lock status is checked by the UPDATE statement itself (see _do_update).
+            super().save(*args, **kwargs)
+            clear_lock_status_cache()
+            if self.lock_field is not None:
+                self.__dict__['_lock_fields_on_load'] = self._get_lock_field_values()
+            return
+        if self.pk is not None and self.is_locked() and self._get_was_locked_on_load():
             raise ObjectLocked()
         super().save(*args, **kwargs)
+        clear_lock_status_cache()
         self._was_locked_on_load = self.is_locked()
 
-    def delete(self, *args, **kwargs):
+    def delete(self, using: Optional[str] = None, keep_parents: bool = False):
+        """Delete this instance, raising ``ObjectLocked`` if it is locked or if any object that would be deleted in
+        cascade is locked. Nothing is deleted in that case. See ``LockAwareCollector``.
+        """
         if self.pk is not None and self.is_locked():
             raise ObjectLocked()
-        super().delete(*args, **kwargs)
+        if self.pk is None:
+            return super().delete(using, keep_parents)
+        collector = LockAwareCollector(
+            using or router.db_for_write(self.__class__, instance=self), origin=self, checked_objs=[self]
+        )
+        collector.collect([self], keep_parents=keep_parents)
+        return collector.delete()
+
+
+class TimeLockableModel(LockableModel):
+    """Lockable model that can also be locked during a time window.
+
+    Instances are locked if ``lock_field`` is set or ``locked_from`` has passed, unless ``locked_until`` has passed.
+    The time window is evaluated in the database against the database clock, so it can be used to filter and annotate
+    by lock status. Subclasses must set ``lock_field``.
+    """
+
+    locked_from = models.DateTimeField(
+        _('locked from'), null=True, blank=True, db_index=True,
+        help_text=_('The date and time from which this object is locked.')
+    )
+    locked_until = models.DateTimeField(
+        _('locked until'), null=True, blank=True, db_index=True,
+        help_text=_('The date and time from which this object is not locked anymore.')
+    )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get_lock_field_names(cls) -> Set[str]:
+        return super().get_lock_field_names() | {'locked_from', 'locked_until'}
+
+    @classmethod
+    def get_lock_field_condition(cls, reason: Optional[str] = None) -> Q:
+        if reason is not None:
+            # Lock reasons are independent of the time window.
+            return super().get_lock_field_condition(reason)
+        return (super().get_lock_field_condition() | Q(locked_from__lte=Now())) & ~Q(locked_until__lte=Now())
+
+    @classmethod
+    def get_lock_update_values(cls, value: bool, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Locking clears ``locked_until``, and unlocking clears both ``locked_from`` and ``locked_until``, so that
+        the new lock status does not change over time. Locking or unlocking for a reason leaves them unchanged.
+        """
+        values = super().get_lock_update_values(value, reason)
+        if reason is not None:
+            return values
+        values['locked_until'] = None
+        if not value:
+            values['locked_from'] = None
+        return values
+
+    @classmethod
+    def _are_lock_field_values_locked(cls, values: Dict[str, Any]) -> bool:
+        now = timezone.now()
+        if values['locked_until'] is not None and values['locked_until'] <= now:
+            return False
+        return (
+            super()._are_lock_field_values_locked(values)
+            or (values['locked_from'] is not None and values['locked_from'] <= now)
+        )
+
+
+class LockJob(models.Model):
+    """A job that locks or unlocks a selection of objects in the background, in chunks.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    content_type = models.ForeignKey(
+        ContentType, verbose_name=_('content type'), on_delete=models.CASCADE,
+        help_text=_('The model of the objects to lock or unlock.')
+    )
+    lock = models.BooleanField(_('lock'), help_text=_('Whether objects are locked (or unlocked).'))
+    reason = models.CharField(
+        _('reason'), max_length=64, blank=True, default='',
+        help_text=_('The lock reason to set or clear, if the objects are locked for each reason.')
+    )
+    pk_ranges = models.JSONField(
+        _('primary key ranges'), default=list, encoder=DjangoJSONEncoder,
+        help_text=_('The primary keys of the selected objects, as ranges of consecutive values or single values.')
+    )
+    filters = models.TextField(
+        _('filters'), blank=True, default='',
+        help_text=_('The admin changelist query string selecting the objects, until they are selected by the job.')
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, verbose_name=_('user'), null=True, blank=True, on_delete=models.SET_NULL,
+        help_text=_('The user who created the job, whose changelist selects the objects.')
+    )
+    chunk_size = models.PositiveIntegerField(_('chunk size'), help_text=_('The number of objects per chunk.'))
+    status = models.CharField(
+        _('status'), max_length=16, choices=Status.choices, default=Status.PENDING, db_index=True
+    )
+    total = models.PositiveIntegerField(_('total'), default=0, help_text=_('The number of selected objects.'))
+    processed = models.PositiveIntegerField(
+        _('processed'), default=0, help_text=_('The number of selected objects processed so far.')
+    )
+    affected = models.PositiveIntegerField(
+        _('affected'), default=0, help_text=_('The number of objects locked or unlocked so far.')
+    )
+    last_pk = models.JSONField(
+        _('last primary key'), null=True, blank=True, encoder=DjangoJSONEncoder,
+        help_text=_('The primary key of the last processed object, to resume the job.')
+    )
+    errors = models.JSONField(
+        _('errors'), default=list, blank=True, encoder=DjangoJSONEncoder,
+        help_text=_('The chunks that could not be processed.')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('lock job')
+        verbose_name_plural = _('lock jobs')
+
+    def __str__(self) -> str:
+        return f'LockJob {self.pk} ({self.status})'
+
+    def iter_pk_chunks(self) -> Iterator[List[Any]]:
+        """Iterate over the primary keys of the objects selected by this job that have not been processed yet, in
+        lists of at most ``chunk_size`` items.
+        """
+        pk_field = self.content_type.model_class()._meta.pk
+        for pks in iter_pk_range_chunks(self.pk_ranges, self.chunk_size, skip=self.processed):
+            yield [pk_field.to_python(pk) for pk in pks]
+
+    @property
+    def progress(self) -> int:
+        """The percentage of processed objects.
+        """
+        return 100 if not self.total else min(100, self.processed * 100 // self.total)
+
+
+class EditLock(models.Model):
+    """A temporary lock held by an owner while editing an object, used by ``DatabaseEditLockBackend``.
+    """
+    key = models.CharField(_('key'), max_length=255, unique=True, help_text=_('The key of the locked object.'))
+    owner = models.CharField(_('owner'), max_length=255, help_text=_('The owner of this lock.'))
+    expires_at = models.DateTimeField(
+        _('expires at'), db_index=True, help_text=_('The date and time at which this lock expires.')
+    )
+
+    class Meta:
+        verbose_name = _('edit lock')
+        verbose_name_plural = _('edit locks')
+
+    def __str__(self) -> str:
+        return f'EditLock {self.key} ({self.owner})'
+
+
+class ObjectLockManager(models.Manager):
+    """Manager to lock, unlock and filter objects of any model by their locks in the ``ObjectLock`` table.
+
+    Primary keys are stored in the text form that the database gives to them (see ``get_object_pk``), so that locks
+    can be matched against the primary keys of the locked objects in SQL.
+    """
+
+    def register(self, model: Type[models.Model]) -> None:
+        """Delete the lock of each instance of ``model`` when the instance is deleted. Models are registered when
+        this table is used for them, and by ``LockableAdminMixin`` when they are registered in the admin.
+        """
+        for sender in (model, model._meta.concrete_model):
+            if sender not in _models_with_object_locks:
+                post_delete.connect(
+                    _delete_object_lock, sender=sender, weak=False,
+                    dispatch_uid='django_object_lock_delete_object_lock',
+                )
+                _models_with_object_locks.add(sender)
+
+    def get_object_pk(self, model: Type[models.Model], pk: Any) -> str:
+        """Return the value stored in ``object_pk`` for the instance of ``model`` with primary key ``pk``, which
+        matches the primary key column cast to text by the database.
+        """
+        return str(model._meta.pk.get_db_prep_value(pk, connections[self.db]))
+
+    def _get_object_pks(self, queryset: models.QuerySet) -> models.QuerySet:
+        return queryset.annotate(_object_pk=Cast('pk', models.CharField())).values('_object_pk')
+
+    def get_lock_condition(self, model: Type[models.Model]) -> Q:
+        """Return a ``Q`` object matching the instances of ``model`` locked in this table, using a subquery.
+        """
+        self.register(model)
+        return Q(Exists(self.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_pk=Cast(OuterRef('pk'), models.CharField()),
+        )))
+
+    def _filter_objects(self, model: Type[models.Model], pks: Any) -> models.QuerySet:
+        self.register(model)
+        return self.filter(content_type=ContentType.objects.get_for_model(model)).filter(
+            object_pk__in=pks
+        )
+
+    def is_locked(self, obj: models.Model) -> bool:
+        return self._filter_objects(type(obj), [self.get_object_pk(type(obj), obj.pk)]).exists()
+
+    def lock(self, obj: models.Model) -> bool:
+        """Lock ``obj`` and return whether this call locked it (``False`` if it was already locked).
+        """
+        self.register(type(obj))
+        created = self.get_or_create(
+            content_type=ContentType.objects.get_for_model(obj), object_pk=self.get_object_pk(type(obj), obj.pk)
+        )[1]
+        clear_lock_status_cache()
+        return created
+
+    def unlock(self, obj: models.Model) -> bool:
+        """Unlock ``obj`` and return whether this call unlocked it (``False`` if it was not locked).
+        """
+        deleted = self._filter_objects(type(obj), [self.get_object_pk(type(obj), obj.pk)]).delete()[0]
+        clear_lock_status_cache()
+        return bool(deleted)
+
+    def lock_queryset(self, queryset: models.QuerySet) -> int:
+        """Lock all objects in ``queryset`` that are not locked yet, and return their number.
+
+        Objects locked concurrently are skipped and not counted.
+        """
+        model = queryset.model
+        content_type = ContentType.objects.get_for_model(model)
+        pks = queryset.exclude(self.get_lock_condition(model)).values_list('pk', flat=True)
+        locks = self._filter_objects(model, self._get_object_pks(queryset))
+        with transaction.atomic(using=self.db):
+            count = locks.count()
+            self.bulk_create([
+                ObjectLock(content_type=content_type, object_pk=self.get_object_pk(model, pk)) for pk in pks
+            ], ignore_conflicts=True)
+            count = locks.count() - count
+        clear_lock_status_cache()
+        return count
+
+    def unlock_queryset(self, queryset: models.QuerySet) -> int:
+        """Unlock all locked objects in ``queryset``, and return their number.
+        """
+        deleted = self._filter_objects(queryset.model, self._get_object_pks(queryset)).delete()[0]
+        clear_lock_status_cache()
+        return deleted
+
+
+class ObjectLock(models.Model):
+    """The lock of an object of any model, used by ``LockableMixin`` for models that do not inherit from
+    ``LockableModel``. An object is locked if and only if it has a lock.
+    """
+    content_type = models.ForeignKey(
+        ContentType, verbose_name=_('content type'), on_delete=models.CASCADE,
+        help_text=_('The model of the locked object.')
+    )
+    object_pk = models.CharField(
+        _('object primary key'), max_length=255, help_text=_('The primary key of the locked object.')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+
+    objects = ObjectLockManager()
+
+    class Meta:
+        verbose_name = _('object lock')
+        verbose_name_plural = _('object locks')
+        constraints = [
+            # Also serves as the index to look up the locks of objects.
+            models.UniqueConstraint(fields=['content_type', 'object_pk'], name='django_object_lock_unique_object'),
+        ]
+
+    def __str__(self) -> str:
+        return f'ObjectLock {self.content_type_id}:{self.object_pk}'
+
+
+# The models whose instances' locks are deleted with them (see ``ObjectLockManager.register``).
+_models_with_object_locks: Set[Type[models.Model]] = set()
+
+
+def _delete_object_lock(sender: Type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+    if ObjectLock.objects._filter_objects(sender, [ObjectLock.objects.get_object_pk(sender, instance.pk)]).delete()[0]:
+        clear_lock_status_cache()
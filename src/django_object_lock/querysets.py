@@ -0,0 +1,405 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import django
+from django.db import connections, models
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
+from django.utils.translation import gettext_lazy as _
+
+from django_object_lock.deletion import LockAwareCollector
+from django_object_lock.exceptions import ObjectLocked
+from django_object_lock.status_cache import clear_lock_status_cache
+
+
+LOCK_STATUS_ANNOTATION = '_lock_status'
+
+
+def with_lock_status_annotation(queryset: models.QuerySet, condition: Q) -> models.QuerySet:
+    """Annotate the lock status of each object in ``queryset`` as ``LOCK_STATUS_ANNOTATION``, evaluating
+    ``condition`` in the database. Any lock status already annotated is replaced.
+    """
+    return queryset.annotate(**{LOCK_STATUS_ANNOTATION: ExpressionWrapper(condition, output_field=BooleanField())})
+
+
+class LockAwareResult(NamedTuple):
+    """Result of a lock-aware bulk operation.
+    """
+    affected: int
+    skipped: int
+
+
+class LockAwareBulkResult(NamedTuple):
+    """Result of a lock-aware bulk operation on a list of objects.
+    """
+    affected: int
+    skipped: List[models.Model]
+
+
+class LockableQuerySet(models.QuerySet):
+    """QuerySet for lockable models that evaluates the lock status in the database.
+
+    The model must declare its lock condition by setting ``lock_condition``, ``lock_field`` or
+    ``lock_inherits_from``.
+
+    ``update()`` and ``delete()`` raise ``ObjectLocked`` if any object is locked, unless the model does not
+    declare its lock condition. ``update_unlocked()`` and ``delete_unlocked()`` skip locked objects instead.
+    The same applies to ``bulk_update()`` and ``bulk_create()`` (when updating conflicts), and their
+    ``bulk_update_unlocked()`` and ``bulk_create_unlocked()`` counterparts.
+    """
+
+    # Maximum number of lookups OR-ed together to check the lock status of objects matched by several fields, since
+    # databases limit the depth of expressions (to 1000 on SQLite).
+    MAX_LOCK_CHECK_OR_LOOKUPS = 500
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_checked = False
+
+    def _clone(self) -> 'LockableQuerySet':
+        clone = super()._clone()
+        clone._lock_checked = self._lock_checked
+        return clone
+
+    def _unlocked_and_checked(self) -> 'LockableQuerySet':
+        """Return unlocked objects only, flagged so that writing them does not check their lock status again.
+        """
+        clone = self.unlocked()
+        clone._lock_checked = True
+        return clone
+
+    def get_lock_condition(self) -> Q:
+        condition = self.model.get_lock_condition()
+        if condition is None:
+            raise NotImplementedError(
+                'The model must declare either "lock_condition", "lock_field" or "lock_inherits_from".'
+            )
+        return condition
+
+    def _should_check_lock(self, fields: Optional[Any] = None) -> bool:
+        """Return whether writing ``fields`` (or deleting, if ``None``) must be prevented for locked objects.
+        Changing only the lock status itself is always allowed.
+        """
+        if self._lock_checked or self.model.get_lock_condition() is None:
+            return False
+        return fields is None or not set(fields) <= self.model.get_lock_field_names()
+
+    def locked(self, reason: Optional[str] = None) -> 'LockableQuerySet':
+        """Return only locked objects. If ``reason`` is given, return only objects locked for that reason (see
+        ``LockableModel.get_lock_field_condition()``).
+        """
+        if reason is not None:
+            return self.filter(self.model.get_lock_field_condition(reason))
+        return self.filter(self.get_lock_condition())
+
+    def unlocked(self) -> 'LockableQuerySet':
+        """Return only unlocked objects.
+        """
+        return self.exclude(self.get_lock_condition())
+
+    def with_lock_status(self) -> 'LockableQuerySet':
+        """Annotate the lock status of each object so that ``is_locked()`` does not need further queries.
+        """
+        if LOCK_STATUS_ANNOTATION in self.query.annotations:
+            return self
+        return with_lock_status_annotation(self, self.get_lock_condition())
+
+    def _set_locked(self, value: bool, reason: Optional[str]) -> int:
+        condition = self.model.get_lock_field_condition(reason)
+        queryset = self.exclude(condition) if value else self.filter(condition)
+        return queryset.update(**self.model.get_lock_update_values(value, reason))
+
+    def lock(self, reason: Optional[str] = None) -> int:
+        """Lock all objects that are not locked yet with a single ``UPDATE`` statement, and return the number of
+        objects locked by this call. Only available if the model sets ``lock_field``.
+
+        If ``reason`` is given, lock all objects that are not locked for that reason yet, using a bitwise
+        ``UPDATE``. ``lock_field`` must be a ``LockField``.
+        """
+        return self._set_locked(True, reason)
+
+    lock.alters_data = True
+
+    def unlock(self, reason: Optional[str] = None) -> int:
+        """Unlock all objects that are not unlocked yet with a single ``UPDATE`` statement, and return the number of
+        objects unlocked by this call. Only available if the model sets ``lock_field``.
+
+        If ``reason`` is given, only clear that reason, so objects remain locked for any other reason.
+        """
+        return self._set_locked(False, reason)
+
+    unlock.alters_data = True
+
+    def update(self, **kwargs) -> int:
+        """Update all objects, raising ``ObjectLocked`` if any of them is locked.
+        """
+        if self._should_check_lock(kwargs):
+            if self.locked().exists():
+                raise ObjectLocked(_('Some objects are locked and cannot be edited.'))
+            # Objects locked after the check above are not overwritten.
+            count = super(LockableQuerySet, self.unlocked()).update(**kwargs)
+        else:
+            count = super().update(**kwargs)
+        clear_lock_status_cache()
+        return count
+
+    update.alters_data = True
+
+    def update_unlocked(self, **kwargs) -> LockAwareResult:
+        """Update all unlocked objects, skipping locked ones, and return the number of affected and skipped
+        objects.
+        """
+        if not self._should_check_lock(kwargs):
+            affected, skipped = super().update(**kwargs), 0
+        else:
+            skipped = self.locked().count()
+            affected = super(LockableQuerySet, self.unlocked()).update(**kwargs)
+        clear_lock_status_cache()
+        return LockAwareResult(affected, skipped)
+
+    update_unlocked.alters_data = True
+
+    def _delete_with_collector(self) -> Tuple[int, Dict[str, int]]:
+        """Delete all objects like ``QuerySet.delete()`` does, but using ``LockAwareCollector``.
+        """
+        self._not_support_combined_queries('delete')
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with delete().")
+        # Plain distinct() is only supported since Django 5.0.
+        if django.VERSION >= (5, 0):
+            if self.query.distinct_fields:
+                raise TypeError('Cannot call delete() after .distinct(*fields).')
+        elif self.query.distinct or self.query.distinct_fields:
+            raise TypeError('Cannot call delete() after .distinct().')
+        if self._fields is not None:
+            raise TypeError('Cannot call delete() after .values() or .values_list()')
+        del_query = self._chain()
+        del_query._for_write = True
+        del_query.query.select_for_update = False
+        del_query.query.select_related = False
+        del_query.query.clear_ordering(force=True)
+        collector = LockAwareCollector(del_query.db, origin=self)
+        collector.collect(del_query)
+        result = collector.delete()
+        self._result_cache = None
+        return result
+
+    def delete(self) -> Tuple[int, Dict[str, int]]:
+        """Delete all objects, raising ``ObjectLocked`` if any of them, or any object that would be deleted in
+        cascade, is locked. Nothing is deleted in that case.
+
+        The lock status is checked with a single query for each lockable model in the deletion graph. See
+        ``LockAwareCollector``.
+        """
+        if self._lock_checked:
+            return super().delete()
+        return self._delete_with_collector()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def delete_unlocked(self) -> LockAwareResult:
+        """Delete all unlocked objects, skipping locked ones, and return the number of deleted and skipped
+        objects. The number of deleted objects includes those deleted in cascade.
+
+        Objects deleted in cascade are not skipped: ``ObjectLocked`` is raised if any of them is locked.
+        """
+        if not self._should_check_lock():
+            return LockAwareResult(self._delete_with_collector()[0], 0)
+        skipped = self.locked().count()
+        return LockAwareResult(self.unlocked()._delete_with_collector()[0], skipped)
+
+    delete_unlocked.alters_data = True
+    delete_unlocked.queryset_only = True
+
+    def _split_locked(
+        self, objs: Iterable[models.Model], key_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> Tuple[List[models.Model], List[models.Model], List[Any]]:
+        """Split ``objs`` into unlocked and locked objects, matching objects to rows by ``key_fields`` (the primary
+        key by default). Also return the primary keys of the locked rows.
+
+        One query is used per batch of at most ``batch_size`` objects, also bounded by the number of query parameters
+        the database supports. Objects are matched with an ``IN`` list if there is a single key field, or with
+        ``OR``-ed lookups, in batches of at most ``MAX_LOCK_CHECK_OR_LOOKUPS``, otherwise.
+        """
+        objs = list(objs)
+        opts = self.model._meta
+        key_fields = [opts.pk if name == 'pk' else opts.get_field(name) for name in key_fields or ['pk']]
+        keys = [tuple(getattr(obj, field.attname) for field in key_fields) for obj in objs]
+        query_keys = list(dict.fromkeys(key for key in keys if None not in key))
+        if not query_keys:
+            return objs, [], []
+        max_batch_size = max(connections[self.db].ops.bulk_batch_size(key_fields, query_keys), 1)
+        if len(key_fields) > 1:
+            max_batch_size = min(max_batch_size, self.MAX_LOCK_CHECK_OR_LOOKUPS)
+        batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+        attnames = [field.attname for field in key_fields]
+        locked_keys = {}
+        for i in range(0, len(query_keys), batch_size):
+            batch = query_keys[i:i + batch_size]
+            if len(key_fields) == 1:
+                condition = Q(**{attnames[0] + '__in': [key[0] for key in batch]})
+            else:
+                condition = Q(*(Q(**dict(zip(attnames, key))) for key in batch), _connector=Q.OR)
+            rows = self.locked().filter(condition).values_list('pk', *attnames)
+            locked_keys.update((tuple(row[1:]), row[0]) for row in rows)
+        unlocked_objs = [obj for obj, key in zip(objs, keys) if key not in locked_keys]
+        locked_objs = [obj for obj, key in zip(objs, keys) if key in locked_keys]
+        return unlocked_objs, locked_objs, list(locked_keys.values())
+
+    def _split_locked_conflicts(
+        self, objs: Iterable[models.Model], unique_fields: Optional[Sequence[str]], batch_size: Optional[int]
+    ) -> Tuple[List[models.Model], List[models.Model], List[Any]]:
+        """Split ``objs`` like ``_split_locked`` does, matching objects to the rows they conflict with. If
+        ``unique_fields`` is not given, as in databases that do not support conflict targets, an object conflicts with
+        any row sharing the values of one of the model's unique fields or total unique constraints.
+        """
+        if unique_fields:
+            return self._split_locked(objs, unique_fields, batch_size)
+        objs = list(objs)
+        opts = self.model._meta
+        key_field_sets = [
+            *([field.name] for field in opts.concrete_fields if field.unique),
+            *(list(fields) for fields in opts.unique_together),
+            *(list(constraint.fields) for constraint in opts.total_unique_constraints),
+        ]
+        unlocked_objs, locked_pks = objs, []
+        for key_fields in key_field_sets:
+            unlocked_objs, _locked_objs, pks = self._split_locked(unlocked_objs, key_fields, batch_size)
+            locked_pks.extend(pks)
+        unlocked_ids = {id(obj) for obj in unlocked_objs}
+        locked_objs = [obj for obj in objs if id(obj) not in unlocked_ids]
+        return unlocked_objs, locked_objs, list(dict.fromkeys(locked_pks))
+
+    def bulk_update(
+        self, objs: Iterable[models.Model], fields: Sequence[str], batch_size: Optional[int] = None
+    ) -> int:
+        """Update ``fields`` of all ``objs``, raising ``ObjectLocked`` if any of them is locked.
+
+        The lock status of all objects is checked using one query per batch of ``batch_size`` objects.
+        """
+        if not self._should_check_lock(fields):
+            count = super().bulk_update(objs, fields, batch_size=batch_size)
+        else:
+            objs, _locked_objs, locked_pks = self._split_locked(objs, batch_size=batch_size)
+            if locked_pks:
+                raise ObjectLocked(_('Some objects are locked and cannot be edited.'), pks=locked_pks)
+            count = super(LockableQuerySet, self._unlocked_and_checked()).bulk_update(
+                objs, fields, batch_size=batch_size
+            )
+        clear_lock_status_cache()
+        return count
+
+    bulk_update.alters_data = True
+
+    def bulk_update_unlocked(
+        self, objs: Iterable[models.Model], fields: Sequence[str], batch_size: Optional[int] = None
+    ) -> LockAwareBulkResult:
+        """Update ``fields`` of all unlocked ``objs``, skipping locked ones, and return the number of affected
+        rows along with the skipped objects.
+
+        The lock status of all objects is checked using one query per batch of ``batch_size`` objects.
+        """
+        if not self._should_check_lock(fields):
+            affected, locked_objs = super().bulk_update(objs, fields, batch_size=batch_size), []
+        else:
+            objs, locked_objs, _locked_pks = self._split_locked(objs, batch_size=batch_size)
+            affected = super(LockableQuerySet, self._unlocked_and_checked()).bulk_update(
+                objs, fields, batch_size=batch_size
+            ) if objs else 0
+        clear_lock_status_cache()
+        return LockAwareBulkResult(affected, locked_objs)
+
+    bulk_update_unlocked.alters_data = True
+
+    def _get_bulk_create_options(
+        self, batch_size: Optional[int], ignore_conflicts: bool, update_conflicts: bool,
+        update_fields: Optional[Sequence[str]], unique_fields: Optional[Sequence[str]]
+    ) -> Dict[str, Any]:
+        # Only pass options that are set, since older Django versions do not support updating conflicts.
+        options = {'batch_size': batch_size, 'ignore_conflicts': ignore_conflicts}
+        if update_conflicts:
+            options.update(update_conflicts=True, update_fields=update_fields, unique_fields=unique_fields)
+        return options
+
+    def bulk_create(
+        self, objs: Iterable[models.Model], batch_size: Optional[int] = None, ignore_conflicts: bool = False,
+        update_conflicts: bool = False, update_fields: Optional[Sequence[str]] = None,
+        unique_fields: Optional[Sequence[str]] = None
+    ) -> List[models.Model]:
+        """Insert all ``objs``. If ``update_conflicts`` is set, raise ``ObjectLocked`` if any of the rows that
+        would be updated is locked.
+
+        The lock status of all conflicting rows is checked using one query per batch of ``batch_size`` objects, and
+        per unique constraint if ``unique_fields`` is not given.
+        """
+        options = self._get_bulk_create_options(
+            batch_size, ignore_conflicts, update_conflicts, update_fields, unique_fields
+        )
+        if update_conflicts and self._should_check_lock(update_fields or []):
+            objs, _locked_objs, locked_pks = self._split_locked_conflicts(objs, unique_fields, batch_size)
+            if locked_pks:
+                raise ObjectLocked(_('Some objects are locked and cannot be edited.'), pks=locked_pks)
+        created = super().bulk_create(objs, **options)
+        clear_lock_status_cache()
+        return created
+
+    bulk_create.alters_data = True
+
+    def bulk_create_unlocked(
+        self, objs: Iterable[models.Model], batch_size: Optional[int] = None, ignore_conflicts: bool = False,
+        update_conflicts: bool = False, update_fields: Optional[Sequence[str]] = None,
+        unique_fields: Optional[Sequence[str]] = None
+    ) -> LockAwareBulkResult:
+        """Insert all ``objs``. If ``update_conflicts`` is set, skip objects whose conflicting rows are locked.
+        Return the number of inserted or updated objects along with the skipped objects.
+
+        The lock status of all conflicting rows is checked using one query per batch of ``batch_size`` objects.
+        """
+        options = self._get_bulk_create_options(
+            batch_size, ignore_conflicts, update_conflicts, update_fields, unique_fields
+        )
+        if not update_conflicts or not self._should_check_lock(update_fields or []):
+            affected, locked_objs = len(super().bulk_create(objs, **options)), []
+        else:
+            objs, locked_objs, _locked_pks = self._split_locked_conflicts(objs, unique_fields, batch_size)
+            affected = len(super().bulk_create(objs, **options)) if objs else 0
+        clear_lock_status_cache()
+        return LockAwareBulkResult(affected, locked_objs)
+
+    bulk_create_unlocked.alters_data = True
+
+    def get(self, *args, **kwargs) -> models.Model:
+        """Fetch a single object, joining the objects it inherits its lock status from, so that
+        ``is_locked()`` does not need further queries.
+
+        The objects are not joined with ``select_for_update()`` or if any relation in the path is nullable, since
+        ``FOR UPDATE`` cannot be applied to the nullable side of an outer join in some databases.
+        """
+        path = self.model.get_lock_inheritance_path()
+        if (
+            path is not None
+            and self._iterable_class is ModelIterable
+            and not self.query.combinator
+            and not self.query.select_for_update
+            and self.query.select_related is not True
+            and not self.query.deferred_loading[0]
+            and LOCK_STATUS_ANNOTATION not in self.query.annotations
+            and not self._has_nullable_relation(path)
+        ):
+            return super(LockableQuerySet, self.select_related(path)).get(*args, **kwargs)
+        return super().get(*args, **kwargs)
+
+    def _has_nullable_relation(self, path: str) -> bool:
+        model = self.model
+        for name in path.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+            if field.null:
+                return True
+            model = field.related_model
+        return False
+
+
+class LockableManager(models.Manager.from_queryset(LockableQuerySet)):
+    pass
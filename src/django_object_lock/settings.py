@@ -13,12 +13,21 @@ from django.utils.module_loading import import_string
 
 # Default values.
 DEFAULTS = {
-    'DEFAULT_LOCKED_ICON_URL': 'django_object_lock/images/locked.svg'
+    'DEFAULT_LOCKED_ICON_URL': 'django_object_lock/images/locked.svg',
+    'DEFAULT_LOCK_CHUNK_SIZE': 1000,
+    'DEFAULT_LOCK_PREVIEW_SIZE': 100,
+    'LOCK_JOBS_RUNNER': 'thread',
+    'LOCK_JOBS_MAX_WORKERS': 1,
+    'EDIT_LOCK_BACKEND': 'django_object_lock.edit_locks.DatabaseEditLockBackend',
+    'EDIT_LOCK_TTL': 300,
+    'EDIT_LOCK_CACHE_ALIAS': 'default',
 }
 
 
 # List of settings that may be in string import notation.
-IMPORT_STRINGS = []
+IMPORT_STRINGS = [
+    'EDIT_LOCK_BACKEND',
+]
 
 
 # Removed settings.
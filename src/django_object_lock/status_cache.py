@@ -0,0 +1,78 @@
+"""Request-scoped cache of lock statuses.
+
+Within a request, the lock status of the same object may be checked many times, for example by the admin permission
+methods called while rendering a change view. While a ``LockStatusCache`` is active, ``LockableMixin`` caches the
+lock status of each object by model, primary key and class of the object defining the locking logic (such as a model
+admin or a viewset, which may override ``is_instance_locked``), so that it is only evaluated once.
+
+Activate a cache for each request with ``LockStatusCacheMiddleware``, or for a block of code with the
+``lock_status_cache()`` context manager. The cache is cleared whenever this library saves, locks, unlocks or deletes
+objects, since the lock status of an object may depend on other objects.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.db import models
+
+
+_current_cache: ContextVar[Optional['LockStatusCache']] = ContextVar('django_object_lock_status_cache', default=None)
+
+
+class LockStatusCache:
+    """Lock statuses keyed by model, primary key and locker class, along with hit and miss counters.
+    """
+
+    def __init__(self):
+        self.statuses: Dict[Tuple[str, Any, Optional[type]], bool] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_key(self, obj: models.Model, locker: Any = None) -> Tuple[str, Any, Optional[type]]:
+        return obj._meta.label_lower, obj.pk, None if locker is None else type(locker)
+
+    def get(self, obj: models.Model, locker: Any = None) -> Optional[bool]:
+        """Return the lock status of ``obj`` cached for ``locker``, the object defining the locking logic, or
+        ``None`` if it is not cached.
+        """
+        locked = self.statuses.get(self._get_key(obj, locker))
+        if locked is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return locked
+
+    def set(self, obj: models.Model, locked: bool, locker: Any = None) -> None:
+        if obj.pk is not None:
+            self.statuses[self._get_key(obj, locker)] = locked
+
+    def clear(self) -> None:
+        self.statuses.clear()
+
+
+def get_lock_status_cache() -> Optional[LockStatusCache]:
+    """Return the active lock status cache, or ``None`` if there is none.
+    """
+    return _current_cache.get()
+
+
+def clear_lock_status_cache() -> None:
+    """Clear the active lock status cache, if any. Call it after changing the lock status of objects without using
+    this library.
+    """
+    cache = _current_cache.get()
+    if cache is not None:
+        cache.clear()
+
+
+@contextmanager
+def lock_status_cache() -> Iterator[LockStatusCache]:
+    """Activate a new lock status cache within the ``with`` block.
+    """
+    cache = LockStatusCache()
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
@@ -0,0 +1,195 @@
+import datetime
+import uuid
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Model, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+
+
+def prefix_condition(condition: Any, prefix: str) -> Any:
+    """Return a copy of a ``Q`` object or expression whose field references are relative to the model found by
+    following the ``prefix`` relation path.
+
+    For example, ``prefix_condition(Q(is_locked_flag=True), 'parent')`` returns ``Q(parent__is_locked_flag=True)``.
+    """
+    if isinstance(condition, Q):
+        return Q(
+            *(prefix_condition(child, prefix) for child in condition.children),
+            _connector=condition.connector, _negated=condition.negated
+        )
+    elif isinstance(condition, tuple):
+        lookup, value = condition
+        return prefix + LOOKUP_SEP + lookup, prefix_condition(value, prefix)
+    elif isinstance(condition, F):
+        return condition.__class__(prefix + LOOKUP_SEP + condition.name)
+    elif hasattr(condition, 'get_source_expressions'):
+        prefixed = condition.copy()
+        prefixed.set_source_expressions([
+            prefix_condition(expression, prefix) for expression in condition.get_source_expressions()
+        ])
+        return prefixed
+    return condition
+
+
+# Lookups that ``evaluate_condition`` can evaluate in Python.
+_PYTHON_LOOKUPS = {
+    'exact': lambda value, arg: value == arg,
+    'isnull': lambda value, arg: (value is None) == bool(arg),
+    'in': lambda value, arg: value in arg,
+    'gt': lambda value, arg: value is not None and value > arg,
+    'gte': lambda value, arg: value is not None and value >= arg,
+    'lt': lambda value, arg: value is not None and value < arg,
+    'lte': lambda value, arg: value is not None and value <= arg,
+}
+
+
+# Types whose values are compared in Python as in the database. Strings are not included, since databases compare
+# them according to their collation, which may be case-insensitive.
+_PYTHON_COMPARABLE_TYPES = (bool, int, float, Decimal, datetime.date, datetime.time, datetime.timedelta, uuid.UUID)
+
+
+def evaluate_condition(condition: Q, obj: Model) -> Optional[bool]:
+    """Evaluate a ``Q`` object on the in-memory field values of ``obj``, or return ``None`` if it cannot be
+    evaluated in Python: that is the case if it follows relations, uses expressions, uses other lookups than
+    ``exact``, ``isnull``, ``in``, ``gt``, ``gte``, ``lt`` and ``lte``, or compares values other than booleans,
+    numbers, dates, times, durations, UUIDs and ``None``, such as strings.
+    """
+    results = []
+    for child in condition.children:
+        if isinstance(child, Q):
+            result = evaluate_condition(child, obj)
+        else:
+            result = _evaluate_lookup(child, obj)
+        if result is None:
+            return None
+        results.append(result)
+    if condition.connector == Q.OR:
+        result = any(results)
+    elif condition.connector == getattr(Q, 'XOR', None):
+        result = sum(results) % 2 == 1
+    else:
+        result = all(results)
+    return not result if condition.negated else result
+
+
+def _evaluate_lookup(child: Tuple[str, Any], obj: Model) -> Optional[bool]:
+    lookup, arg = child
+    if hasattr(arg, 'resolve_expression'):
+        return None
+    name, _sep, lookup_name = lookup.partition(LOOKUP_SEP)
+    lookup_name = lookup_name or 'exact'
+    if lookup_name not in _PYTHON_LOOKUPS:
+        return None
+    opts = obj._meta
+    try:
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete or field.many_to_many or field.one_to_many:
+        return None
+    if field.is_relation and isinstance(arg, Model):
+        arg = arg.pk
+    try:
+        # Coerce the argument as the database would, so that values of other types are compared consistently.
+        if lookup_name == 'in':
+            arg = [_to_python(field, item) for item in arg]
+        elif lookup_name != 'isnull':
+            arg = _to_python(field, arg)
+    except (TypeError, ValidationError):
+        return None
+    value = getattr(obj, field.attname)
+    if lookup_name != 'isnull' and not all(
+        _is_python_comparable(item) for item in [value, *(arg if lookup_name == 'in' else [arg])]
+    ):
+        return None
+    try:
+        return _PYTHON_LOOKUPS[lookup_name](value, arg)
+    except TypeError:
+        return None
+
+
+def _is_python_comparable(value: Any) -> bool:
+    return value is None or isinstance(value, _PYTHON_COMPARABLE_TYPES)
+
+
+def _to_python(field: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if field.is_relation:
+        field = field.target_field
+    return field.to_python(value)
+
+
+def iter_pk_chunks(queryset: QuerySet, chunk_size: int) -> Iterator[List[Any]]:
+    """Iterate over the primary keys of the objects in ``queryset`` in lists of at most ``chunk_size`` items,
+    in primary key order.
+
+    Each chunk is fetched with a separate query paginated by primary key, so the whole list of primary keys is never
+    held in memory and objects may be safely modified between chunks.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        chunk = list((queryset if last_pk is None else queryset.filter(pk__gt=last_pk))[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_pk = chunk[-1]
+
+
+def get_pk_ranges(pks: Iterable[Any]) -> List[Any]:
+    """Return a compact, JSON-serializable description of a list of primary keys sorted in ascending order.
+    Consecutive integers are grouped in ``[first, last]`` ranges, whereas other primary keys are stored once as their
+    string representation.
+
+    For example, ``get_pk_ranges([1, 2, 3, 7])`` returns ``[[1, 3], [7, 7]]``.
+    """
+    ranges = []
+    for pk in pks:
+        if not isinstance(pk, int) or isinstance(pk, bool):
+            ranges.append(str(pk))
+        elif ranges and isinstance(ranges[-1], list) and ranges[-1][1] + 1 == pk:
+            ranges[-1][1] = pk
+        else:
+            ranges.append([pk, pk])
+    return ranges
+
+
+def count_pk_ranges(ranges: Iterable[Any]) -> int:
+    """Return the number of primary keys described by ``ranges`` (see ``get_pk_ranges``).
+    """
+    return sum(pk_range[1] - pk_range[0] + 1 if isinstance(pk_range, list) else 1 for pk_range in ranges)
+
+
+def iter_pk_range_chunks(ranges: Iterable[Any], chunk_size: int, skip: int = 0) -> Iterator[List[Any]]:
+    """Iterate over the primary keys described by ``ranges`` (see ``get_pk_ranges``) in lists of at most
+    ``chunk_size`` items, skipping the first ``skip`` primary keys.
+    """
+    chunk = []
+    for pk_range in ranges:
+        if not isinstance(pk_range, list):
+            if skip:
+                skip -= 1
+                continue
+            chunk.append(pk_range)
+        else:
+            first, last = pk_range
+            start = first + skip
+            skip = max(0, start - last - 1)
+            pk = start
+            while pk <= last:
+                count = min(chunk_size - len(chunk), last - pk + 1)
+                chunk.extend(range(pk, pk + count))
+                pk += count
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            continue
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk